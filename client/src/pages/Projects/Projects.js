@@ -13,7 +13,7 @@ const Projects = () => {
     endDate: '',
     tags: ''
   });
-  const [currentPage, setCurrentPage] = useState(1);
+  const [cursor, setCursor] = useState(null);
   const [filters, setFilters] = useState({
     status: '',
     priority: ''
@@ -22,11 +22,11 @@ const Projects = () => {
   const queryClient = useQueryClient();
 
   const { data, isLoading, error } = useQuery(
-    ['projects', currentPage, filters],
+    ['projects', cursor, filters],
     async () => {
       const params = new URLSearchParams({
-        page: currentPage,
         limit: 10,
+        ...(cursor && { cursor }),
         ...(filters.status && { status: filters.status }),
         ...(filters.priority && { priority: filters.priority })
       });
@@ -71,7 +71,7 @@ const Projects = () => {
       ...filters,
       [e.target.name]: e.target.value
     });
-    setCurrentPage(1);
+    setCursor(null);
   };
 
   const handleSubmit = (e) => {
@@ -161,6 +161,19 @@ const Projects = () => {
         ))}
       </div>
 
+      <div className="d-flex gap-3 mt-3">
+        {cursor && (
+          <button className="btn btn-secondary" onClick={() => setCursor(null)}>
+            First Page
+          </button>
+        )}
+        {data?.pagination?.nextCursor && (
+          <button className="btn btn-secondary" onClick={() => setCursor(data.pagination.nextCursor)}>
+            Next Page
+          </button>
+        )}
+      </div>
+
       {showCreateModal && (
         <div className="modal-overlay">
           <div className="modal">
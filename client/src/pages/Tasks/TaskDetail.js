@@ -18,6 +18,22 @@ const TaskDetail = () => {
     }
   );
 
+  const { data: commentsData } = useQuery(
+    ['task-comments', id],
+    async () => {
+      const response = await api.get(`/tasks/${id}/comments`);
+      return response.data;
+    }
+  );
+
+  const { data: subtasksData } = useQuery(
+    ['task-subtasks', id],
+    async () => {
+      const response = await api.get(`/tasks/${id}/subtasks`);
+      return response.data;
+    }
+  );
+
   const updateTaskMutation = useMutation(
     async (updateData) => {
       const response = await api.put(`/tasks/${id}`, updateData);
@@ -41,7 +57,7 @@ const TaskDetail = () => {
     },
     {
       onSuccess: () => {
-        queryClient.invalidateQueries(['task', id]);
+        queryClient.invalidateQueries(['task-comments', id]);
         setNewComment('');
         toast.success('Comment added successfully!');
       },
@@ -62,20 +78,31 @@ const TaskDetail = () => {
     }
   };
 
-  const toggleSubtask = (subtaskId) => {
-    const task = data?.task;
-    const subtask = task?.subtasks?.id(subtaskId);
-    if (subtask) {
-      // This would need a proper API endpoint for updating subtasks
-      // For now, we'll just show the UI
-      subtask.completed = !subtask.completed;
+  const toggleSubtaskMutation = useMutation(
+    async (subtaskId) => {
+      const response = await api.put(`/tasks/${id}/subtasks/${subtaskId}`);
+      return response.data;
+    },
+    {
+      onSuccess: () => {
+        queryClient.invalidateQueries(['task-subtasks', id]);
+      },
+      onError: (error) => {
+        toast.error(error.response?.data?.error || 'Failed to update subtask');
+      }
     }
+  );
+
+  const toggleSubtask = (subtaskId) => {
+    toggleSubtaskMutation.mutate(subtaskId);
   };
 
   if (isLoading) return <div className="loading"><div className="spinner"></div></div>;
   if (error) return <div>Error loading task</div>;
 
   const task = data?.task;
+  const subtasks = subtasksData?.subtasks || [];
+  const comments = commentsData?.comments || [];
 
   return (
     <div>
@@ -123,11 +150,11 @@ const TaskDetail = () => {
             <p>{task?.description}</p>
           </div>
 
-          {task?.subtasks && task.subtasks.length > 0 && (
+          {subtasks.length > 0 && (
             <div className="detail-section">
               <h2 className="detail-section-title">Subtasks</h2>
               <div className="subtask-list">
-                {task.subtasks.map(subtask => (
+                {subtasks.map(subtask => (
                   <div key={subtask._id} className="d-flex align-items-center gap-2 mb-2">
                     <input
                       type="checkbox"
@@ -147,7 +174,7 @@ const TaskDetail = () => {
           <div className="detail-section">
             <h2 className="detail-section-title">Comments</h2>
             <div className="comment-list">
-              {task?.comments?.map(comment => (
+              {comments.map(comment => (
                 <div key={comment._id} className="comment-item">
                   <div className="comment-avatar">
                     {comment.author.firstName.charAt(0)}{comment.author.lastName.charAt(0)}
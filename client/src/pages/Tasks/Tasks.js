@@ -16,7 +16,7 @@ const Tasks = () => {
     estimatedHours: '',
     dueDate: ''
   });
-  const [currentPage, setCurrentPage] = useState(1);
+  const [cursor, setCursor] = useState(null);
   const [filters, setFilters] = useState({
     status: '',
     priority: '',
@@ -26,11 +26,11 @@ const Tasks = () => {
   const queryClient = useQueryClient();
 
   const { data, isLoading, error } = useQuery(
-    ['tasks', currentPage, filters],
+    ['tasks', cursor, filters],
     async () => {
       const params = new URLSearchParams({
-        page: currentPage,
         limit: 20,
+        ...(cursor && { cursor }),
         ...(filters.status && { status: filters.status }),
         ...(filters.priority && { priority: filters.priority }),
         ...(filters.assignee && { assignee: filters.assignee })
@@ -95,7 +95,7 @@ const Tasks = () => {
       ...filters,
       [e.target.name]: e.target.value
     });
-    setCurrentPage(1);
+    setCursor(null);
   };
 
   const handleSubmit = (e) => {
@@ -209,6 +209,19 @@ const Tasks = () => {
         ))}
       </div>
 
+      <div className="d-flex gap-3 mt-3">
+        {cursor && (
+          <button className="btn btn-secondary" onClick={() => setCursor(null)}>
+            First Page
+          </button>
+        )}
+        {data?.pagination?.nextCursor && (
+          <button className="btn btn-secondary" onClick={() => setCursor(data.pagination.nextCursor)}>
+            Next Page
+          </button>
+        )}
+      </div>
+
       {showCreateModal && (
         <div className="modal-overlay">
           <div className="modal">
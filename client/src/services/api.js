@@ -8,14 +8,31 @@ const api = axios.create({
   headers: {
     'Content-Type': 'application/json',
   },
+  validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
 });
 
+// Conditional GET: remember the ETag and body of each GET response, send
+// If-None-Match on the next request and replay the body on 304
+const MAX_CACHED_RESPONSES = 100;
+const etagCache = new Map();
+
+const cacheKey = (config) => api.getUri(config);
+
+export const clearEtagCache = () => etagCache.clear();
+
 api.interceptors.request.use(
   (config) => {
     const token = localStorage.getItem('token');
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+
+    if ((config.method || 'get') === 'get') {
+      const cached = etagCache.get(cacheKey(config));
+      if (cached) {
+        config.headers['If-None-Match'] = cached.etag;
+      }
+    }
     return config;
   },
   (error) => {
@@ -25,11 +42,30 @@ api.interceptors.request.use(
 
 api.interceptors.response.use(
   (response) => {
+    if ((response.config.method || 'get') !== 'get') {
+      return response;
+    }
+
+    const key = cacheKey(response.config);
+    if (response.status === 304) {
+      const cached = etagCache.get(key);
+      return cached ? { ...response, status: 200, data: cached.data } : response;
+    }
+
+    const etag = response.headers.etag;
+    if (etag) {
+      etagCache.delete(key);
+      etagCache.set(key, { etag, data: response.data });
+      if (etagCache.size > MAX_CACHED_RESPONSES) {
+        etagCache.delete(etagCache.keys().next().value);
+      }
+    }
     return response;
   },
   (error) => {
     if (error.response?.status === 401) {
       localStorage.removeItem('token');
+      clearEtagCache();
       window.location.href = '/login';
     }
     return Promise.reject(error);
@@ -218,7 +218,7 @@ PY
 
   # Run pytest for the task (use python3 -m to avoid missing entrypoint issues)
   if python3 -c "import pytest" 2>/dev/null; then
-    python3 -m pytest -rA "$PY_TEST_FILE"
+    TEST_SERVER_URL="http://localhost:5001" python3 -m pytest -rA "$PY_TEST_FILE"
   else
     echo "pytest is not available. To run tasks deterministically, please use: docker compose run --rm app ./run_tests.sh ${TASK_ID}" 1>&2
     exit 127
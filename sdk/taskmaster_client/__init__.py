@@ -0,0 +1,5 @@
+"""Async Python client for the TaskMaster Pro API."""
+from .client import TaskmasterClient
+from .errors import ApiError
+
+__all__ = ["ApiError", "TaskmasterClient"]
@@ -0,0 +1,231 @@
+import asyncio
+import base64
+import json
+import random
+import time
+
+import aiohttp
+
+from .errors import ApiError, error_message
+from .resources import AdvancedAPI, AuthAPI, ProjectsAPI, TasksAPI
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Gateway and overload failures worth another attempt for idempotent calls
+RETRY_STATUSES = frozenset({502, 503, 504})
+MAX_RETRY_AFTER = 30.0
+
+
+def token_expiry(token):
+    """The ``exp`` claim of a JWT, read without verifying it."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def query_params(params):
+    """Drop unset values and encode the rest the way the API parses them."""
+    encoded = {}
+    for name, value in (params or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        elif isinstance(value, (list, tuple)):
+            value = ",".join(str(item) for item in value)
+        encoded[name] = str(value)
+    return encoded
+
+
+class TaskmasterClient:
+    """Async client for the REST API.
+
+    One client holds a keep-alive connection pool of ``pool_size`` sockets and
+    runs at most ``max_concurrency`` requests at once, so callers can fan out
+    with ``asyncio.gather`` without opening a connection per call.
+
+    Idempotent calls are retried on connection errors and 502/503/504.
+    Any call is retried on 429, and on 503 with ``Retry-After``: the rate
+    limiter and load shedder send those before doing any work. After
+    ``auth.login`` or ``auth.register`` the client logs in again when the
+    token is about to expire or is rejected.
+
+        async with TaskmasterClient("http://localhost:3000") as client:
+            await client.auth.login("ada@example.com", "secret")
+            async for task in client.tasks.iter(status="todo"):
+                ...
+    """
+
+    def __init__(self, base_url="http://localhost:3000", *, token=None, pool_size=100,
+                 max_concurrency=100, max_retries=3, backoff=0.2, timeout=30.0,
+                 refresh_margin=60.0):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.refresh_margin = refresh_margin
+
+        self._session = None
+        self._credentials = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._refresh_lock = asyncio.Lock()
+
+        self.auth = AuthAPI(self)
+        self.projects = ProjectsAPI(self)
+        self.tasks = TasksAPI(self)
+        self.advanced = AdvancedAPI(self)
+
+    async def __aenter__(self):
+        self._open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _open(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=30),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def request(self, method, path, *, params=None, json=None, auth=True, idempotent=None):
+        """Send one request and return its decoded JSON body.
+
+        ``idempotent=False`` marks a PUT or DELETE that must not be repeated,
+        such as a toggle: it is then only retried on 429 and on 503 with
+        ``Retry-After``, which the server sends before doing any work.
+        """
+        async with self._semaphore:
+            response = await self._send(method, path, params=params, json=json, auth=auth,
+                                        idempotent=idempotent)
+            return await self._json(response)
+
+    async def stream_lines(self, path, *, params=None):
+        """Yield the non-empty lines of a streamed response as bytes.
+
+        The request holds a concurrency slot until the iteration ends.
+        """
+        async with self._semaphore:
+            response = await self._send("GET", path, params=params, json=None, auth=True,
+                                        timeout=aiohttp.ClientTimeout(total=None))
+            async with response:
+                async for line in response.content:
+                    line = line.strip()
+                    if line:
+                        yield line
+
+    async def paginate(self, path, extract, params=None):
+        """Yield items across cursor-paginated pages.
+
+        ``extract(page)`` returns the page's items and the next cursor.
+        """
+        params = dict(params or {})
+        while True:
+            page = await self.request("GET", path, params=params)
+            items, cursor = extract(page)
+            for item in items:
+                yield item
+            if not cursor:
+                return
+            params["cursor"] = cursor
+
+    async def _send(self, method, path, *, params, json, auth, timeout=None, idempotent=None):
+        session = self._open()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        url = f"{self.base_url}{path}"
+        params = query_params(params)
+        options = {"timeout": timeout} if timeout is not None else {}
+        refreshed = False
+        attempt = 0
+
+        while True:
+            token = await self._current_token() if auth else None
+            headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+            try:
+                response = await session.request(method, url, params=params, json=json,
+                                                 headers=headers, **options)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            if response.status < 400:
+                return response
+
+            error = await self._error(response)
+
+            if response.status == 401 and token and self._credentials and not refreshed:
+                refreshed = True
+                await self._refresh(token)
+                continue
+
+            if attempt < self.max_retries and self._retryable(idempotent, error):
+                delay = error.retry_after if error.retry_after is not None else self._backoff(attempt)
+                await asyncio.sleep(min(delay, MAX_RETRY_AFTER))
+                attempt += 1
+                continue
+
+            raise error
+
+    def _retryable(self, idempotent, error):
+        if error.status == 429 or (error.status == 503 and error.retry_after is not None):
+            return True
+        return idempotent and error.status in RETRY_STATUSES
+
+    def _backoff(self, attempt):
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    async def _json(self, response):
+        async with response:
+            if response.status == 204:
+                return None
+            return await response.json(content_type=None)
+
+    async def _error(self, response):
+        async with response:
+            try:
+                payload = await response.json(content_type=None)
+            except ValueError:
+                payload = None
+        try:
+            retry_after = float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            retry_after = None
+        return ApiError(response.status, error_message(payload, response.reason), payload, retry_after)
+
+    async def _current_token(self):
+        if self._credentials and self._expiring(self.token):
+            await self._refresh(self.token)
+        return self.token
+
+    def _expiring(self, token):
+        if token is None:
+            return True
+        expiry = token_expiry(token)
+        return expiry is not None and expiry - time.time() < self.refresh_margin
+
+    async def _refresh(self, stale_token):
+        async with self._refresh_lock:
+            # Another request may have logged in again while this one waited
+            if self.token != stale_token:
+                return
+            # Not through request(): the caller already holds a concurrency
+            # slot, and with every slot taken the login would wait forever
+            response = await self._send("POST", "/api/auth/login", params=None,
+                                        json=self._credentials, auth=False)
+            self.token = (await self._json(response))["token"]
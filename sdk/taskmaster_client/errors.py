@@ -0,0 +1,20 @@
+class ApiError(Exception):
+    """A non-2xx response from the API."""
+
+    def __init__(self, status, message, payload=None, retry_after=None):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+        self.payload = payload
+        self.retry_after = retry_after
+
+
+def error_message(payload, default):
+    """The message from an ``{error: '...'}`` or ``{error: {message}}`` body."""
+    if isinstance(payload, dict):
+        error = payload.get("error")
+        if isinstance(error, dict):
+            return error.get("message") or default
+        if error:
+            return error
+    return default
@@ -0,0 +1,159 @@
+import asyncio
+import json
+
+# POST /api/tasks/bulk accepts at most this many operations per call
+BULK_CHUNK_SIZE = 1000
+
+
+def page_of(key):
+    """Extractor for ``{<key>: [...], pagination: {nextCursor}}`` pages."""
+    return lambda page: (page[key], page["pagination"].get("nextCursor"))
+
+
+async def ndjson_rows(client, path, params):
+    async for line in client.stream_lines(path, params={**params, "format": "ndjson"}):
+        yield json.loads(line)
+
+
+class AuthAPI:
+    def __init__(self, client):
+        self._client = client
+
+    async def register(self, *, username, email, password, **fields):
+        data = await self._client.request("POST", "/api/auth/register", auth=False, json={
+            "username": username, "email": email, "password": password, **fields,
+        })
+        self._remember(data["token"], email, password)
+        return data
+
+    async def login(self, email, password):
+        data = await self._client.request("POST", "/api/auth/login", auth=False, json={
+            "email": email, "password": password,
+        })
+        self._remember(data["token"], email, password)
+        return data
+
+    def logout(self):
+        self._client.token = None
+        self._client._credentials = None
+
+    async def profile(self):
+        return await self._client.request("GET", "/api/auth/profile")
+
+    async def update_profile(self, **fields):
+        return await self._client.request("PUT", "/api/auth/profile", json=fields)
+
+    def _remember(self, token, email, password):
+        # Kept so the client can log in again when the token expires
+        self._client.token = token
+        self._client._credentials = {"email": email, "password": password}
+
+
+class ProjectsAPI:
+    def __init__(self, client):
+        self._client = client
+
+    async def list(self, **params):
+        """One page: ``{projects, pagination}``."""
+        return await self._client.request("GET", "/api/projects", params=params)
+
+    def iter(self, **params):
+        """Every matching project, following ``nextCursor``."""
+        return self._client.paginate("/api/projects", page_of("projects"), params)
+
+    async def get(self, project_id):
+        return await self._client.request("GET", f"/api/projects/{project_id}")
+
+    async def create(self, **fields):
+        return await self._client.request("POST", "/api/projects", json=fields)
+
+    def export(self, project_id, **params):
+        """Stream the project's tasks from the NDJSON export."""
+        return ndjson_rows(self._client, f"/api/projects/{project_id}/export", params)
+
+
+class TasksAPI:
+    def __init__(self, client):
+        self._client = client
+
+    async def list(self, **params):
+        """One page: ``{tasks, pagination}``."""
+        return await self._client.request("GET", "/api/tasks", params=params)
+
+    def iter(self, **params):
+        """Every matching task, following ``nextCursor``."""
+        return self._client.paginate("/api/tasks", page_of("tasks"), params)
+
+    async def get(self, task_id):
+        return await self._client.request("GET", f"/api/tasks/{task_id}")
+
+    async def create(self, **fields):
+        return await self._client.request("POST", "/api/tasks", json=fields)
+
+    async def update(self, task_id, **fields):
+        return await self._client.request("PUT", f"/api/tasks/{task_id}", json=fields)
+
+    async def delete(self, task_id):
+        return await self._client.request("DELETE", f"/api/tasks/{task_id}")
+
+    async def bulk(self, operations, chunk_size=BULK_CHUNK_SIZE):
+        """Run bulk operations, split into concurrent requests of chunk_size.
+
+        Results keep their index into ``operations``.
+        """
+        chunks = [operations[start:start + chunk_size] for start in range(0, len(operations), chunk_size)]
+        responses = await asyncio.gather(*(
+            self._client.request("POST", "/api/tasks/bulk", json={"operations": chunk})
+            for chunk in chunks
+        ))
+
+        results = []
+        for offset, response in zip(range(0, len(operations), chunk_size), responses):
+            results.extend({**result, "index": result["index"] + offset} for result in response["results"])
+
+        succeeded = sum(1 for result in results if result["ok"])
+        return {"results": results, "summary": {"succeeded": succeeded, "failed": len(results) - succeeded}}
+
+    def comments(self, task_id, **params):
+        return self._client.paginate(f"/api/tasks/{task_id}/comments", page_of("comments"), params)
+
+    async def add_comment(self, task_id, text):
+        return await self._client.request("POST", f"/api/tasks/{task_id}/comments", json={"text": text})
+
+    def subtasks(self, task_id, **params):
+        return self._client.paginate(f"/api/tasks/{task_id}/subtasks", page_of("subtasks"), params)
+
+    async def add_subtask(self, task_id, title):
+        return await self._client.request("POST", f"/api/tasks/{task_id}/subtasks", json={"title": title})
+
+    async def toggle_subtask(self, task_id, subtask_id):
+        """Flip the subtask's completed flag; never repeated, since a retry would flip it back."""
+        return await self._client.request("PUT", f"/api/tasks/{task_id}/subtasks/{subtask_id}",
+                                          idempotent=False)
+
+    def export(self, **params):
+        """Stream every visible task from the NDJSON export."""
+        return ndjson_rows(self._client, "/api/tasks/export", params)
+
+
+class AdvancedAPI:
+    def __init__(self, client):
+        self._client = client
+
+    async def primes(self, **params):
+        return await self._client.request("GET", "/api/advanced/primes", params=params)
+
+    async def stats(self, **params):
+        return await self._client.request("GET", "/api/advanced/stats", params=params)
+
+    async def performance(self, **params):
+        return await self._client.request("GET", "/api/advanced/performance", params=params)
+
+    async def search(self, q, **params):
+        """One page of results for every requested type."""
+        return await self._client.request("GET", "/api/advanced/search", params={"q": q, **params})
+
+    def iter_search(self, q, type, **params):
+        """Every result of one type (tasks, projects or users)."""
+        extract = lambda page: (page["results"][type], page["pagination"][type].get("nextCursor"))
+        return self._client.paginate("/api/advanced/search", extract, {"q": q, "type": type, **params})
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from taskmaster_client import TaskmasterClient
+from taskmaster_client.errors import ApiError
+
+CREDENTIALS = {"email": "ada@example.com", "password": "secret123"}
+
+
+class FakeApi:
+    """Issues opaque tokens on login; only the newest one is accepted."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.logins = 0
+        self.token = None
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.puts = 0
+
+    def app(self):
+        app = web.Application()
+        app.router.add_post("/api/auth/login", self.login)
+        app.router.add_get("/api/auth/profile", self.profile)
+        app.router.add_put("/api/auth/profile", self.bad_gateway)
+        app.router.add_put("/api/tasks/{task_id}/subtasks/{subtask_id}", self.bad_gateway)
+        return app
+
+    def expire(self):
+        self.token = "expired"
+
+    async def login(self, request):
+        self.logins += 1
+        self.token = f"token-{self.logins}"
+        return web.json_response({"token": self.token})
+
+    async def bad_gateway(self, request):
+        self.puts += 1
+        return web.json_response({"error": "Bad gateway"}, status=502)
+
+    async def profile(self, request):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if request.headers.get("Authorization") != f"Bearer {self.token}":
+                return web.json_response({"error": "Invalid token"}, status=401)
+            return web.json_response({"user": {"email": CREDENTIALS["email"]}})
+        finally:
+            self.in_flight -= 1
+
+
+def run_against(api, scenario, **client_options):
+    async def main():
+        async with TestServer(api.app()) as server:
+            base_url = str(server.make_url("")).rstrip("/")
+            async with TaskmasterClient(base_url, **client_options) as client:
+                await client.auth.login(**CREDENTIALS)
+                # A deadlock fails the test instead of hanging it
+                return await asyncio.wait_for(scenario(client), timeout=5)
+
+    return asyncio.run(main())
+
+
+def test_retries_once_after_logging_in_again_on_401():
+    api = FakeApi()
+
+    async def scenario(client):
+        api.expire()
+        return await client.auth.profile()
+
+    profile = run_against(api, scenario)
+
+    assert profile == {"user": {"email": CREDENTIALS["email"]}}
+    assert api.logins == 2
+
+
+def test_refreshes_with_a_single_concurrency_slot():
+    api = FakeApi()
+
+    async def scenario(client):
+        api.expire()
+        return await client.auth.profile()
+
+    profile = run_against(api, scenario, max_concurrency=1)
+
+    assert profile["user"]["email"] == CREDENTIALS["email"]
+
+
+def test_refreshes_once_when_every_slot_gets_401():
+    api = FakeApi(delay=0.02)
+
+    async def scenario(client):
+        api.expire()
+        return await asyncio.gather(*(client.auth.profile() for _ in range(8)))
+
+    profiles = run_against(api, scenario, max_concurrency=4)
+
+    assert len(profiles) == 8
+    assert api.logins == 2
+
+
+def test_caps_requests_in_flight():
+    api = FakeApi(delay=0.02)
+
+    async def scenario(client):
+        return await asyncio.gather(*(client.auth.profile() for _ in range(10)))
+
+    run_against(api, scenario, max_concurrency=3)
+
+    assert api.max_in_flight == 3
+
+
+def test_retries_an_idempotent_put_after_502():
+    api = FakeApi()
+
+    async def scenario(client):
+        with pytest.raises(ApiError):
+            await client.auth.update_profile(firstName="Ada")
+
+    run_against(api, scenario, max_retries=2, backoff=0)
+
+    assert api.puts == 3
+
+
+def test_never_repeats_a_subtask_toggle():
+    api = FakeApi()
+
+    async def scenario(client):
+        with pytest.raises(ApiError) as raised:
+            await client.tasks.toggle_subtask("task-1", "subtask-1")
+        return raised.value
+
+    error = run_against(api, scenario, max_retries=2, backoff=0)
+
+    assert error.status == 502
+    assert api.puts == 1
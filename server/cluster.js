@@ -0,0 +1,105 @@
+const cluster = require('cluster');
+const os = require('os');
+const path = require('path');
+require('dotenv').config();
+const { relayBroadcasts } = require('./services/clusterBus');
+const { serveClusterStore } = require('./services/rateLimitStore');
+
+// Runs server/index.js in N workers sharing one listening port.
+//   SIGHUP  - rolling restart: replace workers one at a time, each new worker
+//             must be listening before the old one is asked to stop
+//   SIGTERM - rolling shutdown: stop workers one at a time so the remaining
+//             ones keep serving; each runs the SIGTERM hook in index.js
+
+const WORKER_COUNT = parseInt(process.env.WEB_CONCURRENCY) ||
+  (os.availableParallelism ? os.availableParallelism() : os.cpus().length);
+const SHUTDOWN_TIMEOUT_MS = parseInt(process.env.SHUTDOWN_TIMEOUT_MS) || 30 * 1000;
+// Delay before replacing a crashed worker, so a crash on startup cannot spin
+const RESPAWN_DELAY_MS = 1000;
+
+// Workers we stopped on purpose and must not replace when they exit
+const retiring = new Set();
+let shuttingDown = false;
+let restarting = false;
+
+const fork = () => new Promise((resolve, reject) => {
+  const worker = cluster.fork();
+  const onExit = (code) => reject(new Error(`Worker ${worker.process.pid} exited with code ${code} before listening`));
+
+  worker.once('exit', onExit);
+  worker.once('listening', () => {
+    worker.off('exit', onExit);
+    resolve(worker);
+  });
+});
+
+const stopWorker = worker => new Promise((resolve) => {
+  retiring.add(worker.id);
+
+  const timer = setTimeout(() => {
+    console.error(`Worker ${worker.process.pid} did not stop in ${SHUTDOWN_TIMEOUT_MS}ms, killing`);
+    worker.process.kill('SIGKILL');
+  }, SHUTDOWN_TIMEOUT_MS);
+
+  worker.once('exit', () => {
+    clearTimeout(timer);
+    resolve();
+  });
+  worker.process.kill('SIGTERM');
+});
+
+const rollingRestart = async () => {
+  if (restarting || shuttingDown) return;
+  restarting = true;
+  console.log('SIGHUP received, restarting workers');
+
+  try {
+    for (const worker of Object.values(cluster.workers)) {
+      if (shuttingDown) break;
+      await fork();
+      await stopWorker(worker);
+    }
+    console.log('Rolling restart complete');
+  } catch (error) {
+    console.error('Rolling restart error:', error);
+  } finally {
+    restarting = false;
+  }
+};
+
+const shutdown = async () => {
+  if (shuttingDown) return;
+  shuttingDown = true;
+  console.log('SIGTERM received, stopping workers');
+
+  for (const worker of Object.values(cluster.workers)) {
+    await stopWorker(worker);
+  }
+  process.exit(0);
+};
+
+if (cluster.isPrimary) {
+  cluster.setupPrimary({ exec: path.join(__dirname, 'index.js') });
+  relayBroadcasts();
+  serveClusterStore();
+
+  cluster.on('exit', (worker, code, signal) => {
+    // Worker 'exit' listeners run before this one, so clean up here
+    if (retiring.delete(worker.id) || shuttingDown) return;
+
+    console.error(`Worker ${worker.process.pid} died (${signal || code}), starting a replacement`);
+    setTimeout(() => {
+      if (shuttingDown) return;
+      fork().catch(error => console.error('Worker start error:', error));
+    }, RESPAWN_DELAY_MS);
+  });
+
+  process.on('SIGHUP', rollingRestart);
+  process.on('SIGTERM', shutdown);
+  process.on('SIGINT', shutdown);
+
+  console.log(`Primary ${process.pid} starting ${WORKER_COUNT} workers`);
+  Promise.all(Array.from({ length: WORKER_COUNT }, fork))
+    .then(() => console.log(`${WORKER_COUNT} workers listening`))
+    .catch(error => console.error('Worker start error:', error));
+}
@@ -1,5 +1,7 @@
 const express = require('express');
 const cors = require('cors');
+const { store } = require('./services/mockStore');
+const { attachPersistence } = require('./services/mockStorePersistence');
 
 const app = express();
 
@@ -32,8 +34,24 @@ app.use('*', (req, res) => {
 const PORT = process.env.PORT || 5001;
 
 if (require.main === module) {
-  app.listen(PORT, () => {
-    console.log(`Test server running on port ${PORT}`);
+  // MOCK_STORE_DIR keeps mock users, projects and tasks across restarts
+  if (process.env.MOCK_STORE_DIR) {
+    const persistence = attachPersistence(store, {
+      dir: process.env.MOCK_STORE_DIR,
+      compactEvery: parseInt(process.env.MOCK_STORE_COMPACT_EVERY) || 10000,
+      compactBytes: parseInt(process.env.MOCK_STORE_COMPACT_BYTES) || 64 * 1024 * 1024
+    });
+    const shutdown = () => {
+      persistence.close();
+      process.exit(0);
+    };
+    process.on('SIGTERM', shutdown);
+    process.on('SIGINT', shutdown);
+  }
+
+  // PORT=0 picks a free port; the test fixtures read it back from this line
+  const server = app.listen(PORT, () => {
+    console.log(`Test server running on port ${server.address().port}`);
   });
 }
 
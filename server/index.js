@@ -1,32 +1,156 @@
+const startup = require('./services/startup');
+
+// Must run before the modules it should cache are loaded
+startup.enableCompileCache(process.env.COMPILE_CACHE_DIR);
+startup.trackRequires();
+const modulesStart = startup.now();
+
 const express = require('express');
 const mongoose = require('mongoose');
+const morgan = require('morgan');
 const cors = require('cors');
+const helmet = require('helmet');
 require('dotenv').config();
+const { queryTimingPlugin, renderMetrics, CONTENT_TYPE } = require('./services/metrics');
+
+// Global plugins only reach models compiled after them, so this comes
+// before anything that loads a model
+mongoose.plugin(queryTimingPlugin);
+
+const { principalCache } = require('./services/principalCache');
+const { passwordPoolStats } = require('./services/passwords');
+const { attachRealtime } = require('./services/realtime');
+const compress = require('./middleware/compress');
+const rateLimit = require('./middleware/rateLimit');
+const loadShedder = require('./middleware/loadShedder');
+const { createStore } = require('./services/rateLimitStore');
+const requestMetrics = require('./middleware/metrics');
+const lazyRouter = require('./middleware/lazyRouter');
+
+startup.record('modules', modulesStart);
+const appStart = startup.now();
 
 const app = express();
 const PORT = process.env.PORT || 3000;
 
+// Client IPs come from X-Forwarded-For only behind a trusted proxy
+if (process.env.TRUST_PROXY) {
+  app.set('trust proxy', process.env.TRUST_PROXY);
+}
+
 // Middleware setup
+app.use(requestMetrics());
+// Access log, e.g. ACCESS_LOG=combined; off by default
+if (process.env.ACCESS_LOG) {
+  app.use(morgan(process.env.ACCESS_LOG));
+}
+app.use(helmet());
 app.use(cors());
+
+// Overload protection runs before any parsing; /health stays reachable
+const maxLagMs = parseInt(process.env.LOAD_SHED_LAG_MS) || 200;
+if (process.env.LOAD_SHED_LAG_MS !== '0') {
+  app.use('/api', loadShedder({ maxLagMs }));
+}
+app.use('/api', rateLimit({
+  store: createStore(),
+  user: {
+    capacity: parseInt(process.env.RATE_LIMIT_USER_CAPACITY) || 120,
+    refillPerSec: parseFloat(process.env.RATE_LIMIT_USER_REFILL) || 2
+  },
+  ip: {
+    capacity: parseInt(process.env.RATE_LIMIT_IP_CAPACITY) || 300,
+    refillPerSec: parseFloat(process.env.RATE_LIMIT_IP_REFILL) || 5
+  }
+}));
+app.use(compress({ threshold: parseInt(process.env.COMPRESSION_THRESHOLD) || 1024 }));
 app.use(express.json());
 
+// Ready once MongoDB is connected with its indexes built and the routers
+// are loaded. Tests run without a database. `failed` names the startup step
+// that gave up, which keeps the process unready until it is restarted.
+const readiness = {
+  database: process.env.NODE_ENV === 'test',
+  routes: false,
+  stopping: false,
+  failed: null
+};
+
+const isReady = () => readiness.database && readiness.routes && !readiness.stopping;
+
+const checkReady = () => {
+  if (isReady() && startup.startupReport().readyMs === null) {
+    startup.markReady();
+    console.log(startup.formatStartupReport());
+  }
+};
+
+const INDEX_SYNC_ATTEMPTS = 5;
+
+// Indexes are built once here instead of by autoIndex on every model
+// compile. A build can fail transiently (e.g. during a primary election),
+// so it is retried with backoff.
+const syncIndexesWithRetry = async () => {
+  const { syncIndexes, formatIndexReport } = require('./services/indexes');
+  for (let attempt = 1; ; attempt += 1) {
+    try {
+      console.log(formatIndexReport(await syncIndexes()));
+      return;
+    } catch (error) {
+      console.error(`Index sync error (attempt ${attempt} of ${INDEX_SYNC_ATTEMPTS}):`, error);
+      if (attempt >= INDEX_SYNC_ATTEMPTS) throw error;
+      await new Promise(resolve => setTimeout(resolve, 1000 * 2 ** (attempt - 1)));
+    }
+  }
+};
+
+const connectDatabase = async () => {
+  const connectStart = startup.now();
+  try {
+    await mongoose.connect(process.env.MONGODB_URI || 'mongodb://localhost:27017/taskmaster', { autoIndex: false });
+  } catch (err) {
+    console.error('MongoDB connection error:', err);
+    readiness.failed = 'db connect';
+    return;
+  }
+  startup.record('db connect', connectStart);
+  console.log('Connected to MongoDB');
+
+  const indexStart = startup.now();
+  try {
+    await syncIndexesWithRetry();
+  } catch (err) {
+    readiness.failed = 'db indexes';
+    return;
+  }
+  startup.record('db indexes', indexStart);
+
+  readiness.database = true;
+  checkReady();
+};
+
 // Database connection - don't exit in test environment
 if (process.env.NODE_ENV !== 'test') {
-  mongoose.connect(process.env.MONGODB_URI || 'mongodb://localhost:27017/taskmaster')
-    .then(() => {
-      console.log('Connected to MongoDB');
-    })
-    .catch((err) => {
-      console.error('MongoDB connection error:', err);
-    });
+  connectDatabase();
 }
 
-// Routes
-app.use('/api/auth', require('./routes/auth'));
-app.use('/api/projects', require('./routes/projects'));
-app.use('/api/tasks', require('./routes/tasks'));
-app.use('/api/users', require('./routes/users'));
-app.use('/api/advanced', require('./routes/advanced'));
+// Routes are required on first use, or in the background once listening
+const routers = [
+  lazyRouter('/api/auth', () => require('./routes/auth')),
+  lazyRouter('/api/projects', () => require('./routes/projects')),
+  lazyRouter('/api/tasks', () => require('./routes/tasks')),
+  lazyRouter('/api/users', () => require('./routes/users')),
+  lazyRouter('/api/advanced', () => require('./routes/advanced'))
+];
+
+const loadRouters = () => {
+  routers.forEach(router => router.load());
+  readiness.routes = true;
+  checkReady();
+};
+
+app.use('/api', require('./middleware/loaders'));
+routers.forEach(router => app.use(router.path, router));
 
 // Health check endpoint
 app.get('/health', (req, res) => {
@@ -34,10 +158,33 @@ app.get('/health', (req, res) => {
     status: 'OK',
     timestamp: new Date().toISOString(),
     uptime: process.uptime(),
-    environment: process.env.NODE_ENV || 'development'
+    environment: process.env.NODE_ENV || 'development',
+    caches: {
+      principal: principalCache.stats()
+    },
+    passwordPool: passwordPoolStats()
   });
 });
 
+// Readiness for load balancers and orchestrators, unlike /health which
+// only says the process is up
+app.get('/ready', (req, res) => {
+  const ready = isReady();
+  res.status(ready ? 200 : 503).json({
+    status: ready ? 'ready' : (readiness.stopping ? 'stopping' : (readiness.failed ? 'failed' : 'starting')),
+    database: readiness.database,
+    routes: readiness.routes,
+    failed: readiness.failed,
+    startup: startup.startupReport()
+  });
+});
+
+// Prometheus scrape endpoint
+app.get('/metrics', (req, res) => {
+  res.set('Content-Type', CONTENT_TYPE);
+  res.send(renderMetrics());
+});
+
 // Error handling middleware
 app.use((err, req, res, next) => {
   console.error(err.stack);
@@ -59,10 +206,24 @@ app.use('*', (req, res) => {
   });
 });
 
-// Graceful shutdown
+startup.record('app', appStart);
+
+let server;
+let io;
+
+// Graceful shutdown: stop accepting connections, let in-flight requests
+// finish, then close MongoDB. Cluster workers get SIGTERM from the primary.
 process.on('SIGTERM', async () => {
   console.log('SIGTERM received, shutting down gracefully');
+  readiness.stopping = true;
   try {
+    if (server) {
+      // io.close() disconnects sockets and closes the HTTP server
+      const closed = new Promise(resolve => io.close(resolve));
+      if (server.closeIdleConnections) server.closeIdleConnections();
+      await closed;
+      console.log('HTTP server closed');
+    }
     await mongoose.connection.close();
     console.log('MongoDB connection closed');
     process.exit(0);
@@ -73,10 +234,16 @@ process.on('SIGTERM', async () => {
 });
 
 if (require.main === module) {
-  app.listen(PORT, () => {
+  const listenStart = startup.now();
+  server = app.listen(PORT, () => {
+    startup.record('listen', listenStart);
     console.log(`Server running on port ${PORT}`);
     console.log(`Environment: ${process.env.NODE_ENV || 'development'}`);
+
+    // Load the routers while MongoDB is still connecting
+    setImmediate(loadRouters);
   });
+  io = attachRealtime(server);
 }
 
 module.exports = app;
@@ -1,47 +1,61 @@
 const jwt = require('jsonwebtoken');
 const User = require('../models/User');
+const { principalCache } = require('../services/principalCache');
 
-const auth = async (req, res, next) => {
+const authError = (message) => Object.assign(new Error(message), { status: 401 });
+
+// Resolve a bearer token to an active user; shared by the REST middleware
+// and the socket.io handshake
+const authenticate = async (token) => {
+  if (!token) {
+    throw authError('Access denied. No token provided.');
+  }
+
+  let decoded;
   try {
-    const token = req.header('Authorization')?.replace('Bearer ', '');
-    
-    if (!token) {
-      return res.status(401).json({
-        error: 'Access denied. No token provided.'
-      });
-    }
+    decoded = jwt.verify(token, process.env.JWT_SECRET || 'fallback_secret');
+  } catch (error) {
+    if (error.name === 'TokenExpiredError') throw authError('Token expired.');
+    if (error.name === 'JsonWebTokenError') throw authError('Invalid token.');
+    throw error;
+  }
 
-    const decoded = jwt.verify(token, process.env.JWT_SECRET || 'fallback_secret');
-    const user = await User.findById(decoded.userId).select('-password');
-    
-    if (!user) {
-      return res.status(401).json({
-        error: 'Invalid token. User not found.'
-      });
-    }
+  let user = principalCache.get(decoded.userId);
 
-    if (!user.isActive) {
-      return res.status(401).json({
-        error: 'Account is deactivated.'
-      });
+  if (!user) {
+    user = await User.findById(decoded.userId).select('-password').lean();
+
+    if (user) {
+      principalCache.set(decoded.userId, user);
     }
+  }
+
+  if (!user) {
+    throw authError('Invalid token. User not found.');
+  }
+
+  if (!user.isActive) {
+    throw authError('Account is deactivated.');
+  }
+
+  return user;
+};
 
-    req.userId = user._id;
+const auth = async (req, res, next) => {
+  try {
+    const token = req.header('Authorization')?.replace('Bearer ', '');
+    const user = await authenticate(token);
+
+    req.userId = user._id.toString();
     req.user = user;
     next();
   } catch (error) {
-    if (error.name === 'JsonWebTokenError') {
+    if (error.status === 401) {
       return res.status(401).json({
-        error: 'Invalid token.'
+        error: error.message
       });
     }
-    
-    if (error.name === 'TokenExpiredError') {
-      return res.status(401).json({
-        error: 'Token expired.'
-      });
-    }
-    
+
     console.error('Auth middleware error:', error);
     res.status(500).json({
       error: 'Internal server error'
@@ -50,3 +64,4 @@ const auth = async (req, res, next) => {
 };
 
 module.exports = auth;
+module.exports.authenticate = authenticate;
@@ -0,0 +1,103 @@
+const zlib = require('zlib');
+
+// gzip/brotli response compression on zlib streams. The encoding follows
+// Accept-Encoding; bodies below `threshold` bytes, already-encoded
+// responses and non-text content types pass through untouched. Streamed
+// responses (no Content-Length) are always compressed, and backpressure
+// from the socket reaches the writer through the zlib stream.
+
+const COMPRESSIBLE_TYPE = /json|text|javascript|xml|csv/i;
+
+// Highest-q supported coding from an Accept-Encoding header; br wins ties
+const negotiateEncoding = (header) => {
+  let best = null;
+  let bestQ = 0;
+
+  String(header || '').split(',').forEach((part) => {
+    const [name, ...params] = part.trim().toLowerCase().split(';');
+    if (name !== 'br' && name !== 'gzip') return;
+
+    const qParam = params.map(param => param.trim()).find(param => param.startsWith('q='));
+    const q = qParam ? parseFloat(qParam.slice(2)) : 1;
+    if (q > bestQ || (q === bestQ && q > 0 && name === 'br')) {
+      best = name;
+      bestQ = q;
+    }
+  });
+  return best;
+};
+
+const toBuffer = (chunk, encoding) => (Buffer.isBuffer(chunk) ? chunk : Buffer.from(chunk, encoding));
+
+const compress = ({ threshold = 1024, brotliQuality = 4 } = {}) => (req, res, next) => {
+  const encoding = negotiateEncoding(req.headers['accept-encoding']);
+  res.vary('Accept-Encoding');
+  if (!encoding || req.method === 'HEAD') return next();
+
+  const write = res.write.bind(res);
+  const end = res.end.bind(res);
+  let stream = null;
+  let decided = false;
+
+  const start = (chunk, chunkEncoding, ending) => {
+    decided = true;
+
+    const contentEncoding = res.getHeader('Content-Encoding');
+    if ((contentEncoding && contentEncoding !== 'identity') ||
+        res.statusCode === 204 || res.statusCode === 304 ||
+        !COMPRESSIBLE_TYPE.test(res.getHeader('Content-Type') || '')) {
+      return;
+    }
+
+    const length = res.getHeader('Content-Length') !== undefined
+      ? Number(res.getHeader('Content-Length'))
+      : (ending && (chunk ? toBuffer(chunk, chunkEncoding).length : 0));
+    if (length !== false && length < threshold) return;
+
+    res.setHeader('Content-Encoding', encoding);
+    res.removeHeader('Content-Length');
+
+    stream = encoding === 'br'
+      ? zlib.createBrotliCompress({ params: { [zlib.constants.BROTLI_PARAM_QUALITY]: brotliQuality } })
+      : zlib.createGzip();
+
+    stream.on('data', (data) => {
+      if (!write(data)) stream.pause();
+    });
+    stream.on('end', () => end());
+    res.on('drain', () => stream.resume());
+    // Writers waiting on res 'drain' after a full zlib buffer
+    stream.on('drain', () => res.emit('drain'));
+    res.once('close', () => {
+      if (!res.writableFinished) stream.destroy();
+    });
+  };
+
+  res.write = (chunk, chunkEncoding, callback) => {
+    if (!decided) start(chunk, chunkEncoding, false);
+    if (!stream) return write(chunk, chunkEncoding, callback);
+    return stream.write(toBuffer(chunk, typeof chunkEncoding === 'string' ? chunkEncoding : undefined), callback);
+  };
+
+  res.end = (chunk, chunkEncoding, callback) => {
+    if (typeof chunk === 'function') {
+      callback = chunk;
+      chunk = null;
+    }
+    if (!decided) start(chunk, typeof chunkEncoding === 'string' ? chunkEncoding : undefined, true);
+    if (!stream) return end(chunk, chunkEncoding, callback);
+
+    if (chunk) {
+      stream.end(toBuffer(chunk, typeof chunkEncoding === 'string' ? chunkEncoding : undefined));
+    } else {
+      stream.end();
+    }
+    if (typeof callback === 'function') res.once('finish', callback);
+    return res;
+  };
+
+  next();
+};
+
+module.exports = compress;
+module.exports.negotiateEncoding = negotiateEncoding;
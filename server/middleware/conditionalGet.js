@@ -0,0 +1,30 @@
+const crypto = require('crypto');
+const { currentVersion } = require('../services/versions');
+
+// Weak ETag from the versions of the models a response reads, the caller
+// and the URL. A matching If-None-Match answers 304 before the handler runs
+// its queries. Must come after `auth`.
+// bucketMs folds wall-clock time into the tag for responses that depend on
+// "now" (e.g. a rolling last-24-hours window).
+const conditionalGet = (modelNames, { bucketMs } = {}) => (req, res, next) => {
+  const parts = [
+    ...modelNames.map(currentVersion),
+    req.userId,
+    req.originalUrl,
+    bucketMs ? Math.floor(Date.now() / bucketMs) : ''
+  ];
+  const hash = crypto.createHash('sha1').update(parts.join('|')).digest('base64url').slice(0, 22);
+  const etag = `W/"${hash}"`;
+
+  res.set('ETag', etag);
+  res.set('Cache-Control', 'private, no-cache');
+
+  // If-None-Match uses weak comparison, so W/ prefixes are ignored
+  const ifNoneMatch = req.get('If-None-Match');
+  if (ifNoneMatch && ifNoneMatch.split(',').some(tag => tag.trim().replace(/^W\//, '') === `"${hash}"`)) {
+    return res.status(304).end();
+  }
+  next();
+};
+
+module.exports = conditionalGet;
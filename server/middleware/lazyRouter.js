@@ -0,0 +1,23 @@
+const startup = require('../services/startup');
+
+// Router mounted at `path` but required only when first needed: on its first
+// request, or earlier through load(). Load time goes into the startup report.
+const lazyRouter = (path, loadModule) => {
+  let router = null;
+
+  const load = () => {
+    if (!router) {
+      const start = startup.now();
+      router = loadModule();
+      startup.record(`route ${path}`, start);
+    }
+    return router;
+  };
+
+  const handler = (req, res, next) => load()(req, res, next);
+  handler.path = path;
+  handler.load = load;
+  return handler;
+};
+
+module.exports = lazyRouter;
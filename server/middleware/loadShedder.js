@@ -0,0 +1,16 @@
+const { eventLoopStats } = require('../services/eventLoop');
+
+// Reject a share of requests with 503 while event-loop delay is above
+// maxLagMs, before queued work pushes every response past its deadline.
+// The share grows with the overshoot: all requests at twice the limit.
+const loadShedder = ({ maxLagMs }) => (req, res, next) => {
+  const lag = eventLoopStats().p99;
+
+  if (lag > maxLagMs && Math.random() < (lag - maxLagMs) / maxLagMs) {
+    res.set('Retry-After', '1');
+    return res.status(503).json({ error: 'Server is overloaded, please retry' });
+  }
+  next();
+};
+
+module.exports = loadShedder;
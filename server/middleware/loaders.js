@@ -0,0 +1,9 @@
+const { createLoaders } = require('../services/dataloader');
+
+// Fresh per-request loaders so reference lookups are batched and deduplicated
+const loaders = (req, res, next) => {
+  req.loaders = createLoaders();
+  next();
+};
+
+module.exports = loaders;
@@ -0,0 +1,59 @@
+const {
+  elapsedSeconds,
+  requestContext,
+  requestStarted,
+  requestFinished
+} = require('../services/metrics');
+
+// Route pattern rather than the raw path, so ids don't become labels.
+// Requests no route handled (404s, rate-limited, shed) share one label.
+const routeLabel = req => (req.route ? `${req.baseUrl}${req.route.path}` : 'unmatched');
+
+const toMs = seconds => (seconds * 1000).toFixed(1);
+
+// Records latency, status and MongoDB time per route, and reports the
+// timings in X-Response-Time and Server-Timing. Mount first so the time
+// spent in every other middleware is counted.
+const requestMetrics = () => (req, res, next) => {
+  const started = process.hrtime.bigint();
+  const context = { dbSeconds: 0, dbQueries: 0 };
+  let route = null;
+  let finished = false;
+
+  requestStarted();
+
+  // Node writes headers through res.writeHead, implicitly or not, so this is
+  // the last point where timing headers can be added. The route is read here
+  // too, while the router that matched it still has req.baseUrl set.
+  const writeHead = res.writeHead;
+  res.writeHead = function(...args) {
+    if (route === null) {
+      route = routeLabel(req);
+      const total = toMs(elapsedSeconds(started));
+      res.setHeader('X-Response-Time', `${total}ms`);
+      res.setHeader(
+        'Server-Timing',
+        `db;dur=${toMs(context.dbSeconds)};desc="MongoDB (${context.dbQueries})", total;dur=${total}`
+      );
+    }
+    return writeHead.apply(this, args);
+  };
+
+  const finish = () => {
+    if (finished) return;
+    finished = true;
+    requestFinished({
+      method: req.method,
+      route: route || routeLabel(req),
+      status: res.statusCode,
+      seconds: elapsedSeconds(started),
+      dbSeconds: context.dbSeconds
+    });
+  };
+  res.on('finish', finish);
+  res.on('close', finish);
+
+  requestContext.run(context, next);
+};
+
+module.exports = requestMetrics;
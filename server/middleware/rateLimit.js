@@ -0,0 +1,63 @@
+const jwt = require('jsonwebtoken');
+
+// Token-bucket rate limiting per client IP and, for authenticated calls, per
+// user. Each request spends tokens by route cost, so expensive endpoints
+// drain a bucket faster than plain reads. Mounted on /api, so paths are
+// relative to it. Fails open if the store errors.
+
+const ROUTE_COSTS = [
+  { pattern: /^\/advanced\/search/, cost: 5 },
+  { pattern: /^\/advanced\/(stats|performance)/, cost: 5 },
+  { pattern: /^\/advanced\/primes/, cost: 3 },
+  { pattern: /^\/(tasks|projects\/[^/]+)\/export/, cost: 10 },
+  { pattern: /^\/tasks\/bulk/, cost: 10 },
+  { pattern: /^\/auth\/(login|register)/, cost: 5 }
+];
+
+const routeCost = (path, costs = ROUTE_COSTS) => {
+  const match = costs.find(route => route.pattern.test(path));
+  return match ? match.cost : 1;
+};
+
+// Verified user id from the bearer token, or null. Unverified ids would let
+// a client drain someone else's bucket.
+const tokenUserId = (req) => {
+  const token = req.header('Authorization')?.replace('Bearer ', '');
+  if (!token) return null;
+
+  try {
+    return jwt.verify(token, process.env.JWT_SECRET || 'fallback_secret').userId || null;
+  } catch (error) {
+    return null;
+  }
+};
+
+const rateLimit = ({ store, user, ip, costs = ROUTE_COSTS }) => async (req, res, next) => {
+  try {
+    const cost = routeCost(req.path, costs);
+    const userId = tokenUserId(req);
+
+    const checks = [store.take(`ip:${req.ip}`, cost, ip)];
+    if (userId) checks.push(store.take(`user:${userId}`, cost, user));
+    const results = await Promise.all(checks);
+
+    // Report the bucket that applies to this caller most directly
+    const reported = results[results.length - 1];
+    res.set('RateLimit-Limit', String(userId ? user.capacity : ip.capacity));
+    res.set('RateLimit-Remaining', String(reported.remaining));
+
+    const limited = results.find(result => !result.allowed);
+    if (limited) {
+      res.set('Retry-After', String(Math.max(1, Math.ceil(limited.retryAfterMs / 1000))));
+      return res.status(429).json({ error: 'Too many requests, please slow down' });
+    }
+
+    next();
+  } catch (error) {
+    console.error('Rate limit error:', error);
+    next();
+  }
+};
+
+module.exports = rateLimit;
+module.exports.routeCost = routeCost;
@@ -0,0 +1,25 @@
+const mongoose = require('mongoose');
+
+const commentSchema = new mongoose.Schema({
+  task: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'Task',
+    required: true
+  },
+  author: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'User',
+    required: true
+  },
+  text: {
+    type: String,
+    required: true
+  }
+}, {
+  timestamps: true
+});
+
+// Paginated newest-first reads per task
+commentSchema.index({ task: 1, createdAt: -1, _id: -1 });
+
+module.exports = mongoose.model('Comment', commentSchema);
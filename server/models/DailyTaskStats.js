@@ -0,0 +1,33 @@
+const mongoose = require('mongoose');
+const { versionPlugin } = require('../services/versions');
+
+// Task counts per project, assignee and UTC day of task creation, for
+// /performance. Kept current by services/performanceRollup on every task write.
+const dailyTaskStatsSchema = new mongoose.Schema({
+  project: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'Project',
+    required: true
+  },
+  assignee: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'User',
+    default: null
+  },
+  day: {
+    type: String,
+    required: true
+  },
+  created: { type: Number, default: 0 },
+  completed: { type: Number, default: 0 },
+  // Sum of (completedDate - createdAt) in days over the completed tasks
+  completionDays: { type: Number, default: 0 },
+  completionCount: { type: Number, default: 0 }
+}, {
+  timestamps: true
+});
+
+dailyTaskStatsSchema.index({ project: 1, day: 1, assignee: 1 }, { unique: true });
+dailyTaskStatsSchema.plugin(versionPlugin);
+
+module.exports = mongoose.model('DailyTaskStats', dailyTaskStatsSchema);
@@ -1,4 +1,7 @@
 const mongoose = require('mongoose');
+const { searchablePlugin } = require('../services/search');
+const { versionPlugin, touchVersion } = require('../services/versions');
+const { publishMembersRemoved } = require('../services/events');
 
 const projectSchema = new mongoose.Schema({
   name: {
@@ -47,6 +50,14 @@ const projectSchema = new mongoose.Schema({
     max: 100,
     default: 0
   },
+  totalTasks: {
+    type: Number,
+    default: 0
+  },
+  completedTasks: {
+    type: Number,
+    default: 0
+  },
   tags: [String],
   startDate: Date,
   endDate: Date
@@ -54,6 +65,155 @@ const projectSchema = new mongoose.Schema({
   timestamps: true
 });
 
+// Indexes follow the query shapes in routes/*.js
+projectSchema.index({ owner: 1, updatedAt: -1, _id: -1 });
+projectSchema.index({ 'team.user': 1, updatedAt: -1, _id: -1 });
+projectSchema.index({ status: 1 });
+projectSchema.plugin(searchablePlugin, {
+  fields: { name: 10, tags: 5, description: 1 }
+});
+projectSchema.plugin(versionPlugin);
+
+const refId = (value) => (value && value._id ? value._id : value);
+
+// Realtime checks project access once, on subscribe, so owner and team
+// changes publish the users who lost access and realtime evicts them
+const memberSnapshot = project => ({
+  owner: project.owner,
+  team: (project.team || []).map(member => ({ user: refId(member.user) }))
+});
+
+const isMemberPath = path => path === 'owner' || path.split('.')[0] === 'team';
+
+const touchesMembers = update => Array.isArray(update) || Object.entries(update).some(([key, value]) => (
+  key.startsWith('$') ? Object.keys(value || {}).some(isMemberPath) : isMemberPath(key)
+));
+
+projectSchema.post('init', function() {
+  this.$locals.members = memberSnapshot(this);
+});
+
+projectSchema.post('save', function() {
+  if (this.$locals.members) publishMembersRemoved(this._id, this.$locals.members, this);
+  this.$locals.members = memberSnapshot(this);
+});
+
+projectSchema.pre('findOneAndUpdate', async function() {
+  if (!touchesMembers(this.getUpdate() || {})) return;
+  this._membersBefore = await this.model.findOne(this.getFilter()).select('owner team.user').lean();
+});
+
+projectSchema.post('findOneAndUpdate', async function() {
+  const before = this._membersBefore;
+  if (!before) return;
+  const after = await this.model.findById(before._id).select('owner team.user').lean();
+  publishMembersRemoved(before._id, before, after || {});
+});
+
+// progress = completedTasks / totalTasks, recomputed inside the same atomic update
+const progressStage = {
+  $set: {
+    progress: {
+      $cond: [
+        { $gt: ['$totalTasks', 0] },
+        { $round: [{ $multiply: [{ $divide: ['$completedTasks', '$totalTasks'] }, 100] }, 0] },
+        0
+      ]
+    }
+  }
+};
+
+const counterUpdate = (total, completed) => [
+  {
+    $set: {
+      totalTasks: { $max: [{ $add: [{ $ifNull: ['$totalTasks', 0] }, total] }, 0] },
+      completedTasks: { $max: [{ $add: [{ $ifNull: ['$completedTasks', 0] }, completed] }, 0] }
+    }
+  },
+  progressStage
+];
+
+// Adjust task counters for a batch of [before, after] task pairs.
+// Use null for `before` on create and for `after` on delete.
+projectSchema.statics.applyTaskChanges = async function(changes) {
+  const deltas = new Map();
+  const add = (task, sign) => {
+    const project = refId(task.project);
+    if (!project) return;
+    const key = project.toString();
+    const delta = deltas.get(key) || { project, total: 0, completed: 0 };
+    delta.total += sign;
+    delta.completed += task.status === 'completed' ? sign : 0;
+    deltas.set(key, delta);
+  };
+
+  changes.forEach(([before, after]) => {
+    if (before) add(before, -1);
+    if (after) add(after, 1);
+  });
+
+  const operations = Array.from(deltas.values())
+    .filter(delta => delta.total !== 0 || delta.completed !== 0)
+    .map(delta => ({
+      updateOne: {
+        filter: { _id: delta.project },
+        update: counterUpdate(delta.total, delta.completed)
+      }
+    }));
+
+  if (operations.length > 0) {
+    await this.bulkWrite(operations, { ordered: false });
+    touchVersion(this.modelName);
+  }
+};
+
+projectSchema.statics.applyTaskChange = function(before, after) {
+  return this.applyTaskChanges([[before, after]]);
+};
+
+// Recount tasks to repair counter drift (all projects, or the given ids)
+projectSchema.statics.reconcileProgress = async function(projectIds) {
+  const Task = mongoose.model('Task');
+  const match = projectIds
+    ? { project: { $in: projectIds.map(id => new mongoose.Types.ObjectId(id)) } }
+    : {};
+
+  const counts = await Task.aggregate([
+    { $match: match },
+    {
+      $group: {
+        _id: '$project',
+        total: { $sum: 1 },
+        completed: { $sum: { $cond: [{ $eq: ['$status', 'completed'] }, 1, 0] } }
+      }
+    }
+  ]);
+
+  const counted = new Map(counts.map(count => [count._id.toString(), count]));
+  const projects = await this.find(projectIds ? { _id: { $in: projectIds } } : {})
+    .select('_id totalTasks completedTasks')
+    .lean();
+
+  const operations = [];
+  projects.forEach((project) => {
+    const count = counted.get(project._id.toString()) || { total: 0, completed: 0 };
+    if (project.totalTasks === count.total && project.completedTasks === count.completed) return;
+
+    operations.push({
+      updateOne: {
+        filter: { _id: project._id },
+        update: [{ $set: { totalTasks: count.total, completedTasks: count.completed } }, progressStage]
+      }
+    });
+  });
+
+  if (operations.length > 0) {
+    await this.bulkWrite(operations, { ordered: false });
+  }
+
+  return { checked: projects.length, repaired: operations.length };
+};
+
 projectSchema.virtual('taskCount', {
   ref: 'Task',
   localField: '_id',
@@ -0,0 +1,48 @@
+const mongoose = require('mongoose');
+const { versionPlugin } = require('../services/versions');
+
+const statusBucketSchema = new mongoose.Schema({
+  count: { type: Number, default: 0 },
+  estimatedHours: { type: Number, default: 0 },
+  estimatedCount: { type: Number, default: 0 },
+  actualHours: { type: Number, default: 0 },
+  actualCount: { type: Number, default: 0 }
+}, { _id: false });
+
+const workloadBucketSchema = new mongoose.Schema({
+  taskCount: { type: Number, default: 0 },
+  completedTasks: { type: Number, default: 0 },
+  estimatedHours: { type: Number, default: 0 },
+  actualHours: { type: Number, default: 0 }
+}, { _id: false });
+
+// Task statistics rolled up per project and per month of task creation.
+// Kept current by services/statsRollup on every task write.
+const projectStatsSchema = new mongoose.Schema({
+  project: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'Project',
+    required: true
+  },
+  month: {
+    type: String,
+    required: true
+  },
+  statuses: {
+    type: Map,
+    of: statusBucketSchema,
+    default: {}
+  },
+  workload: {
+    type: Map,
+    of: workloadBucketSchema,
+    default: {}
+  }
+}, {
+  timestamps: true
+});
+
+projectStatsSchema.index({ project: 1, month: 1 }, { unique: true });
+projectStatsSchema.plugin(versionPlugin);
+
+module.exports = mongoose.model('ProjectStats', projectStatsSchema);
@@ -0,0 +1,24 @@
+const mongoose = require('mongoose');
+
+const subtaskSchema = new mongoose.Schema({
+  task: {
+    type: mongoose.Schema.Types.ObjectId,
+    ref: 'Task',
+    required: true
+  },
+  title: {
+    type: String,
+    required: true
+  },
+  completed: {
+    type: Boolean,
+    default: false
+  }
+}, {
+  timestamps: true
+});
+
+// Paginated reads per task
+subtaskSchema.index({ task: 1, createdAt: -1, _id: -1 });
+
+module.exports = mongoose.model('Subtask', subtaskSchema);
@@ -1,4 +1,6 @@
 const mongoose = require('mongoose');
+const { searchablePlugin } = require('../services/search');
+const { versionPlugin } = require('../services/versions');
 
 const taskSchema = new mongoose.Schema({
   title: {
@@ -29,6 +31,11 @@ const taskSchema = new mongoose.Schema({
     enum: ['todo', 'in-progress', 'review', 'testing', 'completed', 'blocked'],
     default: 'todo'
   },
+  priority: {
+    type: String,
+    enum: ['low', 'medium', 'high', 'urgent'],
+    default: 'medium'
+  },
   type: {
     type: String,
     enum: ['feature', 'bug', 'improvement', 'documentation', 'testing'],
@@ -37,56 +44,115 @@ const taskSchema = new mongoose.Schema({
   estimatedHours: Number,
   actualHours: Number,
   dueDate: Date,
+  // Set when the task enters `completed`, cleared when it leaves
+  completedDate: Date,
   tags: [String],
-  comments: [{
-    author: {
-      type: mongoose.Schema.Types.ObjectId,
-      ref: 'User',
-      required: true
-    },
-    text: {
-      type: String,
-      required: true
-    },
-    createdAt: {
-      type: Date,
-      default: Date.now
-    }
-  }],
-  subtasks: [{
-    title: {
-      type: String,
-      required: true
-    },
-    completed: {
-      type: Boolean,
-      default: false
-    },
-    createdAt: {
-      type: Date,
-      default: Date.now
-    }
-  }]
+  // Comments and subtasks live in their own collections; only counts are kept here
+  commentCount: {
+    type: Number,
+    default: 0
+  },
+  subtaskCount: {
+    type: Number,
+    default: 0
+  },
+  completedSubtaskCount: {
+    type: Number,
+    default: 0
+  }
 }, {
   timestamps: true
 });
 
-taskSchema.methods.addComment = function(authorId, text) {
-  this.comments.push({ author: authorId, text });
-  return this.save();
+// Indexes follow the query shapes in routes/*.js
+taskSchema.index({ assignee: 1, updatedAt: -1, _id: -1 });
+taskSchema.index({ reporter: 1, updatedAt: -1, _id: -1 });
+taskSchema.index({ project: 1, createdAt: -1 });
+taskSchema.index({ project: 1, assignee: 1, status: 1 });
+taskSchema.plugin(searchablePlugin, {
+  fields: { title: 10, tags: 5, description: 1 },
+  index: { project: 1, searchTerms: 1 }
+});
+taskSchema.plugin(versionPlugin);
+
+// Allowed status changes; staying in the same status is always allowed
+const STATUS_TRANSITIONS = {
+  todo: ['in-progress', 'blocked', 'completed'],
+  'in-progress': ['todo', 'review', 'testing', 'blocked', 'completed'],
+  review: ['in-progress', 'testing', 'blocked', 'completed'],
+  testing: ['in-progress', 'review', 'blocked', 'completed'],
+  completed: ['in-progress'],
+  blocked: ['todo', 'in-progress']
 };
 
-taskSchema.methods.addSubtask = function(title) {
-  this.subtasks.push({ title });
-  return this.save();
+taskSchema.statics.STATUS_TRANSITIONS = STATUS_TRANSITIONS;
+
+taskSchema.statics.canTransition = function(from, to) {
+  return from === to || (STATUS_TRANSITIONS[from] || []).includes(to);
+};
+
+// Fields to $set for a status change, keeping completedDate in step
+taskSchema.statics.statusFields = function(status) {
+  return { status, completedDate: status === 'completed' ? new Date() : null };
 };
 
-taskSchema.methods.toggleSubtask = function(subtaskId) {
-  const subtask = this.subtasks.id(subtaskId);
-  if (subtask) {
-    subtask.completed = !subtask.completed;
+taskSchema.pre('save', function(next) {
+  if (this.isModified('status')) {
+    this.completedDate = this.status === 'completed' ? new Date() : null;
+  }
+  next();
+});
+
+taskSchema.methods.updateStatus = function(status) {
+  if (!this.constructor.canTransition(this.status, status)) {
+    return false;
   }
-  return this.save();
+  this.status = status;
+  return true;
+};
+
+// Load a task together with the caller's access to its project in one
+// round-trip. Resolves to null when the task does not exist; otherwise the
+// lean task carries `access: { owner, member }`.
+taskSchema.statics.findWithAccess = async function(taskId, userId, fields = {}) {
+  if (!mongoose.isValidObjectId(taskId)) return null;
+  const user = new mongoose.Types.ObjectId(userId);
+
+  const [task] = await this.aggregate([
+    { $match: { _id: new mongoose.Types.ObjectId(taskId) } },
+    {
+      $lookup: {
+        from: 'projects',
+        let: { projectId: '$project' },
+        pipeline: [
+          { $match: { $expr: { $eq: ['$_id', '$$projectId'] } } },
+          {
+            $project: {
+              owner: { $eq: ['$owner', user] },
+              member: {
+                $or: [
+                  { $eq: ['$owner', user] },
+                  { $in: [user, { $ifNull: ['$team.user', []] }] }
+                ]
+              }
+            }
+          }
+        ],
+        as: 'access'
+      }
+    },
+    {
+      $project: {
+        ...fields,
+        project: 1,
+        reporter: 1,
+        status: 1,
+        access: { $ifNull: [{ $arrayElemAt: ['$access', 0] }, { owner: false, member: false }] }
+      }
+    }
+  ]);
+
+  return task || null;
 };
 
 module.exports = mongoose.model('Task', taskSchema);
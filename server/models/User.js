@@ -1,5 +1,10 @@
 const mongoose = require('mongoose');
-const bcrypt = require('bcryptjs');
+const { invalidatePrincipal, clearPrincipals } = require('../services/principalCache');
+const { searchablePlugin } = require('../services/search');
+const { versionPlugin } = require('../services/versions');
+const { invalidateUserSummary, clearUserSummaries } = require('../services/dataloader');
+const { broadcast, onBroadcast } = require('../services/clusterBus');
+const passwords = require('../services/passwords');
 
 const userSchema = new mongoose.Schema({
   username: {
@@ -41,16 +46,64 @@ const userSchema = new mongoose.Schema({
   timestamps: true
 });
 
+// Indexes follow the query shapes in routes/*.js (username and email are unique above)
+userSchema.index({ isActive: 1, role: 1, firstName: 1, lastName: 1 });
+userSchema.plugin(searchablePlugin, {
+  fields: { username: 10, firstName: 5, lastName: 5, email: 1 },
+  index: { isActive: 1, searchTerms: 1 }
+});
+// Other responses embed only these user fields, so logins (lastLogin and
+// password rehashes) leave their ETags valid
+userSchema.plugin(versionPlugin, { fields: ['username', 'firstName', 'lastName'] });
+
 // Hash password before saving
 userSchema.pre('save', async function(next) {
   if (!this.isModified('password')) return next();
-  this.password = await bcrypt.hash(this.password, 12);
+  this.password = await passwords.hashPassword(this.password);
   next();
 });
 
+// Drop cached principals and summaries whenever a user changes (profile edits, isActive toggles).
+// Broadcast so every cluster worker drops its copy; a null id clears everything.
+onBroadcast('user.invalidate', (userId) => {
+  if (userId) {
+    invalidatePrincipal(userId);
+    invalidateUserSummary(userId);
+  } else {
+    clearPrincipals();
+    clearUserSummaries();
+  }
+});
+
+const invalidateUser = (userId) => {
+  broadcast('user.invalidate', userId ? userId.toString() : null);
+};
+
+userSchema.post('save', function(doc) {
+  invalidateUser(doc._id);
+});
+
+userSchema.post(['findOneAndUpdate', 'findOneAndDelete'], function(doc) {
+  if (doc) invalidateUser(doc._id);
+});
+
+userSchema.post(['updateOne', 'updateMany', 'deleteOne', 'deleteMany'], function() {
+  const { _id } = this.getFilter();
+  if (mongoose.isValidObjectId(_id)) {
+    invalidateUser(_id);
+  } else {
+    invalidateUser(null);
+  }
+});
+
 // Compare password method
 userSchema.methods.comparePassword = async function(candidatePassword) {
-  return bcrypt.compare(candidatePassword, this.password);
+  return passwords.comparePassword(candidatePassword, this.password);
+};
+
+// True when the stored hash was made with a different cost than BCRYPT_COST
+userSchema.methods.needsRehash = function() {
+  return passwords.needsRehash(this.password);
 };
 
 // Get user's full name
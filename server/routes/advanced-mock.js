@@ -1,7 +1,11 @@
 const express = require('express');
 const jwt = require('jsonwebtoken');
+const primes = require('../services/primes');
 const router = express.Router();
 
+const MAX_PRIME_RANGE = 1000000;
+const MAX_PRIME_LIMIT = 10000;
+
 // Auth middleware
 const auth = (req, res, next) => {
   const token = req.headers.authorization?.replace('Bearer ', '');
@@ -20,37 +24,49 @@ const auth = (req, res, next) => {
 
 // Generate prime numbers
 router.get('/primes', auth, (req, res) => {
-  const limit = parseInt(req.query.limit) || 100;
-  
-  // Simple prime generator
-  const getPrimes = (n) => {
-    const primes = [];
-    let num = 2;
-    
-    while (primes.length < n) {
-      let isPrime = true;
-      for (let i = 2; i <= Math.sqrt(num); i++) {
-        if (num % i === 0) {
-          isPrime = false;
-          break;
-        }
+  try {
+    if (req.query.nth !== undefined) {
+      const nth = parseInt(req.query.nth);
+      if (!(nth >= 1)) {
+        return res.status(400).json({ error: 'Validation failed' });
       }
-      if (isPrime) {
-        primes.push(num);
+      return res.json({ nth, prime: primes.nthPrime(nth) });
+    }
+
+    if (req.query.from !== undefined || req.query.to !== undefined) {
+      const from = parseInt(req.query.from) || 0;
+      const to = req.query.to !== undefined ? parseInt(req.query.to) : Math.min(from + MAX_PRIME_RANGE, primes.MAX_VALUE);
+
+      if (!(to >= from) || to - from > MAX_PRIME_RANGE) {
+        return res.status(400).json({ error: 'Validation failed' });
       }
-      num++;
+
+      const result = primes.primesInRange(from, to);
+      return res.json({
+        primes: result,
+        from,
+        to,
+        count: result.length
+      });
     }
-    
-    return primes;
-  };
 
-  const primes = getPrimes(limit);
+    const limit = req.query.limit !== undefined ? Number(req.query.limit) : 100;
+    if (!Number.isInteger(limit) || limit < 1 || limit > MAX_PRIME_LIMIT) {
+      return res.status(400).json({ error: 'Validation failed' });
+    }
+    const result = primes.firstPrimes(limit);
 
-  res.json({
-    primes,
-    limit,
-    count: primes.length
-  });
+    res.json({
+      primes: result,
+      limit,
+      count: result.length
+    });
+  } catch (error) {
+    if (error instanceof RangeError) {
+      return res.status(400).json({ error: error.message });
+    }
+    res.status(500).json({ error: 'Failed to generate primes' });
+  }
 });
 
 // Get statistics
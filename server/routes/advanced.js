@@ -1,15 +1,33 @@
 const express = require('express');
+const mongoose = require('mongoose');
 const { query, validationResult } = require('express-validator');
 const Task = require('../models/Task');
 const Project = require('../models/Project');
 const User = require('../models/User');
 const auth = require('../middleware/auth');
+const conditionalGet = require('../middleware/conditionalGet');
+const primes = require('../services/primes');
+const statsRollup = require('../services/statsRollup');
+const performanceRollup = require('../services/performanceRollup');
+const { search, decodeSearchCursor } = require('../services/search');
+const { populateRefs } = require('../services/dataloader');
 
 const router = express.Router();
 
+const MAX_PRIME_RANGE = 1000000;
+
+const SEARCH_REFS = {
+  tasks: { project: 'projects', assignee: 'users' },
+  projects: { owner: 'users', 'team.user': 'users' },
+  users: {}
+};
+
 // Prime number calculation endpoint
 router.get('/primes', auth, [
-  query('limit').optional().isInt({ min: 1, max: 10000 }).withMessage('Limit must be between 1 and 10000')
+  query('limit').optional().isInt({ min: 1, max: 10000 }).withMessage('Limit must be between 1 and 10000'),
+  query('from').optional().isInt({ min: 0, max: primes.MAX_VALUE }).withMessage(`From must be between 0 and ${primes.MAX_VALUE}`),
+  query('to').optional().isInt({ min: 0, max: primes.MAX_VALUE }).withMessage(`To must be between 0 and ${primes.MAX_VALUE}`),
+  query('nth').optional().isInt({ min: 1 }).withMessage('Nth must be a positive integer')
 ], async (req, res) => {
   try {
     const errors = validationResult(req);
@@ -17,45 +35,48 @@ router.get('/primes', auth, [
       return res.status(400).json({ error: 'Validation failed' });
     }
 
-    const limit = parseInt(req.query.limit) || 100;
-    
-    // Simple prime number generator
-    const getPrimes = (n) => {
-      const primes = [];
-      let num = 2;
-      
-      while (primes.length < n) {
-        let isPrime = true;
-        for (let i = 2; i <= Math.sqrt(num); i++) {
-          if (num % i === 0) {
-            isPrime = false;
-            break;
-          }
-        }
-        if (isPrime) {
-          primes.push(num);
-        }
-        num++;
+    if (req.query.nth !== undefined) {
+      const nth = parseInt(req.query.nth);
+      return res.json({ nth, prime: primes.nthPrime(nth) });
+    }
+
+    if (req.query.from !== undefined || req.query.to !== undefined) {
+      const from = parseInt(req.query.from) || 0;
+      const to = req.query.to !== undefined ? parseInt(req.query.to) : Math.min(from + MAX_PRIME_RANGE, primes.MAX_VALUE);
+
+      if (to < from || to - from > MAX_PRIME_RANGE) {
+        return res.status(400).json({ error: `Range must be ascending and span at most ${MAX_PRIME_RANGE}` });
       }
-      
-      return primes;
-    };
 
-    const primes = getPrimes(limit);
+      const result = primes.primesInRange(from, to);
+      return res.json({
+        primes: result,
+        from,
+        to,
+        count: result.length
+      });
+    }
+
+    const limit = parseInt(req.query.limit) || 100;
+    const result = primes.firstPrimes(limit);
 
     res.json({
-      primes,
+      primes: result,
       limit,
-      count: primes.length
+      count: result.length
     });
   } catch (error) {
+    if (error instanceof RangeError) {
+      return res.status(400).json({ error: error.message });
+    }
     console.error('Prime generation error:', error);
     res.status(500).json({ error: 'Failed to generate primes' });
   }
 });
 
 // Project statistics endpoint
-router.get('/stats', auth, [
+// day/week windows roll forward with the clock, so the tag also changes each minute
+router.get('/stats', auth, conditionalGet(['Task', 'Project', 'ProjectStats', 'User'], { bucketMs: 60 * 1000 }), [
   query('projectId').optional().isMongoId().withMessage('Invalid project ID'),
   query('timeRange').optional().isIn(['day', 'week', 'month', 'year']).withMessage('Invalid time range')
 ], async (req, res) => {
@@ -81,10 +102,10 @@ router.get('/stats', auth, [
           startDate = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000);
           break;
         case 'month':
-          startDate = new Date(now.getFullYear(), now.getMonth(), 1);
+          startDate = new Date(Date.UTC(now.getUTCFullYear(), now.getUTCMonth(), 1));
           break;
         case 'year':
-          startDate = new Date(now.getFullYear(), 0, 1);
+          startDate = new Date(Date.UTC(now.getUTCFullYear(), 0, 1));
           break;
       }
       
@@ -94,9 +115,9 @@ router.get('/stats', auth, [
     }
 
     // Build project filter
-    let projectFilter = {};
+    let projectIds;
     if (projectId) {
-      projectFilter._id = projectId;
+      projectIds = [new mongoose.Types.ObjectId(projectId)];
     } else {
       // Get projects user has access to
       const userProjects = await Project.find({
@@ -104,22 +125,33 @@ router.get('/stats', auth, [
           { owner: req.userId },
           { 'team.user': req.userId }
         ]
-      }).select('_id');
-      projectFilter._id = { $in: userProjects.map(p => p._id) };
+      }).select('_id').lean();
+      projectIds = userProjects.map(p => p._id);
     }
+    const projectFilter = { _id: { $in: projectIds } };
 
-    // Get task statistics
-    const taskStats = await Task.aggregate([
-      { $match: { project: projectFilter._id, ...dateFilter } },
-      {
-        $group: {
-          _id: '$status',
-          count: { $sum: 1 },
-          avgEstimatedHours: { $avg: '$estimatedHours' },
-          avgActualHours: { $avg: '$actualHours' }
+    // Task and workload statistics come from the per-project monthly rollups.
+    // Calendar ranges line up with rollup months; rolling day/week windows
+    // are small enough to aggregate directly over recent tasks.
+    const calendarRange = timeRange === 'month' || timeRange === 'year';
+    const rollupStats = await statsRollup.loadStatistics(projectIds, {
+      sinceMonth: calendarRange ? statsRollup.monthKey(dateFilter.createdAt.$gte) : undefined
+    });
+
+    let taskStats = rollupStats.taskStatistics;
+    if (!calendarRange) {
+      taskStats = await Task.aggregate([
+        { $match: { project: { $in: projectIds }, ...dateFilter } },
+        {
+          $group: {
+            _id: '$status',
+            count: { $sum: 1 },
+            avgEstimatedHours: { $avg: '$estimatedHours' },
+            avgActualHours: { $avg: '$actualHours' }
+          }
         }
-      }
-    ]);
+      ]);
+    }
 
     // Get project statistics
     const projectStats = await Project.aggregate([
@@ -135,57 +167,7 @@ router.get('/stats', auth, [
       }
     ]);
 
-    // Get user workload statistics
-    const workloadStats = await Task.aggregate([
-      { $match: { project: projectFilter._id, assignee: { $exists: true } } },
-      {
-        $group: {
-          _id: '$assignee',
-          taskCount: { $sum: 1 },
-          completedTasks: {
-            $sum: { $cond: [{ $eq: ['$status', 'completed'] }, 1, 0] }
-          },
-          totalEstimatedHours: { $sum: '$estimatedHours' },
-          totalActualHours: { $sum: '$actualHours' }
-        }
-      },
-      {
-        $lookup: {
-          from: 'users',
-          localField: '_id',
-          foreignField: '_id',
-          as: 'user'
-        }
-      },
-      { $unwind: '$user' },
-      {
-        $project: {
-          userId: '$_id',
-          username: '$user.username',
-          firstName: '$user.firstName',
-          lastName: '$user.lastName',
-          taskCount: 1,
-          completedTasks: 1,
-          completionRate: {
-            $cond: [
-              { $eq: ['$taskCount', 0] },
-              0,
-              { $multiply: [{ $divide: ['$completedTasks', '$taskCount'] }, 100] }
-            ]
-          },
-          totalEstimatedHours: 1,
-          totalActualHours: 1,
-          efficiency: {
-            $cond: [
-              { $eq: ['$totalActualHours', 0] },
-              null,
-              { $multiply: [{ $divide: ['$totalEstimatedHours', '$totalActualHours'] }, 100] }
-            ]
-          }
-        }
-      },
-      { $sort: { taskCount: -1 } }
-    ]);
+    const workloadStats = rollupStats.workloadStatistics;
 
     res.json({
       taskStatistics: taskStats,
@@ -205,7 +187,9 @@ router.get('/stats', auth, [
 // Advanced search endpoint
 router.get('/search', auth, [
   query('q').notEmpty().withMessage('Search query is required'),
-  query('type').optional().isIn(['all', 'tasks', 'projects', 'users']).withMessage('Invalid search type')
+  query('type').optional().isIn(['all', 'tasks', 'projects', 'users']).withMessage('Invalid search type'),
+  query('limit').optional().isInt({ min: 1, max: 50 }).withMessage('Limit must be between 1 and 50'),
+  query('cursor').optional().custom(value => Boolean(decodeSearchCursor(value))).withMessage('Invalid cursor')
 ], async (req, res) => {
   try {
     const errors = validationResult(req);
@@ -213,7 +197,12 @@ router.get('/search', auth, [
       return res.status(400).json({ error: 'Validation failed' });
     }
 
-    const { q, type = 'all' } = req.query;
+    const { q, type = 'all', cursor } = req.query;
+    const limit = parseInt(req.query.limit) || 20;
+
+    if (cursor && type === 'all') {
+      return res.status(400).json({ error: 'Cursor pagination requires a single search type' });
+    }
 
     // Get user's accessible projects
     const userProjects = await Project.find({
@@ -221,84 +210,77 @@ router.get('/search', auth, [
         { owner: req.userId },
         { 'team.user': req.userId }
       ]
-    }).select('_id');
+    }).select('_id').lean();
 
     const projectIds = userProjects.map(p => p._id);
+    const searches = {};
 
     if (type === 'tasks' || type === 'all') {
-      const tasks = await Task.find({
-        project: { $in: projectIds },
-        $or: [
-          { title: new RegExp(q, 'i') },
-          { description: new RegExp(q, 'i') },
-          { tags: new RegExp(q, 'i') }
-        ]
-      })
-      .populate('project', 'name')
-      .populate('assignee', 'username firstName lastName')
-      .limit(20);
-
-      res.json({
-        query: q,
-        type,
-        results: {
-          tasks
-        }
+      searches.tasks = search(Task, {
+        q,
+        limit,
+        cursor,
+        filter: { project: { $in: projectIds } },
+        project: { title: 1, description: 1, status: 1, priority: 1, tags: 1, project: 1, assignee: 1, createdAt: 1, updatedAt: 1 }
       });
     }
 
     if (type === 'projects' || type === 'all') {
-      const projects = await Project.find({
-        _id: { $in: projectIds },
-        $or: [
-          { name: new RegExp(q, 'i') },
-          { description: new RegExp(q, 'i') },
-          { tags: new RegExp(q, 'i') }
-        ]
-      })
-      .populate('owner', 'username firstName lastName')
-      .populate('team.user', 'username firstName lastName')
-      .limit(20);
-
-      res.json({
-        query: q,
-        type,
-        results: {
-          projects
-        }
+      searches.projects = search(Project, {
+        q,
+        limit,
+        cursor,
+        filter: { _id: { $in: projectIds } },
+        project: { name: 1, description: 1, status: 1, priority: 1, progress: 1, tags: 1, owner: 1, team: 1, createdAt: 1, updatedAt: 1 }
       });
     }
 
     if (type === 'users' || type === 'all') {
-      const users = await User.find({
-        isActive: true,
-        $or: [
-          { username: new RegExp(q, 'i') },
-          { firstName: new RegExp(q, 'i') },
-          { lastName: new RegExp(q, 'i') },
-          { email: new RegExp(q, 'i') }
-        ]
-      })
-      .select('username firstName lastName email role avatar')
-      .limit(20);
-
-      res.json({
-        query: q,
-        type,
-        results: {
-          users
-        }
+      searches.users = search(User, {
+        q,
+        limit,
+        cursor,
+        filter: { isActive: true },
+        project: { username: 1, firstName: 1, lastName: 1, email: 1, role: 1, avatar: 1 }
       });
     }
+
+    const names = Object.keys(searches);
+    const pages = await Promise.all(names.map(name => searches[name]));
+
+    // One batched user lookup and one project lookup across all result types
+    await Promise.all(names.map((name, i) => populateRefs(req.loaders, pages[i].results, SEARCH_REFS[name])));
+
+    const results = {};
+    const pagination = {};
+    names.forEach((name, i) => {
+      results[name] = pages[i].results;
+      pagination[name] = { limit, nextCursor: pages[i].nextCursor };
+    });
+
+    res.json({
+      query: q,
+      type,
+      results,
+      pagination
+    });
   } catch (error) {
     console.error('Advanced search error:', error);
     res.status(500).json({ error: 'Search failed' });
   }
 });
 
-// Performance metrics endpoint
-router.get('/performance', auth, [
-  query('timeRange').optional().isIn(['day', 'week', 'month', 'year']).withMessage('Invalid time range')
+// isISO8601 also accepts week and ordinal dates (2024-W05, 2024-060), which
+// Date cannot parse
+const isParsableDate = value => Number.isFinite(Date.parse(value));
+
+// Performance metrics endpoint, assembled from daily task buckets.
+// Either a timeRange preset or explicit from/to dates (UTC days, inclusive).
+router.get('/performance', auth, conditionalGet(['Project', 'DailyTaskStats', 'User'], { bucketMs: 60 * 1000 }), [
+  query('timeRange').optional().isIn(['day', 'week', 'month', 'year']).withMessage('Invalid time range'),
+  query('from').optional().isISO8601({ strict: true }).custom(isParsableDate).withMessage('Invalid from date'),
+  query('to').optional().isISO8601({ strict: true }).custom(isParsableDate).withMessage('Invalid to date'),
+  query('granularity').optional().isIn(performanceRollup.GRANULARITIES).withMessage('Invalid granularity')
 ], async (req, res) => {
   try {
     const errors = validationResult(req);
@@ -307,29 +289,31 @@ router.get('/performance', auth, [
     }
 
     const { timeRange = 'month' } = req.query;
-    
+    const granularity = req.query.granularity || (timeRange === 'year' ? 'month' : 'day');
+
     // Calculate date range
     const now = new Date();
-    let startDate;
-    let groupFormat;
-    
+    let from;
+
     switch (timeRange) {
       case 'day':
-        startDate = new Date(now.getTime() - 24 * 60 * 60 * 1000);
-        groupFormat = { $dateToString: { format: "%Y-%m-%d", date: "$createdAt" } };
+        from = performanceRollup.dayKey(now.getTime() - 24 * 60 * 60 * 1000);
         break;
       case 'week':
-        startDate = new Date(now.getTime() - 7 * 24 * 60 * 60 * 1000);
-        groupFormat = { $dateToString: { format: "%Y-%m-%d", date: "$createdAt" } };
-        break;
-      case 'month':
-        startDate = new Date(now.getFullYear(), now.getMonth(), 1);
-        groupFormat = { $dateToString: { format: "%Y-%m-%d", date: "$createdAt" } };
+        from = performanceRollup.dayKey(now.getTime() - 6 * 24 * 60 * 60 * 1000);
         break;
       case 'year':
-        startDate = new Date(now.getFullYear(), 0, 1);
-        groupFormat = { $dateToString: { format: "%Y-%m", date: "$createdAt" } };
+        from = `${now.getUTCFullYear()}-01-01`;
         break;
+      default:
+        from = performanceRollup.dayKey(Date.UTC(now.getUTCFullYear(), now.getUTCMonth(), 1));
+    }
+
+    if (req.query.from) from = performanceRollup.dayKey(req.query.from);
+    const to = req.query.to ? performanceRollup.dayKey(req.query.to) : performanceRollup.dayKey(now);
+
+    if (from > to) {
+      return res.status(400).json({ error: 'from must not be after to' });
     }
 
     // Get user's accessible projects
@@ -338,89 +322,21 @@ router.get('/performance', auth, [
         { owner: req.userId },
         { 'team.user': req.userId }
       ]
-    }).select('_id');
+    }).select('_id').lean();
 
     const projectIds = userProjects.map(p => p._id);
 
-    // Task completion trends
-    const completionTrends = await Task.aggregate([
-      {
-        $match: {
-          project: { $in: projectIds },
-          createdAt: { $gte: startDate }
-        }
-      },
-      {
-        $group: {
-          _id: groupFormat,
-          created: { $sum: 1 },
-          completed: {
-            $sum: { $cond: [{ $eq: ['$status', 'completed'] }, 1, 0] }
-          }
-        }
-      },
-      { $sort: { _id: 1 } }
-    ]);
-
-    // Team productivity
-    const teamProductivity = await Task.aggregate([
-      {
-        $match: {
-          project: { $in: projectIds },
-          assignee: { $exists: true },
-          createdAt: { $gte: startDate }
-        }
-      },
-      {
-        $group: {
-          _id: '$assignee',
-          totalTasks: { $sum: 1 },
-          completedTasks: {
-            $sum: { $cond: [{ $eq: ['$status', 'completed'] }, 1, 0] }
-          },
-          avgCompletionTime: {
-            $avg: {
-              $cond: [
-                { $and: [{ $ne: ['$completedDate', null] }, { $ne: ['$createdAt', null] }] },
-                { $divide: [{ $subtract: ['$completedDate', '$createdAt'] }, 1000 * 60 * 60 * 24] },
-                null
-              ]
-            }
-          }
-        }
-      },
-      {
-        $lookup: {
-          from: 'users',
-          localField: '_id',
-          foreignField: '_id',
-          as: 'user'
-        }
-      },
-      { $unwind: '$user' },
-      {
-        $project: {
-          userId: '$_id',
-          username: '$user.username',
-          firstName: '$user.firstName',
-          lastName: '$user.lastName',
-          totalTasks: 1,
-          completedTasks: 1,
-          completionRate: {
-            $cond: [
-              { $eq: ['$totalTasks', 0] },
-              0,
-              { $multiply: [{ $divide: ['$completedTasks', '$totalTasks'] }, 100] }
-            ]
-          },
-          avgCompletionTime: { $round: ['$avgCompletionTime', 2] }
-        }
-      },
-      { $sort: { completedTasks: -1 } }
-    ]);
+    const { completionTrends, teamProductivity } = await performanceRollup.loadPerformance(projectIds, {
+      from,
+      to,
+      granularity
+    });
 
     res.json({
-      timeRange,
+      timeRange: req.query.from || req.query.to ? 'custom' : timeRange,
+      from,
+      to,
+      granularity,
       completionTrends,
       teamProductivity
     });
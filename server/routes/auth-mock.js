@@ -1,9 +1,9 @@
 const express = require('express');
 const jwt = require('jsonwebtoken');
+const { store } = require('../services/mockStore');
 const router = express.Router();
 
-// Mock user storage
-let users = [];
+const users = store.users;
 
 // Generate JWT token
 const generateToken = (userId) => {
@@ -16,23 +16,20 @@ router.post('/register', async (req, res) => {
     const { username, email, password, firstName, lastName } = req.body;
 
     // Check if user exists
-    const existingUser = users.find(u => u.email === email || u.username === username);
+    const existingUser = users.findOne('email', email) || users.findOne('username', username);
     if (existingUser) {
       return res.status(409).json({ error: 'User with this email or username already exists' });
     }
 
     // Create new user
-    const newUser = {
-      id: Date.now().toString(),
+    const newUser = users.insert({
       username,
       email,
       password, // In real app, this would be hashed
       firstName,
       lastName,
       createdAt: new Date()
-    };
-
-    users.push(newUser);
+    });
 
     const token = generateToken(newUser.id);
 
@@ -59,8 +56,8 @@ router.post('/login', async (req, res) => {
     const { email, password } = req.body;
 
     // Find user
-    const user = users.find(u => u.email === email && u.password === password);
-    if (!user) {
+    const user = users.findOne('email', email);
+    if (!user || user.password !== password) {
       return res.status(401).json({ error: 'Invalid credentials' });
     }
 
@@ -93,7 +90,7 @@ router.get('/profile', async (req, res) => {
 
     // Verify token
     const decoded = jwt.verify(token, process.env.JWT_SECRET || 'fallback-secret');
-    const user = users.find(u => u.id === decoded.userId);
+    const user = users.get(decoded.userId);
 
     if (!user) {
       return res.status(404).json({ error: 'User not found' });
@@ -5,6 +5,9 @@ const { body, validationResult } = require('express-validator');
 
 const router = express.Router();
 
+// Password hashing runs on a bounded worker pool that rejects with 503 when saturated
+const sendBusy = res => res.status(503).set('Retry-After', '1').json({ error: 'Server busy, please retry' });
+
 // Generate JWT token
 const generateToken = (userId) => {
   return jwt.sign({ userId }, process.env.JWT_SECRET || 'fallback-secret', {
@@ -65,6 +68,7 @@ router.post('/register', [
       }
     });
   } catch (error) {
+    if (error.status === 503) return sendBusy(res);
     console.error('Register error:', error);
     res.status(500).json({ error: 'Registration failed' });
   }
@@ -95,8 +99,11 @@ router.post('/login', [
       return res.status(401).json({ error: 'Invalid credentials' });
     }
 
-    // Update last login
+    // Update last login, upgrading the hash if the configured cost changed
     user.lastLogin = new Date();
+    if (user.needsRehash()) {
+      user.password = password;
+    }
     await user.save();
 
     // Generate token
@@ -115,6 +122,7 @@ router.post('/login', [
       }
     });
   } catch (error) {
+    if (error.status === 503) return sendBusy(res);
     console.error('Login error:', error);
     res.status(500).json({ error: 'Login failed' });
   }
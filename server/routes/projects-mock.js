@@ -1,9 +1,9 @@
 const express = require('express');
 const jwt = require('jsonwebtoken');
+const { store } = require('../services/mockStore');
 const router = express.Router();
 
-// Mock project storage
-let projects = [];
+const projects = store.projects;
 
 // Auth middleware
 const auth = (req, res, next) => {
@@ -23,7 +23,7 @@ const auth = (req, res, next) => {
 
 // Get all projects
 router.get('/', auth, (req, res) => {
-  const userProjects = projects.filter(p => p.owner === req.userId);
+  const userProjects = projects.findBy('owner', req.userId);
   res.json({
     projects: userProjects,
     pagination: { page: 1, limit: 10, total: userProjects.length }
@@ -38,15 +38,12 @@ router.post('/', auth, (req, res) => {
     return res.status(400).json({ error: 'Validation failed' });
   }
 
-  const newProject = {
-    id: Date.now().toString(),
+  const newProject = projects.insert({
     name,
     description,
     owner: req.userId,
     createdAt: new Date()
-  };
-
-  projects.push(newProject);
+  });
 
   res.status(201).json({
     message: 'Project created successfully',
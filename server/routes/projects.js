@@ -1,23 +1,101 @@
 const express = require('express');
-const { body, validationResult } = require('express-validator');
+const mongoose = require('mongoose');
+const { body, query, validationResult } = require('express-validator');
 const Project = require('../models/Project');
+const Task = require('../models/Task');
 const auth = require('../middleware/auth');
+const conditionalGet = require('../middleware/conditionalGet');
+const { populateRefs } = require('../services/dataloader');
+const { publish } = require('../services/events');
+const { encodeDateCursor, decodeDateCursor, afterDateCursor } = require('../services/pagination');
+const {
+  EXPORT_FORMATS,
+  TASK_EXPORT_FIELDS,
+  DEFAULT_TASK_EXPORT_FIELDS,
+  parseExportFields,
+  streamExport
+} = require('../services/exportStream');
 
 const router = express.Router();
 
+const PROJECTABLE_FIELDS = [
+  'name', 'description', 'owner', 'team', 'status', 'priority', 'progress',
+  'totalTasks', 'completedTasks', 'tags', 'startDate', 'endDate', 'createdAt', 'updatedAt'
+];
+const PROJECT_LIST_FIELDS = ['name', 'description', 'owner', 'status', 'priority', 'progress', 'tags', 'endDate', 'createdAt'];
+const DEFAULT_PAGE_SIZE = 10;
+const MAX_PAGE_SIZE = 100;
+
+// fields=name,status -> ['name', 'status'], or null if any field is unknown
+const parseFields = (value) => {
+  const fields = String(value).split(',').map(field => field.trim()).filter(Boolean);
+  if (fields.length === 0 || fields.some(field => !PROJECTABLE_FIELDS.includes(field))) {
+    return null;
+  }
+  return fields;
+};
+
 // Get all projects
-router.get('/', auth, async (req, res) => {
+router.get('/', auth, conditionalGet(['Project', 'User']), [
+  query('limit').optional().isInt({ min: 1, max: MAX_PAGE_SIZE }),
+  query('cursor').optional().custom(value => Boolean(decodeDateCursor(value))),
+  query('status').optional().isIn(['planning', 'in-progress', 'testing', 'completed', 'on-hold']),
+  query('priority').optional().isIn(['low', 'medium', 'high', 'critical']),
+  query('fields').optional().custom(value => parseFields(value) !== null)
+], async (req, res) => {
   try {
-    const projects = await Project.find({
+    const errors = validationResult(req);
+    if (!errors.isEmpty()) {
+      return res.status(400).json({ error: 'Validation failed' });
+    }
+
+    const limit = parseInt(req.query.limit) || DEFAULT_PAGE_SIZE;
+    const fields = req.query.fields ? parseFields(req.query.fields) : PROJECT_LIST_FIELDS;
+    const userId = new mongoose.Types.ObjectId(req.userId);
+
+    const filter = {
       $or: [
-        { owner: req.userId },
-        { 'team.user': req.userId }
+        { owner: userId },
+        { 'team.user': userId }
       ]
-    }).populate('owner', 'username firstName lastName');
+    };
+    if (req.query.status) filter.status = req.query.status;
+    if (req.query.priority) filter.priority = req.query.priority;
+
+    // The cursor range goes in the query itself, so a page reads only its
+    // own rows off the { updatedAt, _id } index
+    const pageFilter = req.query.cursor
+      ? { $and: [filter, afterDateCursor('updatedAt', decodeDateCursor(req.query.cursor))] }
+      : filter;
+    const projection = { updatedAt: 1 };
+    fields.forEach((field) => {
+      projection[field] = 1;
+    });
+
+    const [projects, total] = await Promise.all([
+      Project.find(pageFilter)
+        .select(projection)
+        .sort({ updatedAt: -1, _id: -1 })
+        .limit(limit + 1)
+        .lean(),
+      Project.countDocuments(filter)
+    ]);
+
+    const hasMore = projects.length > limit;
+    if (hasMore) projects.pop();
+
+    if (fields.includes('owner')) {
+      await populateRefs(req.loaders, projects, { owner: 'users' });
+    }
 
     res.json({
       projects,
-      pagination: { page: 1, limit: 10, total: projects.length }
+      pagination: {
+        limit,
+        total,
+        hasMore,
+        nextCursor: hasMore ? encodeDateCursor(projects[projects.length - 1], 'updatedAt') : null
+      }
     });
   } catch (error) {
     console.error('Get projects error:', error);
@@ -28,14 +106,14 @@ router.get('/', auth, async (req, res) => {
 // Get single project
 router.get('/:id', auth, async (req, res) => {
   try {
-    const project = await Project.findById(req.params.id)
-      .populate('owner', 'username firstName lastName')
-      .populate('team.user', 'username firstName lastName');
+    const project = await Project.findById(req.params.id).lean();
 
     if (!project) {
       return res.status(404).json({ error: 'Project not found' });
     }
 
+    await populateRefs(req.loaders, project, { owner: 'users', 'team.user': 'users' });
+
     // Check access
     const hasAccess = project.owner._id.toString() === req.userId ||
                    project.team.some(member => member.user._id.toString() === req.userId);
@@ -51,6 +129,52 @@ router.get('/:id', auth, async (req, res) => {
   }
 });
 
+// Export a project's tasks as NDJSON or CSV
+router.get('/:id/export', auth, [
+  query('format').optional().isIn(EXPORT_FORMATS),
+  query('fields').optional().custom(value => Boolean(parseExportFields(value, TASK_EXPORT_FIELDS))),
+  query('gzip').optional().isBoolean()
+], async (req, res) => {
+  try {
+    const errors = validationResult(req);
+    if (!errors.isEmpty() || !mongoose.isValidObjectId(req.params.id)) {
+      return res.status(400).json({ error: 'Validation failed' });
+    }
+
+    const project = await Project.findById(req.params.id).select('owner team.user').lean();
+
+    if (!project) {
+      return res.status(404).json({ error: 'Project not found' });
+    }
+
+    const hasAccess = project.owner.toString() === req.userId ||
+                   project.team.some(member => member.user && member.user.toString() === req.userId);
+
+    if (!hasAccess) {
+      return res.status(403).json({ error: 'Access denied' });
+    }
+
+    const fields = req.query.fields
+      ? parseExportFields(req.query.fields, TASK_EXPORT_FIELDS)
+      : DEFAULT_TASK_EXPORT_FIELDS;
+
+    const tasks = Task.find({ project: project._id })
+      .select(fields.join(' '))
+      .sort({ createdAt: -1 })
+      .lean();
+
+    streamExport(res, tasks, {
+      format: req.query.format || 'ndjson',
+      fields,
+      filename: `project-${project._id}-tasks`,
+      gzip: req.query.gzip === 'true'
+    });
+  } catch (error) {
+    console.error('Export project error:', error);
+    res.status(500).json({ error: 'Failed to export project' });
+  }
+});
+
 // Create project
 router.post('/', auth, [
   body('name').notEmpty().withMessage('Project name is required'),
@@ -76,8 +200,8 @@ router.post('/', auth, [
 
     await project.save();
 
-    const populatedProject = await Project.findById(project._id)
-      .populate('owner', 'username firstName lastName');
+    const populatedProject = await populateRefs(req.loaders, await Project.findById(project._id).lean(), { owner: 'users' });
+    publish('project.created', project._id, populatedProject);
 
     res.status(201).json({
       message: 'Project created successfully',
@@ -1,9 +1,9 @@
 const express = require('express');
 const jwt = require('jsonwebtoken');
+const { store } = require('../services/mockStore');
 const router = express.Router();
 
-// Mock task storage
-let tasks = [];
+const tasks = store.tasks;
 
 // Auth middleware
 const auth = (req, res, next) => {
@@ -23,7 +23,7 @@ const auth = (req, res, next) => {
 
 // Get all tasks
 router.get('/', auth, (req, res) => {
-  const userTasks = tasks.filter(t => t.assignee === req.userId || t.reporter === req.userId);
+  const userTasks = tasks.findByAny([['assignee', req.userId], ['reporter', req.userId]]);
   res.json({ tasks: userTasks });
 });
 
@@ -35,17 +35,14 @@ router.post('/', auth, (req, res) => {
     return res.status(400).json({ error: 'Validation failed' });
   }
 
-  const newTask = {
-    id: Date.now().toString(),
+  const newTask = tasks.insert({
     title,
     description,
     project,
     assignee: req.userId,
     reporter: req.userId,
     createdAt: new Date()
-  };
-
-  tasks.push(newTask);
+  });
 
   res.status(201).json({
     message: 'Task created successfully',
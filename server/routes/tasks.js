@@ -1,40 +1,196 @@
 const express = require('express');
-const { body, validationResult } = require('express-validator');
+const mongoose = require('mongoose');
+const { body, query, validationResult } = require('express-validator');
 const Task = require('../models/Task');
 const Project = require('../models/Project');
+const Comment = require('../models/Comment');
+const Subtask = require('../models/Subtask');
 const auth = require('../middleware/auth');
+const conditionalGet = require('../middleware/conditionalGet');
+const statsRollup = require('../services/statsRollup');
+const performanceRollup = require('../services/performanceRollup');
+const { populateRefs } = require('../services/dataloader');
+const { encodeDateCursor, decodeDateCursor, afterDateCursor } = require('../services/pagination');
+const { MAX_OPERATIONS, runBulkTaskOperations } = require('../services/bulkTasks');
+const { publish, publishTask, publishTaskChanges } = require('../services/events');
+const {
+  EXPORT_FORMATS,
+  TASK_EXPORT_FIELDS,
+  DEFAULT_TASK_EXPORT_FIELDS,
+  parseExportFields,
+  streamExport
+} = require('../services/exportStream');
 
 const router = express.Router();
 
+const TASK_STATUSES = ['todo', 'in-progress', 'review', 'testing', 'completed', 'blocked'];
+const TASK_LIST_FIELDS = 'title status priority type project assignee reporter dueDate estimatedHours actualHours tags ' +
+  'commentCount subtaskCount completedSubtaskCount createdAt updatedAt';
+const DEFAULT_PAGE_SIZE = 20;
+const MAX_PAGE_SIZE = 100;
+const COUNT_CAP = 10000;
+const TASK_REFS = { project: 'projects', assignee: 'users', reporter: 'users' };
+
+// One newest-first keyset page of a per-task collection
+const findPage = async (Model, filter, { limit: rawLimit, cursor }) => {
+  const limit = parseInt(rawLimit) || DEFAULT_PAGE_SIZE;
+  const pageFilter = cursor
+    ? { $and: [filter, afterDateCursor('createdAt', decodeDateCursor(cursor))] }
+    : filter;
+
+  const items = await Model.find(pageFilter)
+    .sort({ createdAt: -1, _id: -1 })
+    .limit(limit + 1)
+    .lean();
+
+  const hasMore = items.length > limit;
+  if (hasMore) items.pop();
+
+  return {
+    items,
+    pagination: {
+      limit,
+      hasMore,
+      nextCursor: hasMore ? encodeDateCursor(items[items.length - 1], 'createdAt') : null
+    }
+  };
+};
+
+// Keep project counters, stats rollups and performance buckets in step with a
+// batch of task writes. All can be rebuilt from tasks, so a failure here must
+// not fail the write.
+const recordTaskChanges = (changes) => Promise.all([
+  Project.applyTaskChanges(changes)
+    .catch(error => console.error('Project progress error:', error)),
+  statsRollup.applyTaskChanges(changes)
+    .catch(error => console.error('Stats rollup error:', error)),
+  performanceRollup.applyTaskChanges(changes)
+    .catch(error => console.error('Performance rollup error:', error))
+]);
+
+const recordTaskChange = (before, after) => recordTaskChanges([[before, after]]);
+
 // Get tasks
-router.get('/', auth, async (req, res) => {
+router.get('/', auth, conditionalGet(['Task', 'Project', 'User']), [
+  query('limit').optional().isInt({ min: 1, max: MAX_PAGE_SIZE }),
+  query('cursor').optional().custom(value => Boolean(decodeDateCursor(value))),
+  query('status').optional().isIn(TASK_STATUSES),
+  query('priority').optional().isIn(['low', 'medium', 'high', 'urgent']),
+  query('assignee').optional().isMongoId(),
+  query('includeTotal').optional().isBoolean()
+], async (req, res) => {
   try {
-    const tasks = await Task.find({
+    const errors = validationResult(req);
+    if (!errors.isEmpty()) {
+      return res.status(400).json({ error: 'Validation failed' });
+    }
+
+    const limit = parseInt(req.query.limit) || DEFAULT_PAGE_SIZE;
+    const { status, priority, assignee, cursor } = req.query;
+
+    const filter = {
       $or: [
         { assignee: req.userId },
         { reporter: req.userId }
       ]
-    }).populate('project', 'name');
+    };
+    if (status) filter.status = status;
+    if (priority) filter.priority = priority;
+    if (assignee) filter.assignee = assignee;
+
+    const pageFilter = cursor
+      ? { $and: [filter, afterDateCursor('updatedAt', decodeDateCursor(cursor))] }
+      : filter;
+
+    const tasks = await Task.find(pageFilter)
+      .select(TASK_LIST_FIELDS)
+      .sort({ updatedAt: -1, _id: -1 })
+      .limit(limit + 1)
+      .lean();
+
+    const hasMore = tasks.length > limit;
+    if (hasMore) tasks.pop();
+
+    await populateRefs(req.loaders, tasks, { project: 'projects', assignee: 'users' });
+
+    const pagination = {
+      limit,
+      hasMore,
+      nextCursor: hasMore ? encodeDateCursor(tasks[tasks.length - 1], 'updatedAt') : null
+    };
+
+    // Counting stops at COUNT_CAP so large result sets stay cheap
+    if (req.query.includeTotal === 'true') {
+      const total = await Task.countDocuments(filter, { limit: COUNT_CAP });
+      pagination.total = total;
+      pagination.totalIsEstimate = total === COUNT_CAP;
+    }
 
-    res.json({ tasks });
+    res.json({ tasks, pagination });
   } catch (error) {
     console.error('Get tasks error:', error);
     res.status(500).json({ error: 'Failed to get tasks' });
   }
 });
 
+// Export tasks as NDJSON or CSV, with the same visibility as GET /
+router.get('/export', auth, [
+  query('format').optional().isIn(EXPORT_FORMATS),
+  query('fields').optional().custom(value => Boolean(parseExportFields(value, TASK_EXPORT_FIELDS))),
+  query('gzip').optional().isBoolean(),
+  query('status').optional().isIn(TASK_STATUSES),
+  query('priority').optional().isIn(['low', 'medium', 'high', 'urgent']),
+  query('assignee').optional().isMongoId()
+], async (req, res) => {
+  try {
+    const errors = validationResult(req);
+    if (!errors.isEmpty()) {
+      return res.status(400).json({ error: 'Validation failed' });
+    }
+
+    const { status, priority, assignee } = req.query;
+    const fields = req.query.fields
+      ? parseExportFields(req.query.fields, TASK_EXPORT_FIELDS)
+      : DEFAULT_TASK_EXPORT_FIELDS;
+
+    const filter = {
+      $or: [
+        { assignee: req.userId },
+        { reporter: req.userId }
+      ]
+    };
+    if (status) filter.status = status;
+    if (priority) filter.priority = priority;
+    if (assignee) filter.assignee = assignee;
+
+    const tasks = Task.find(filter)
+      .select(fields.join(' '))
+      .sort({ updatedAt: -1, _id: -1 })
+      .lean();
+
+    streamExport(res, tasks, {
+      format: req.query.format || 'ndjson',
+      fields,
+      filename: 'tasks',
+      gzip: req.query.gzip === 'true'
+    });
+  } catch (error) {
+    console.error('Export tasks error:', error);
+    res.status(500).json({ error: 'Failed to export tasks' });
+  }
+});
+
 // Get single task
 router.get('/:id', auth, async (req, res) => {
   try {
-    const task = await Task.findById(req.params.id)
-      .populate('project', 'name')
-      .populate('assignee', 'username firstName lastName')
-      .populate('reporter', 'username firstName lastName');
+    const task = await Task.findById(req.params.id).lean();
 
     if (!task) {
       return res.status(404).json({ error: 'Task not found' });
     }
 
+    await populateRefs(req.loaders, task, TASK_REFS);
+
     res.json({ task });
   } catch (error) {
     console.error('Get task error:', error);
@@ -74,11 +230,10 @@ router.post('/', auth, [
     });
 
     await task.save();
+    await recordTaskChange(null, task);
 
-    const populatedTask = await Task.findById(task._id)
-      .populate('project', 'name')
-      .populate('assignee', 'username firstName lastName')
-      .populate('reporter', 'username firstName lastName');
+    const populatedTask = await populateRefs(req.loaders, await Task.findById(task._id).lean(), TASK_REFS);
+    publishTask('task.created', populatedTask);
 
     res.status(201).json({
       message: 'Task created successfully',
@@ -90,11 +245,38 @@ router.post('/', auth, [
   }
 });
 
+// Bulk create, status change, reassign and delete
+router.post('/bulk', auth, [
+  body('operations').isArray({ min: 1, max: MAX_OPERATIONS })
+], async (req, res) => {
+  try {
+    const errors = validationResult(req);
+    if (!errors.isEmpty()) {
+      return res.status(400).json({ error: 'Validation failed' });
+    }
+
+    const { results, changes } = await runBulkTaskOperations(req.userId, req.body.operations);
+    if (changes.length > 0) {
+      await recordTaskChanges(changes);
+      publishTaskChanges(changes);
+    }
+
+    const succeeded = results.filter(result => result.ok).length;
+    res.json({
+      results,
+      summary: { succeeded, failed: results.length - succeeded }
+    });
+  } catch (error) {
+    console.error('Bulk task error:', error);
+    res.status(500).json({ error: 'Failed to run bulk task operations' });
+  }
+});
+
 // Update task
 router.put('/:id', auth, [
   body('title').optional().notEmpty().withMessage('Task title is required'),
   body('description').optional().notEmpty().withMessage('Task description is required'),
-  body('status').optional().isIn(['todo', 'in-progress', 'review', 'testing', 'completed', 'blocked']),
+  body('status').optional().isIn(TASK_STATUSES),
   body('priority').optional().isIn(['low', 'medium', 'high', 'urgent']),
   body('assignee').optional().isMongoId(),
   body('estimatedHours').optional().isInt({ min: 0, max: 1000 }),
@@ -107,17 +289,20 @@ router.put('/:id', auth, [
       return res.status(400).json({ error: 'Validation failed' });
     }
 
-    const task = await Task.findById(req.params.id).populate('project');
+    // Task fields the rollups need, plus project access, in one round-trip
+    const task = await Task.findWithAccess(req.params.id, req.userId, {
+      assignee: 1,
+      estimatedHours: 1,
+      actualHours: 1,
+      createdAt: 1,
+      completedDate: 1
+    });
 
     if (!task) {
       return res.status(404).json({ error: 'Task not found' });
     }
 
-    // Check if user has access to this task's project
-    const hasAccess = task.project.owner.toString() === req.userId ||
-      task.project.team.some(member => member.user.toString() === req.userId);
-
-    if (!hasAccess) {
+    if (!task.access.member) {
       return res.status(403).json({ error: 'Access denied' });
     }
 
@@ -133,11 +318,12 @@ router.put('/:id', auth, [
 
     // Handle status transition
     if (status) {
-      const canTransition = task.updateStatus(status);
-      if (!canTransition) {
+      if (!Task.canTransition(task.status, status)) {
         return res.status(400).json({ error: `Invalid status transition from ${task.status} to ${status}` });
       }
-      updateData.status = status;
+      if (status !== task.status) {
+        Object.assign(updateData, Task.statusFields(status));
+      }
     }
 
     // Update assignee
@@ -145,16 +331,21 @@ router.put('/:id', auth, [
       updateData.assignee = assignee;
     }
 
-    const updatedTask = await Task.findByIdAndUpdate(
-      req.params.id,
-      updateData,
+    // Conditional on the status we validated against, so a concurrent
+    // transition cannot be overwritten
+    const updatedTask = await Task.findOneAndUpdate(
+      { _id: task._id, status: task.status },
+      { $set: updateData },
       { new: true, runValidators: true }
-    ).populate('project', 'name')
-     .populate('assignee', 'username firstName lastName')
-     .populate('reporter', 'username firstName lastName');
+    ).lean();
 
-    // Update project progress
-    await task.project.updateProgress();
+    if (!updatedTask) {
+      return res.status(409).json({ error: 'Task was modified concurrently. Reload and try again.' });
+    }
+
+    await recordTaskChange(task, updatedTask);
+    await populateRefs(req.loaders, updatedTask, TASK_REFS);
+    publishTask('task.updated', updatedTask);
 
     res.json({
       message: 'Task updated successfully',
@@ -166,6 +357,40 @@ router.put('/:id', auth, [
   }
 });
 
+// Get task comments, newest first
+router.get('/:id/comments', auth, [
+  query('limit').optional().isInt({ min: 1, max: MAX_PAGE_SIZE }),
+  query('cursor').optional().custom(value => Boolean(decodeDateCursor(value)))
+], async (req, res) => {
+  try {
+    const errors = validationResult(req);
+    if (!errors.isEmpty()) {
+      return res.status(400).json({ error: 'Validation failed' });
+    }
+
+    const task = await Task.findWithAccess(req.params.id, req.userId);
+
+    if (!task) {
+      return res.status(404).json({ error: 'Task not found' });
+    }
+
+    if (!task.access.member) {
+      return res.status(403).json({ error: 'Access denied' });
+    }
+
+    const page = await findPage(Comment, { task: task._id }, req.query);
+    await populateRefs(req.loaders, page.items, { author: 'users' });
+
+    res.json({
+      comments: page.items,
+      pagination: page.pagination
+    });
+  } catch (error) {
+    console.error('Get comments error:', error);
+    res.status(500).json({ error: 'Internal server error' });
+  }
+});
+
 // Add comment to task
 router.post('/:id/comments', auth, [
   body('text').notEmpty().trim().escape()
@@ -176,29 +401,26 @@ router.post('/:id/comments', auth, [
       return res.status(400).json({ error: 'Validation failed' });
     }
 
-    const task = await Task.findById(req.params.id).populate('project');
+    const task = await Task.findWithAccess(req.params.id, req.userId);
 
     if (!task) {
       return res.status(404).json({ error: 'Task not found' });
     }
 
-    // Check if user has access to this task's project
-    const hasAccess = task.project.owner.toString() === req.userId ||
-      task.project.team.some(member => member.user.toString() === req.userId);
-
-    if (!hasAccess) {
+    if (!task.access.member) {
       return res.status(403).json({ error: 'Access denied' });
     }
 
-    const { text } = req.body;
-    await task.addComment(text, req.userId);
+    // Append-only insert; the task document only carries the count
+    const comment = await Comment.create({ task: task._id, author: req.userId, text: req.body.text });
+    await Task.updateOne({ _id: task._id }, { $inc: { commentCount: 1 } });
 
-    const updatedTask = await Task.findById(task._id)
-      .populate('comments.author', 'username firstName lastName');
+    const populatedComment = await populateRefs(req.loaders, comment.toObject(), { author: 'users' });
+    publish('comment.created', task.project, populatedComment);
 
-    res.json({
+    res.status(201).json({
       message: 'Comment added successfully',
-      comments: updatedTask.comments
+      comment: populatedComment
     });
   } catch (error) {
     console.error('Add comment error:', error);
@@ -206,6 +428,39 @@ router.post('/:id/comments', auth, [
   }
 });
 
+// Get subtasks
+router.get('/:id/subtasks', auth, [
+  query('limit').optional().isInt({ min: 1, max: MAX_PAGE_SIZE }),
+  query('cursor').optional().custom(value => Boolean(decodeDateCursor(value)))
+], async (req, res) => {
+  try {
+    const errors = validationResult(req);
+    if (!errors.isEmpty()) {
+      return res.status(400).json({ error: 'Validation failed' });
+    }
+
+    const task = await Task.findWithAccess(req.params.id, req.userId);
+
+    if (!task) {
+      return res.status(404).json({ error: 'Task not found' });
+    }
+
+    if (!task.access.member) {
+      return res.status(403).json({ error: 'Access denied' });
+    }
+
+    const page = await findPage(Subtask, { task: task._id }, req.query);
+
+    res.json({
+      subtasks: page.items,
+      pagination: page.pagination
+    });
+  } catch (error) {
+    console.error('Get subtasks error:', error);
+    res.status(500).json({ error: 'Internal server error' });
+  }
+});
+
 // Add subtask
 router.post('/:id/subtasks', auth, [
   body('title').notEmpty().trim().escape()
@@ -216,27 +471,23 @@ router.post('/:id/subtasks', auth, [
       return res.status(400).json({ error: 'Validation failed' });
     }
 
-    const task = await Task.findById(req.params.id).populate('project');
+    const task = await Task.findWithAccess(req.params.id, req.userId);
 
     if (!task) {
       return res.status(404).json({ error: 'Task not found' });
     }
 
-    // Check if user has access to this task's project
-    const hasAccess = task.project.owner.toString() === req.userId ||
-      task.project.team.some(member => member.user.toString() === req.userId);
-
-    if (!hasAccess) {
+    if (!task.access.member) {
       return res.status(403).json({ error: 'Access denied' });
     }
 
-    const { title } = req.body;
-    task.subtasks.push({ title });
-    await task.save();
+    const subtask = await Subtask.create({ task: task._id, title: req.body.title });
+    await Task.updateOne({ _id: task._id }, { $inc: { subtaskCount: 1 } });
+    publish('subtask.created', task.project, subtask.toObject());
 
-    res.json({
+    res.status(201).json({
       message: 'Subtask added successfully',
-      subtasks: task.subtasks
+      subtask
     });
   } catch (error) {
     console.error('Add subtask error:', error);
@@ -247,31 +498,36 @@ router.post('/:id/subtasks', auth, [
 // Toggle subtask completion
 router.put('/:id/subtasks/:subtaskId', auth, async (req, res) => {
   try {
-    const task = await Task.findById(req.params.id).populate('project');
+    if (!mongoose.isValidObjectId(req.params.subtaskId)) {
+      return res.status(404).json({ error: 'Subtask not found' });
+    }
+
+    const task = await Task.findWithAccess(req.params.id, req.userId);
 
     if (!task) {
       return res.status(404).json({ error: 'Task not found' });
     }
 
-    // Check if user has access to this task's project
-    const hasAccess = task.project.owner.toString() === req.userId ||
-      task.project.team.some(member => member.user.toString() === req.userId);
-
-    if (!hasAccess) {
+    if (!task.access.member) {
       return res.status(403).json({ error: 'Access denied' });
     }
 
-    const subtask = task.subtasks.id(req.params.subtaskId);
+    const subtask = await Subtask.findOneAndUpdate(
+      { _id: req.params.subtaskId, task: task._id },
+      [{ $set: { completed: { $not: '$completed' } } }],
+      { new: true }
+    ).lean();
+
     if (!subtask) {
       return res.status(404).json({ error: 'Subtask not found' });
     }
 
-    subtask.completed = !subtask.completed;
-    await task.save();
+    await Task.updateOne({ _id: task._id }, { $inc: { completedSubtaskCount: subtask.completed ? 1 : -1 } });
+    publish('subtask.updated', task.project, subtask);
 
     res.json({
       message: 'Subtask updated successfully',
-      subtasks: task.subtasks
+      subtask
     });
   } catch (error) {
     console.error('Toggle subtask error:', error);
@@ -282,24 +538,39 @@ router.put('/:id/subtasks/:subtaskId', auth, async (req, res) => {
 // Delete task
 router.delete('/:id', auth, async (req, res) => {
   try {
-    const task = await Task.findById(req.params.id).populate('project');
+    const task = await Task.findWithAccess(req.params.id, req.userId, {
+      assignee: 1,
+      estimatedHours: 1,
+      actualHours: 1,
+      createdAt: 1,
+      completedDate: 1
+    });
 
     if (!task) {
       return res.status(404).json({ error: 'Task not found' });
     }
 
     // Check if user is project owner or task reporter
-    const isOwner = task.project.owner.toString() === req.userId;
+    const isOwner = task.access.owner;
     const isReporter = task.reporter.toString() === req.userId;
 
     if (!isOwner && !isReporter) {
       return res.status(403).json({ error: 'Access denied. Only project owner or task reporter can delete task' });
     }
 
-    await Task.findByIdAndDelete(req.params.id);
+    // Null when a concurrent delete got there first; only the request that
+    // removed the task adjusts counters and rollups
+    const deleted = await Task.findOneAndDelete({ _id: task._id }).lean();
+    if (!deleted) {
+      return res.status(404).json({ error: 'Task not found' });
+    }
 
-    // Update project progress
-    await task.project.updateProgress();
+    await Promise.all([
+      Comment.deleteMany({ task: deleted._id }),
+      Subtask.deleteMany({ task: deleted._id }),
+      recordTaskChange(deleted, null)
+    ]);
+    publishTask('task.deleted', deleted);
 
     res.json({
       message: 'Task deleted successfully'
@@ -0,0 +1,83 @@
+const mongoose = require('mongoose');
+require('dotenv').config();
+const Task = require('../models/Task');
+const Comment = require('../models/Comment');
+const Subtask = require('../models/Subtask');
+
+// Move embedded task comments and subtasks into their own collections and
+// replace the arrays with counts. Safe to re-run: rows keep their original _id.
+// Usage: npm run migrate:task-children
+const migrateTask = async (task) => {
+  const comments = task.comments || [];
+  const subtasks = task.subtasks || [];
+
+  if (comments.length > 0) {
+    await Comment.bulkWrite(comments.map(comment => ({
+      updateOne: {
+        filter: { _id: comment._id },
+        update: {
+          $setOnInsert: {
+            task: task._id,
+            author: comment.author,
+            text: comment.text,
+            createdAt: comment.createdAt || task.createdAt,
+            updatedAt: comment.createdAt || task.createdAt
+          }
+        },
+        upsert: true
+      }
+    })), { ordered: false, timestamps: false });
+  }
+
+  if (subtasks.length > 0) {
+    await Subtask.bulkWrite(subtasks.map(subtask => ({
+      updateOne: {
+        filter: { _id: subtask._id },
+        update: {
+          $setOnInsert: {
+            task: task._id,
+            title: subtask.title,
+            completed: Boolean(subtask.completed),
+            createdAt: subtask.createdAt || task.createdAt,
+            updatedAt: subtask.createdAt || task.createdAt
+          }
+        },
+        upsert: true
+      }
+    })), { ordered: false, timestamps: false });
+  }
+
+  // Raw collection update: the arrays are no longer part of the schema
+  await Task.collection.updateOne({ _id: task._id }, {
+    $set: {
+      commentCount: comments.length,
+      subtaskCount: subtasks.length,
+      completedSubtaskCount: subtasks.filter(subtask => subtask.completed).length
+    },
+    $unset: { comments: '', subtasks: '' }
+  });
+};
+
+const run = async () => {
+  await mongoose.connect(process.env.MONGODB_URI || 'mongodb://localhost:27017/taskmaster');
+
+  const cursor = Task.collection.find(
+    { $or: [{ comments: { $exists: true } }, { subtasks: { $exists: true } }] },
+    { projection: { comments: 1, subtasks: 1, createdAt: 1 } }
+  );
+
+  let migrated = 0;
+  for await (const task of cursor) {
+    await migrateTask(task);
+    migrated++;
+  }
+
+  console.log(`Migrated comments and subtasks for ${migrated} tasks`);
+  await mongoose.connection.close();
+};
+
+run().catch(async (error) => {
+  console.error('Task children migration failed:', error);
+  await mongoose.connection.close();
+  process.exit(1);
+});
@@ -0,0 +1,24 @@
+const mongoose = require('mongoose');
+require('dotenv').config();
+const { rebuildBuckets } = require('../services/performanceRollup');
+
+// Rebuild the daily performance buckets from the tasks collection.
+// Usage: npm run performance:rebuild [-- <projectId> ...]
+const run = async () => {
+  const projectIds = process.argv.slice(2);
+
+  await mongoose.connect(process.env.MONGODB_URI || 'mongodb://localhost:27017/taskmaster');
+
+  const started = Date.now();
+  const result = await rebuildBuckets(projectIds.length > 0 ? projectIds : undefined);
+  console.log(`Backfilled completedDate on ${result.backfilled} tasks`);
+  console.log(`Rebuilt ${result.buckets} daily buckets in ${Date.now() - started}ms`);
+
+  await mongoose.connection.close();
+};
+
+run().catch(async (error) => {
+  console.error('Performance rebuild failed:', error);
+  await mongoose.connection.close();
+  process.exit(1);
+});
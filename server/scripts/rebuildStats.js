@@ -0,0 +1,23 @@
+const mongoose = require('mongoose');
+require('dotenv').config();
+const { rebuildRollups } = require('../services/statsRollup');
+
+// Rebuild the per-project statistics rollups from the tasks collection.
+// Usage: npm run stats:rebuild [-- <projectId> ...]
+const run = async () => {
+  const projectIds = process.argv.slice(2);
+
+  await mongoose.connect(process.env.MONGODB_URI || 'mongodb://localhost:27017/taskmaster');
+
+  const started = Date.now();
+  const result = await rebuildRollups(projectIds.length > 0 ? projectIds : undefined);
+  console.log(`Rebuilt ${result.buckets} rollup buckets in ${Date.now() - started}ms`);
+
+  await mongoose.connection.close();
+};
+
+run().catch(async (error) => {
+  console.error('Stats rebuild failed:', error);
+  await mongoose.connection.close();
+  process.exit(1);
+});
@@ -0,0 +1,23 @@
+const mongoose = require('mongoose');
+require('dotenv').config();
+const Project = require('../models/Project');
+require('../models/Task');
+
+// Recount each project's tasks and repair drifted progress counters.
+// Usage: npm run progress:reconcile [-- <projectId> ...]
+const run = async () => {
+  const projectIds = process.argv.slice(2);
+
+  await mongoose.connect(process.env.MONGODB_URI || 'mongodb://localhost:27017/taskmaster');
+
+  const result = await Project.reconcileProgress(projectIds.length > 0 ? projectIds : undefined);
+  console.log(`Checked ${result.checked} projects, repaired ${result.repaired}`);
+
+  await mongoose.connection.close();
+};
+
+run().catch(async (error) => {
+  console.error('Progress reconciliation failed:', error);
+  await mongoose.connection.close();
+  process.exit(1);
+});
@@ -0,0 +1,56 @@
+const mongoose = require('mongoose');
+require('dotenv').config();
+const User = require('../models/User');
+const Project = require('../models/Project');
+const Task = require('../models/Task');
+const { buildSearchTerms } = require('../services/search');
+
+const BATCH_SIZE = 500;
+
+// Backfill searchTerms for documents written before search indexing existed.
+// Usage: npm run search:reindex
+const reindex = async (Model) => {
+  const fields = Model.searchFields;
+  const cursor = Model.find().select(Object.keys(fields).join(' ')).lean().cursor();
+  let batch = [];
+  let total = 0;
+
+  for await (const doc of cursor) {
+    batch.push({
+      updateOne: {
+        filter: { _id: doc._id },
+        update: { $set: { searchTerms: buildSearchTerms(doc, fields) } }
+      }
+    });
+
+    if (batch.length === BATCH_SIZE) {
+      await Model.bulkWrite(batch, { ordered: false });
+      total += batch.length;
+      batch = [];
+    }
+  }
+
+  if (batch.length > 0) {
+    await Model.bulkWrite(batch, { ordered: false });
+    total += batch.length;
+  }
+
+  return total;
+};
+
+const run = async () => {
+  await mongoose.connect(process.env.MONGODB_URI || 'mongodb://localhost:27017/taskmaster');
+
+  for (const Model of [User, Project, Task]) {
+    const count = await reindex(Model);
+    console.log(`${Model.modelName}: reindexed ${count} documents`);
+  }
+
+  await mongoose.connection.close();
+};
+
+run().catch(async (error) => {
+  console.error('Search reindex failed:', error);
+  await mongoose.connection.close();
+  process.exit(1);
+});
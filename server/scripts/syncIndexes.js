@@ -0,0 +1,24 @@
+const mongoose = require('mongoose');
+require('dotenv').config();
+const { syncIndexes, formatIndexReport } = require('../services/indexes');
+
+// Build schema-declared indexes and print a report.
+// Usage: npm run indexes:sync [-- --drop]
+const run = async () => {
+  const drop = process.argv.includes('--drop');
+
+  await mongoose.connect(process.env.MONGODB_URI || 'mongodb://localhost:27017/taskmaster', {
+    autoIndex: false
+  });
+
+  const report = await syncIndexes({ drop });
+  console.log(formatIndexReport(report));
+
+  await mongoose.connection.close();
+};
+
+run().catch(async (error) => {
+  console.error('Index sync failed:', error);
+  await mongoose.connection.close();
+  process.exit(1);
+});
@@ -0,0 +1,229 @@
+const mongoose = require('mongoose');
+const Task = require('../models/Task');
+const Project = require('../models/Project');
+const Comment = require('../models/Comment');
+const Subtask = require('../models/Subtask');
+const { buildSearchTerms } = require('./search');
+const { touchVersion } = require('./versions');
+
+const MAX_OPERATIONS = 1000;
+const OPERATION_TYPES = ['create', 'status', 'assign', 'delete'];
+const SNAPSHOT_FIELDS = 'project reporter assignee status estimatedHours actualHours createdAt completedDate';
+
+const fail = (result, error) => Object.assign(result, { ok: false, error });
+
+// Access to each distinct project, loaded in one query
+const loadProjectAccess = async (projectIds, userId) => {
+  const projects = await Project.find({ _id: { $in: projectIds } })
+    .select('owner team.user')
+    .lean();
+
+  const access = new Map();
+  projects.forEach((project) => {
+    const owner = project.owner.toString() === userId;
+    const member = owner || project.team.some(entry => entry.user && entry.user.toString() === userId);
+    access.set(project._id.toString(), { owner, member });
+  });
+  return access;
+};
+
+const buildCreate = (operation, userId, result) => {
+  const { title, description, project, priority, type, estimatedHours, assignee } = operation.task || {};
+  const task = new Task({
+    title,
+    description,
+    project,
+    assignee: assignee || userId,
+    reporter: userId,
+    priority: priority || 'medium',
+    type: type || 'feature',
+    estimatedHours
+  });
+
+  const error = task.validateSync();
+  if (error) {
+    fail(result, `Invalid task: ${Object.keys(error.errors).join(', ')}`);
+    return null;
+  }
+
+  task.searchTerms = buildSearchTerms(task, Task.searchFields);
+  const now = new Date();
+  task.createdAt = now;
+  task.updatedAt = now;
+  return task.toObject();
+};
+
+// Run a batch of task operations with one read of the touched tasks, one
+// access check per distinct project, one bulkWrite for the creates and one
+// conditional write per other operation, run in parallel.
+// Returns per-item results plus the [before, after] pairs for counters/rollups.
+const runBulkTaskOperations = async (userId, operations) => {
+  const results = operations.map((operation, index) => ({ index, op: operation && operation.op, ok: true }));
+
+  // Each task is read once before any write, so a second operation on the
+  // same task would be checked and diffed against a stale snapshot
+  const existingIds = [];
+  const seenIds = new Set();
+  operations.forEach((operation, i) => {
+    if (!operation || !OPERATION_TYPES.includes(operation.op)) {
+      fail(results[i], 'Unknown operation');
+    } else if (operation.op !== 'create' && !mongoose.isValidObjectId(operation.id)) {
+      fail(results[i], 'Invalid task id');
+    } else if (operation.op !== 'create' && seenIds.has(operation.id.toString())) {
+      fail(results[i], 'Task appears more than once in this batch');
+    } else if (operation.op !== 'create') {
+      seenIds.add(operation.id.toString());
+      existingIds.push(operation.id);
+    }
+  });
+
+  const existing = await Task.find({ _id: { $in: existingIds } }).select(SNAPSHOT_FIELDS).lean();
+  const before = new Map(existing.map(task => [task._id.toString(), task]));
+
+  const projectIds = new Set(existing.map(task => task.project.toString()));
+  operations.forEach((operation, i) => {
+    if (results[i].ok && operation.op === 'create') {
+      const project = operation.task && operation.task.project;
+      if (mongoose.isValidObjectId(project)) {
+        projectIds.add(project.toString());
+      } else {
+        fail(results[i], 'Invalid project id');
+      }
+    }
+  });
+  const access = await loadProjectAccess(Array.from(projectIds), userId);
+
+  const created = new Map();
+  // Non-create operations, each written on its own so its change pair comes
+  // from the pre-image of a write that actually happened
+  const guarded = [];
+
+  operations.forEach((operation, i) => {
+    const result = results[i];
+    if (!result.ok) return;
+
+    if (operation.op === 'create') {
+      const projectAccess = access.get(operation.task.project.toString());
+      if (!projectAccess) return fail(result, 'Project not found');
+      if (!projectAccess.member) return fail(result, 'Access denied');
+
+      const doc = buildCreate(operation, userId, result);
+      if (!doc) return undefined;
+
+      result.id = doc._id.toString();
+      created.set(i, doc);
+      return undefined;
+    }
+
+    const task = before.get(operation.id.toString());
+    result.id = operation.id.toString();
+    if (!task) return fail(result, 'Task not found');
+
+    const projectAccess = access.get(task.project.toString()) || { owner: false, member: false };
+
+    if (operation.op === 'delete') {
+      if (!projectAccess.owner && task.reporter.toString() !== userId) {
+        return fail(result, 'Access denied. Only project owner or task reporter can delete task');
+      }
+      guarded.push({
+        index: i,
+        write: () => Task.findOneAndDelete({ _id: task._id }),
+        apply: () => null,
+        missing: 'Task not found'
+      });
+      return undefined;
+    }
+
+    if (!projectAccess.member) return fail(result, 'Access denied');
+
+    if (operation.op === 'status') {
+      if (!Task.schema.path('status').enumValues.includes(operation.status)) {
+        return fail(result, 'Invalid status');
+      }
+      if (!Task.canTransition(task.status, operation.status)) {
+        return fail(result, `Invalid status transition from ${task.status} to ${operation.status}`);
+      }
+      if (operation.status === task.status) return undefined;
+
+      // Only from the status the transition was checked against
+      const fields = Task.statusFields(operation.status);
+      guarded.push({
+        index: i,
+        write: () => Task.findOneAndUpdate({ _id: task._id, status: task.status }, { $set: fields }),
+        apply: prior => ({ ...prior, ...fields }),
+        missing: 'Task was modified concurrently'
+      });
+      return undefined;
+    }
+
+    if (!mongoose.isValidObjectId(operation.assignee)) {
+      return fail(result, 'Invalid assignee');
+    }
+    const assignment = { assignee: new mongoose.Types.ObjectId(operation.assignee) };
+    guarded.push({
+      index: i,
+      write: () => Task.findOneAndUpdate({ _id: task._id }, { $set: assignment }),
+      apply: prior => ({ ...prior, ...assignment }),
+      missing: 'Task not found'
+    });
+    return undefined;
+  });
+
+  if (created.size > 0) {
+    const createdIndexes = Array.from(created.keys());
+    try {
+      await Task.bulkWrite(
+        Array.from(created.values(), doc => ({ insertOne: { document: doc } })),
+        { ordered: false }
+      );
+    } catch (error) {
+      // Unordered writes carry on past a failed one; anything other than
+      // per-write errors (e.g. a lost connection) fails the whole batch
+      if (!Array.isArray(error.writeErrors)) throw error;
+      error.writeErrors.forEach((writeError) => {
+        fail(results[createdIndexes[writeError.index]], writeError.errmsg || 'Write failed');
+      });
+    }
+    touchVersion(Task.modelName);
+  }
+
+  const changes = [];
+  created.forEach((doc, i) => {
+    if (results[i].ok) changes.push([null, doc]);
+  });
+
+  // A null pre-image means another request deleted or changed the task
+  // first, so there is nothing to count for this one
+  const written = await Promise.all(guarded.map(async ({ index, write, apply, missing }) => {
+    try {
+      const prior = await write().select(SNAPSHOT_FIELDS).lean();
+      if (!prior) {
+        fail(results[index], missing);
+        return null;
+      }
+      return [prior, apply(prior)];
+    } catch (error) {
+      console.error('Bulk task write error:', error);
+      fail(results[index], 'Write failed');
+      return null;
+    }
+  }));
+  written.forEach((change) => {
+    if (change) changes.push(change);
+  });
+
+  const deletedIds = changes.filter(([, after]) => !after).map(([prior]) => prior._id);
+  if (deletedIds.length > 0) {
+    await Promise.all([
+      Comment.deleteMany({ task: { $in: deletedIds } }),
+      Subtask.deleteMany({ task: { $in: deletedIds } })
+    ]);
+  }
+
+  return { results, changes };
+};
+
+module.exports = {
+  MAX_OPERATIONS,
+  runBulkTaskOperations
+};
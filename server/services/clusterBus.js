@@ -0,0 +1,100 @@
+const cluster = require('cluster');
+const { EventEmitter } = require('events');
+
+// Fan-out messaging between cluster workers. broadcast() runs handlers in
+// this process and, when clustered, sends the message to the primary which
+// relays it to every other worker. In a single process it is a plain
+// EventEmitter. Payloads cross the IPC channel as JSON.
+// request() asks the primary for state it owns (e.g. shared rate-limit
+// buckets) and resolves with the handler's result.
+
+const MESSAGE_KEY = 'clusterBus';
+const REQUEST_KEY = 'clusterBusRequest';
+const RESPONSE_KEY = 'clusterBusResponse';
+
+const pending = new Map();
+let nextRequestId = 0;
+
+const local = new EventEmitter();
+local.setMaxListeners(0);
+
+const broadcast = (channel, payload) => {
+  local.emit(channel, payload);
+  if (cluster.isWorker && process.connected) {
+    process.send({ [MESSAGE_KEY]: channel, payload }, () => {});
+  }
+};
+
+const onBroadcast = (channel, handler) => {
+  local.on(channel, handler);
+  return () => local.off(channel, handler);
+};
+
+const request = (channel, payload, { timeoutMs = 100 } = {}) => new Promise((resolve, reject) => {
+  if (!cluster.isWorker || !process.connected) {
+    reject(new Error('Not connected to a cluster primary'));
+    return;
+  }
+
+  const id = nextRequestId++;
+  const timer = setTimeout(() => {
+    pending.delete(id);
+    reject(new Error(`Cluster request ${channel} timed out`));
+  }, timeoutMs);
+
+  pending.set(id, { resolve, timer });
+  process.send({ [REQUEST_KEY]: channel, id, payload }, () => {});
+});
+
+if (cluster.isWorker) {
+  process.on('message', (message) => {
+    if (!message) return;
+
+    if (message[MESSAGE_KEY]) {
+      local.emit(message[MESSAGE_KEY], message.payload);
+    } else if (message[RESPONSE_KEY] !== undefined && pending.has(message[RESPONSE_KEY])) {
+      const { resolve, timer } = pending.get(message[RESPONSE_KEY]);
+      pending.delete(message[RESPONSE_KEY]);
+      clearTimeout(timer);
+      resolve(message.result);
+    }
+  });
+}
+
+// Primary side: forward each worker's broadcasts to all other workers
+const relayBroadcasts = () => {
+  cluster.on('message', (sender, message) => {
+    if (!message || !message[MESSAGE_KEY]) return;
+
+    Object.values(cluster.workers).forEach((worker) => {
+      if (worker && worker !== sender && worker.isConnected()) {
+        // A worker that is exiting may already have closed its channel
+        worker.send(message, () => {});
+      }
+    });
+  });
+};
+
+// Primary side: answer workers' request(channel, ...) calls with handler(payload)
+const handleRequests = (channel, handler) => {
+  cluster.on('message', async (worker, message) => {
+    if (!message || message[REQUEST_KEY] !== channel) return;
+
+    try {
+      const result = await handler(message.payload);
+      if (worker.isConnected()) {
+        worker.send({ [RESPONSE_KEY]: message.id, result }, () => {});
+      }
+    } catch (error) {
+      console.error(`Cluster request ${channel} error:`, error);
+    }
+  });
+};
+
+module.exports = {
+  broadcast,
+  onBroadcast,
+  request,
+  relayBroadcasts,
+  handleRequests
+};
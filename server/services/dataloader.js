@@ -0,0 +1,137 @@
+const mongoose = require('mongoose');
+const LRUCache = require('./lruCache');
+
+// Request-scoped batching for reference lookups. Every load() issued in the
+// same tick is coalesced into a single `$in` query per loader.
+
+const USER_SUMMARY_FIELDS = 'username firstName lastName';
+const PROJECT_SUMMARY_FIELDS = 'name';
+
+class DataLoader {
+  constructor(batchLoad, { sharedCache } = {}) {
+    this.batchLoad = batchLoad;
+    this.sharedCache = sharedCache;
+    this.cache = new Map();
+    this.queue = [];
+  }
+
+  load(id) {
+    if (id == null) return Promise.resolve(null);
+    const key = id.toString();
+
+    if (this.cache.has(key)) return this.cache.get(key);
+
+    const shared = this.sharedCache && this.sharedCache.get(key);
+    if (shared) {
+      const resolved = Promise.resolve(shared);
+      this.cache.set(key, resolved);
+      return resolved;
+    }
+
+    const promise = new Promise((resolve, reject) => {
+      if (this.queue.length === 0) {
+        process.nextTick(() => this.dispatch());
+      }
+      this.queue.push({ key, resolve, reject });
+    });
+    this.cache.set(key, promise);
+    return promise;
+  }
+
+  loadMany(ids) {
+    return Promise.all(ids.map(id => this.load(id)));
+  }
+
+  async dispatch() {
+    const batch = this.queue;
+    this.queue = [];
+
+    try {
+      const docs = await this.batchLoad(batch.map(item => item.key));
+      const byId = new Map(docs.map(doc => [doc._id.toString(), doc]));
+
+      batch.forEach(({ key, resolve }) => {
+        const doc = byId.get(key) || null;
+        if (doc && this.sharedCache) this.sharedCache.set(key, doc);
+        resolve(doc);
+      });
+    } catch (error) {
+      batch.forEach(({ key, reject }) => {
+        this.cache.delete(key);
+        reject(error);
+      });
+    }
+  }
+}
+
+// Short-lived cache shared across requests for the user summary projection
+const userSummaryCache = new LRUCache({
+  maxSize: parseInt(process.env.USER_SUMMARY_CACHE_SIZE) || 10000,
+  ttl: parseInt(process.env.USER_SUMMARY_CACHE_TTL_MS) || 5000
+});
+const userSummaryCacheEnabled = process.env.USER_SUMMARY_CACHE_TTL_MS !== '0';
+
+const invalidateUserSummary = (userId) => {
+  if (userId) userSummaryCache.delete(userId.toString());
+};
+
+const clearUserSummaries = () => {
+  userSummaryCache.clear();
+};
+
+const batchFind = (modelName, fields) => ids => mongoose.model(modelName)
+  .find({ _id: { $in: ids.filter(id => mongoose.isValidObjectId(id)) } })
+  .select(fields)
+  .lean();
+
+const createLoaders = () => ({
+  users: new DataLoader(batchFind('User', USER_SUMMARY_FIELDS), {
+    sharedCache: userSummaryCacheEnabled ? userSummaryCache : undefined
+  }),
+  projects: new DataLoader(batchFind('Project', PROJECT_SUMMARY_FIELDS))
+});
+
+// Call fn(holder, key) for every reference at a dotted path, walking arrays
+const visitPath = (value, segments, fn) => {
+  if (value == null) return;
+  if (Array.isArray(value)) {
+    value.forEach(item => visitPath(item, segments, fn));
+    return;
+  }
+
+  const [head, ...rest] = segments;
+  if (rest.length === 0) {
+    fn(value, head);
+  } else {
+    visitPath(value[head], rest, fn);
+  }
+};
+
+// Replace ObjectId references on lean documents with loaded summaries.
+// paths maps a dotted path to a loader name, e.g. { assignee: 'users' }.
+const populateRefs = async (loaders, docs, paths) => {
+  const pending = [];
+
+  Object.entries(paths).forEach(([path, loaderName]) => {
+    visitPath(docs, path.split('.'), (holder, key) => {
+      const ref = holder[key];
+      if (ref == null || (typeof ref === 'object' && !(ref instanceof mongoose.Types.ObjectId))) return;
+
+      pending.push(loaders[loaderName].load(ref).then((doc) => {
+        holder[key] = doc;
+      }));
+    });
+  });
+
+  await Promise.all(pending);
+  return docs;
+};
+
+module.exports = {
+  DataLoader,
+  createLoaders,
+  populateRefs,
+  invalidateUserSummary,
+  clearUserSummaries,
+  userSummaryCache
+};
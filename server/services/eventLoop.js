@@ -0,0 +1,39 @@
+const { monitorEventLoopDelay } = require('perf_hooks');
+
+// Event-loop delay sampled over fixed windows. The histogram runs on a libuv
+// timer, so it keeps recording while JavaScript is blocked; the window is
+// summarised when the loop next gets a turn.
+
+const WINDOW_MS = 500;
+
+let histogram = null;
+let latest = { mean: 0, p50: 0, p99: 0, max: 0 };
+
+const toMs = nanoseconds => Math.round(nanoseconds / 1e4) / 100;
+
+const start = () => {
+  if (histogram) return;
+
+  histogram = monitorEventLoopDelay({ resolution: 10 });
+  histogram.enable();
+
+  setInterval(() => {
+    latest = {
+      mean: toMs(histogram.mean),
+      p50: toMs(histogram.percentile(50)),
+      p99: toMs(histogram.percentile(99)),
+      max: toMs(histogram.max)
+    };
+    histogram.reset();
+  }, WINDOW_MS).unref();
+};
+
+// Delay percentiles in milliseconds for the last complete window
+const eventLoopStats = () => {
+  start();
+  return latest;
+};
+
+module.exports = {
+  eventLoopStats
+};
@@ -0,0 +1,63 @@
+const { broadcast, onBroadcast } = require('./clusterBus');
+
+// Bus for task and project changes, shared by all cluster workers. Routes
+// publish after a write has committed; services/realtime fans events out to
+// per-project rooms.
+// Every event is { type, project, data } where data is a delta the client
+// can merge into its cached lists: the changed document, or just its _id on
+// delete. `project.members.removed` carries { users } instead, and those
+// users' sockets are dropped from the project's room.
+
+const refId = (value) => (value && value._id ? value._id : value);
+
+const withoutSearchTerms = (doc) => {
+  const { searchTerms, ...rest } = doc;
+  return rest;
+};
+
+const publish = (type, project, data) => {
+  const projectId = refId(project);
+  if (!projectId) return;
+  broadcast('task-feed', { type, project: projectId.toString(), data });
+};
+
+const publishTask = (type, task) => {
+  publish(type, task.project, type === 'task.deleted' ? { _id: task._id } : withoutSearchTerms(task));
+};
+
+// Same [before, after] pairs the counters and rollups consume
+const publishTaskChanges = (changes) => {
+  changes.forEach(([before, after]) => {
+    if (!before) {
+      publishTask('task.created', after);
+    } else if (!after) {
+      publishTask('task.deleted', before);
+    } else {
+      publishTask('task.updated', after);
+    }
+  });
+};
+
+// Owner and team user ids of a project document or { owner, team } snapshot
+const memberIds = project => new Set(
+  [project.owner, ...(project.team || []).map(member => member.user)]
+    .map(refId)
+    .filter(Boolean)
+    .map(String)
+);
+
+const publishMembersRemoved = (project, before, after) => {
+  const remaining = memberIds(after);
+  const users = Array.from(memberIds(before)).filter(userId => !remaining.has(userId));
+  if (users.length > 0) publish('project.members.removed', project, { users });
+};
+
+const subscribe = listener => onBroadcast('task-feed', listener);
+
+module.exports = {
+  publish,
+  publishTask,
+  publishTaskChanges,
+  publishMembersRemoved,
+  subscribe
+};
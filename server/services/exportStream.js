@@ -0,0 +1,107 @@
+const { Transform, pipeline } = require('stream');
+const zlib = require('zlib');
+
+// Streams lean documents from a Mongo cursor to the response as NDJSON or
+// CSV. pipeline() propagates backpressure from the socket back to the
+// cursor, so memory stays bounded by the cursor batch size.
+
+const EXPORT_FORMATS = ['ndjson', 'csv'];
+const CONTENT_TYPES = {
+  ndjson: 'application/x-ndjson; charset=utf-8',
+  csv: 'text/csv; charset=utf-8'
+};
+const CURSOR_BATCH_SIZE = 500;
+
+const TASK_EXPORT_FIELDS = [
+  '_id', 'title', 'description', 'status', 'priority', 'type', 'project', 'assignee', 'reporter',
+  'estimatedHours', 'actualHours', 'dueDate', 'tags', 'commentCount', 'subtaskCount',
+  'completedSubtaskCount', 'createdAt', 'updatedAt'
+];
+const DEFAULT_TASK_EXPORT_FIELDS = [
+  '_id', 'title', 'status', 'priority', 'type', 'project', 'assignee', 'reporter',
+  'estimatedHours', 'actualHours', 'dueDate', 'createdAt', 'updatedAt'
+];
+
+// fields=title,status -> ['title', 'status'], or null if any field is not exportable
+const parseExportFields = (value, allowed) => {
+  const fields = String(value).split(',').map(field => field.trim()).filter(Boolean);
+  if (fields.length === 0 || fields.some(field => !allowed.includes(field))) {
+    return null;
+  }
+  return fields;
+};
+
+const formatValue = (value) => {
+  if (value == null) return '';
+  if (value instanceof Date) return value.toISOString();
+  if (Array.isArray(value)) return value.map(formatValue).join(';');
+  return String(value);
+};
+
+// Spreadsheets run cells starting with these as formulas, so user text
+// that does gets a leading ' (CSV injection)
+const FORMULA_START = /^[=+\-@\t\r]/;
+
+const csvCell = (value) => {
+  let text = formatValue(value);
+  if (typeof value !== 'number' && FORMULA_START.test(text)) text = `'${text}`;
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+};
+
+const toCsvRow = values => `${values.map(csvCell).join(',')}\r\n`;
+
+const pick = (doc, fields) => {
+  const row = {};
+  fields.forEach((field) => {
+    row[field] = doc[field] === undefined ? null : doc[field];
+  });
+  return row;
+};
+
+// Object-mode transform from documents to serialized lines
+const createRowTransform = (format, fields) => {
+  const transform = new Transform({
+    writableObjectMode: true,
+    transform(doc, encoding, callback) {
+      callback(null, format === 'csv'
+        ? toCsvRow(fields.map(field => doc[field]))
+        : `${JSON.stringify(pick(doc, fields))}\n`);
+    }
+  });
+
+  if (format === 'csv') {
+    transform.push(toCsvRow(fields));
+  }
+  return transform;
+};
+
+// Pipe a query cursor to the response. The query should already be lean and
+// projected to `fields`.
+const streamExport = (res, query, { format, fields, filename, gzip }) => {
+  const cursor = query.cursor({ batchSize: CURSOR_BATCH_SIZE });
+  const stages = [cursor, createRowTransform(format, fields)];
+
+  res.setHeader('Content-Type', CONTENT_TYPES[format]);
+  res.setHeader('Content-Disposition', `attachment; filename="${filename}.${format}"`);
+  if (gzip) {
+    res.setHeader('Content-Encoding', 'gzip');
+    stages.push(zlib.createGzip());
+  }
+
+  pipeline(...stages, res, (error) => {
+    // A client that disconnects mid-export is not an error worth logging
+    if (error && error.code !== 'ERR_STREAM_PREMATURE_CLOSE') {
+      console.error('Export stream error:', error);
+    }
+  });
+};
+
+module.exports = {
+  EXPORT_FORMATS,
+  TASK_EXPORT_FIELDS,
+  DEFAULT_TASK_EXPORT_FIELDS,
+  parseExportFields,
+  toCsvRow,
+  createRowTransform,
+  streamExport
+};
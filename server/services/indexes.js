@@ -0,0 +1,65 @@
+const User = require('../models/User');
+const Project = require('../models/Project');
+const Task = require('../models/Task');
+const ProjectStats = require('../models/ProjectStats');
+const Comment = require('../models/Comment');
+const Subtask = require('../models/Subtask');
+const DailyTaskStats = require('../models/DailyTaskStats');
+
+const MODELS = [User, Project, Task, ProjectStats, Comment, Subtask, DailyTaskStats];
+
+const listIndexNames = async (Model) => {
+  try {
+    const indexes = await Model.listIndexes();
+    return indexes.map(index => index.name);
+  } catch (error) {
+    // Collection not created yet
+    if (error.codeName === 'NamespaceNotFound') return [];
+    throw error;
+  }
+};
+
+// Build the indexes declared on each schema and report what changed.
+// With drop enabled, indexes no longer declared on the schema are removed too.
+const syncIndexes = async ({ drop = false } = {}) => {
+  const report = [];
+
+  for (const Model of MODELS) {
+    const started = Date.now();
+    const before = await listIndexNames(Model);
+
+    if (drop) {
+      await Model.syncIndexes();
+    } else {
+      await Model.createIndexes();
+    }
+
+    const after = await listIndexNames(Model);
+    const { toDrop } = await Model.diffIndexes();
+
+    report.push({
+      model: Model.modelName,
+      indexes: after,
+      created: after.filter(name => !before.includes(name)),
+      dropped: before.filter(name => !after.includes(name)),
+      undeclared: toDrop,
+      durationMs: Date.now() - started
+    });
+  }
+
+  return report;
+};
+
+const formatIndexReport = (report) => report.map((entry) => {
+  const parts = [`${entry.model}: ${entry.indexes.length} indexes`];
+  if (entry.created.length > 0) parts.push(`created ${entry.created.join(', ')}`);
+  if (entry.dropped.length > 0) parts.push(`dropped ${entry.dropped.join(', ')}`);
+  if (entry.undeclared.length > 0) parts.push(`undeclared ${entry.undeclared.join(', ')}`);
+  parts.push(`${entry.durationMs}ms`);
+  return parts.join(' | ');
+}).join('\n');
+
+module.exports = {
+  syncIndexes,
+  formatIndexReport
+};
@@ -0,0 +1,80 @@
+// Bounded LRU cache with per-entry TTL.
+// Map preserves insertion order, so the first key is always the least recently used.
+class LRUCache {
+  constructor({ maxSize = 1000, ttl = 60 * 1000 } = {}) {
+    this.maxSize = maxSize;
+    this.ttl = ttl;
+    this.entries = new Map();
+    this.hits = 0;
+    this.misses = 0;
+    this.evictions = 0;
+  }
+
+  get(key) {
+    const entry = this.entries.get(key);
+
+    if (!entry) {
+      this.misses++;
+      return undefined;
+    }
+
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      this.misses++;
+      return undefined;
+    }
+
+    // Refresh recency
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return entry.value;
+  }
+
+  set(key, value, ttl = this.ttl) {
+    if (this.entries.has(key)) {
+      this.entries.delete(key);
+    }
+
+    this.entries.set(key, { value, expiresAt: Date.now() + ttl });
+
+    while (this.entries.size > this.maxSize) {
+      this.entries.delete(this.entries.keys().next().value);
+      this.evictions++;
+    }
+
+    return this;
+  }
+
+  has(key) {
+    const entry = this.entries.get(key);
+    return Boolean(entry) && entry.expiresAt > Date.now();
+  }
+
+  delete(key) {
+    return this.entries.delete(key);
+  }
+
+  clear() {
+    this.entries.clear();
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+
+  stats() {
+    const lookups = this.hits + this.misses;
+    return {
+      size: this.entries.size,
+      maxSize: this.maxSize,
+      ttl: this.ttl,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+      hitRate: lookups === 0 ? 0 : this.hits / lookups
+    };
+  }
+}
+
+module.exports = LRUCache;
@@ -0,0 +1,253 @@
+const { AsyncLocalStorage } = require('async_hooks');
+const { eventLoopStats } = require('./eventLoop');
+
+// Prometheus text-format metrics for this process. Each cluster worker keeps
+// its own registry, so a scrape sees whichever worker answered it.
+
+const CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8';
+const DURATION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+
+const escapeLabel = value => String(value)
+  .replace(/\\/g, '\\\\')
+  .replace(/\n/g, '\\n')
+  .replace(/"/g, '\\"');
+
+const formatLabels = (labels) => {
+  const pairs = Object.entries(labels).map(([name, value]) => `${name}="${escapeLabel(value)}"`);
+  return pairs.length > 0 ? `{${pairs.join(',')}}` : '';
+};
+
+class Metric {
+  constructor(type, name, help, labelNames = []) {
+    this.type = type;
+    this.name = name;
+    this.help = help;
+    this.labelNames = labelNames;
+    this.series = new Map();
+  }
+
+  // The series for a label set, created with init() on first use
+  seriesFor(labels, init) {
+    const values = this.labelNames.map(name => (labels[name] === undefined ? '' : String(labels[name])));
+    const key = values.join('\u0000');
+
+    if (!this.series.has(key)) {
+      const named = {};
+      this.labelNames.forEach((name, index) => {
+        named[name] = values[index];
+      });
+      this.series.set(key, { labels: named, ...init() });
+    }
+    return this.series.get(key);
+  }
+
+  render() {
+    return [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`, ...this.samples()];
+  }
+}
+
+class Counter extends Metric {
+  constructor(name, help, labelNames) {
+    super('counter', name, help, labelNames);
+  }
+
+  inc(labels = {}, value = 1) {
+    this.seriesFor(labels, () => ({ value: 0 })).value += value;
+  }
+
+  samples() {
+    return Array.from(this.series.values(), series => `${this.name}${formatLabels(series.labels)} ${series.value}`);
+  }
+}
+
+// collect(), when given, returns [labels, value] pairs read at scrape time
+class Gauge extends Metric {
+  constructor(name, help, labelNames, collect) {
+    super('gauge', name, help, labelNames);
+    this.collect = collect;
+  }
+
+  set(labels, value) {
+    this.seriesFor(labels, () => ({ value: 0 })).value = value;
+  }
+
+  inc(labels = {}, value = 1) {
+    this.seriesFor(labels, () => ({ value: 0 })).value += value;
+  }
+
+  dec(labels = {}, value = 1) {
+    this.inc(labels, -value);
+  }
+
+  samples() {
+    if (this.collect) {
+      this.collect().forEach(([labels, value]) => this.set(labels, value));
+    }
+    return Array.from(this.series.values(), series => `${this.name}${formatLabels(series.labels)} ${series.value}`);
+  }
+}
+
+class Histogram extends Metric {
+  constructor(name, help, labelNames, buckets = DURATION_BUCKETS) {
+    super('histogram', name, help, labelNames);
+    this.buckets = buckets;
+  }
+
+  observe(labels, value) {
+    const series = this.seriesFor(labels, () => ({
+      counts: new Array(this.buckets.length).fill(0),
+      sum: 0,
+      count: 0
+    }));
+    const index = this.buckets.findIndex(bound => value <= bound);
+    if (index !== -1) series.counts[index] += 1;
+    series.sum += value;
+    series.count += 1;
+  }
+
+  samples() {
+    const lines = [];
+    this.series.forEach(({ labels, counts, sum, count }) => {
+      let cumulative = 0;
+      this.buckets.forEach((bound, index) => {
+        cumulative += counts[index];
+        lines.push(`${this.name}_bucket${formatLabels({ ...labels, le: bound })} ${cumulative}`);
+      });
+      lines.push(`${this.name}_bucket${formatLabels({ ...labels, le: '+Inf' })} ${count}`);
+      lines.push(`${this.name}_sum${formatLabels(labels)} ${sum}`);
+      lines.push(`${this.name}_count${formatLabels(labels)} ${count}`);
+    });
+    return lines;
+  }
+}
+
+class Registry {
+  constructor() {
+    this.metrics = [];
+  }
+
+  register(metric) {
+    this.metrics.push(metric);
+    return metric;
+  }
+
+  counter(...args) {
+    return this.register(new Counter(...args));
+  }
+
+  gauge(...args) {
+    return this.register(new Gauge(...args));
+  }
+
+  histogram(...args) {
+    return this.register(new Histogram(...args));
+  }
+
+  render() {
+    return `${this.metrics.map(metric => metric.render().join('\n')).join('\n')}\n`;
+  }
+}
+
+const registry = new Registry();
+
+const httpRequests = registry.counter(
+  'http_requests_total', 'HTTP requests by route and status code', ['method', 'route', 'status']
+);
+const httpDuration = registry.histogram(
+  'http_request_duration_seconds', 'HTTP request latency by route', ['method', 'route']
+);
+const httpDbDuration = registry.histogram(
+  'http_request_db_duration_seconds', 'MongoDB query time summed per HTTP request', ['method', 'route']
+);
+const httpInFlight = registry.gauge('http_requests_in_flight', 'HTTP requests currently being served');
+httpInFlight.set({}, 0);
+
+const queryDuration = registry.histogram(
+  'mongodb_query_duration_seconds', 'MongoDB query latency by model and operation', ['model', 'operation']
+);
+
+registry.gauge('nodejs_eventloop_lag_seconds', 'Event-loop delay over the last sampling window', ['quantile'], () => {
+  const { p50, p99, max } = eventLoopStats();
+  return [[{ quantile: '0.5' }, p50 / 1000], [{ quantile: '0.99' }, p99 / 1000], [{ quantile: '1' }, max / 1000]];
+});
+
+registry.gauge('nodejs_memory_bytes', 'Process memory usage', ['type'], () => {
+  const { rss, heapTotal, heapUsed, external } = process.memoryUsage();
+  return [
+    [{ type: 'rss' }, rss],
+    [{ type: 'heap_total' }, heapTotal],
+    [{ type: 'heap_used' }, heapUsed],
+    [{ type: 'external' }, external]
+  ];
+});
+
+const elapsedSeconds = started => Number(process.hrtime.bigint() - started) / 1e9;
+
+// Per-request state for the query hooks: { dbSeconds, dbQueries }
+const requestContext = new AsyncLocalStorage();
+
+const recordQuery = (model, operation, started) => {
+  if (!started) return;
+
+  const seconds = elapsedSeconds(started);
+  queryDuration.observe({ model, operation }, seconds);
+
+  const context = requestContext.getStore();
+  if (context) {
+    context.dbSeconds += seconds;
+    context.dbQueries += 1;
+  }
+};
+
+const QUERY_OPS = [
+  'find', 'findOne', 'countDocuments', 'estimatedDocumentCount',
+  'updateOne', 'updateMany', 'replaceOne', 'deleteOne', 'deleteMany',
+  'findOneAndUpdate', 'findOneAndReplace', 'findOneAndDelete'
+];
+
+// Mongoose plugin timing queries and aggregations. Registered globally with
+// mongoose.plugin() so it reaches every model compiled afterwards. Like
+// versionPlugin, it does not see Model.bulkWrite().
+const queryTimingPlugin = (schema) => {
+  schema.pre(QUERY_OPS, function() {
+    this._metricsStartedAt = process.hrtime.bigint();
+  });
+
+  schema.post(QUERY_OPS, function() {
+    recordQuery(this.model.modelName, this.op, this._metricsStartedAt);
+  });
+
+  schema.pre('aggregate', function() {
+    this._metricsStartedAt = process.hrtime.bigint();
+  });
+
+  schema.post('aggregate', function() {
+    recordQuery(this._model.modelName, 'aggregate', this._metricsStartedAt);
+  });
+};
+
+const requestStarted = () => {
+  httpInFlight.inc();
+};
+
+const requestFinished = ({ method, route, status, seconds, dbSeconds }) => {
+  httpInFlight.dec();
+  httpRequests.inc({ method, route, status });
+  httpDuration.observe({ method, route }, seconds);
+  httpDbDuration.observe({ method, route }, dbSeconds);
+};
+
+const renderMetrics = () => registry.render();
+
+module.exports = {
+  CONTENT_TYPE,
+  DURATION_BUCKETS,
+  Registry,
+  registry,
+  elapsedSeconds,
+  requestContext,
+  queryTimingPlugin,
+  requestStarted,
+  requestFinished,
+  renderMetrics
+};
@@ -0,0 +1,193 @@
+const crypto = require('crypto');
+
+// In-memory collections behind the mock routers served by index-test.js.
+// Records live in a Map by id, with Map indexes on the fields the routers
+// look up by, so lookups cost the same with ten records or a million.
+
+const PROCESS_ID = crypto.randomBytes(5).toString('hex');
+let sequence = crypto.randomInt(0x1000000);
+
+// ObjectId-shaped ids: seconds, a random per-process part and a counter, so
+// records created in the same millisecond still get distinct ids
+const createId = () => {
+  sequence = (sequence + 1) % 0x1000000;
+  const seconds = Math.floor(Date.now() / 1000).toString(16).padStart(8, '0');
+  return `${seconds}${PROCESS_ID}${sequence.toString(16).padStart(6, '0')}`;
+};
+
+const isIndexable = value => value !== undefined && value !== null;
+
+class Collection {
+  // unique: fields mapping each value to one record (e.g. email)
+  // indexes: fields mapping each value to many records (e.g. owner)
+  constructor({ unique = [], indexes = [] } = {}) {
+    this.records = new Map();
+    this.unique = new Map(unique.map(field => [field, new Map()]));
+    this.indexes = new Map(indexes.map(field => [field, new Map()]));
+    // Called with (op, id, data) after each change; see mockStorePersistence
+    this.onChange = null;
+  }
+
+  get size() {
+    return this.records.size;
+  }
+
+  get(id) {
+    return this.records.get(String(id)) || null;
+  }
+
+  all() {
+    return Array.from(this.records.values());
+  }
+
+  findOne(field, value) {
+    const index = this.unique.get(field);
+    if (!index) {
+      throw new Error(`No unique index on ${field}`);
+    }
+    const id = index.get(value);
+    return id === undefined ? null : this.records.get(id);
+  }
+
+  findBy(field, value) {
+    const index = this.indexes.get(field);
+    if (!index) {
+      throw new Error(`No index on ${field}`);
+    }
+    const ids = index.get(value);
+    return ids ? Array.from(ids, id => this.records.get(id)) : [];
+  }
+
+  // Records matching any of the [field, value] pairs, each once
+  findByAny(pairs) {
+    const found = new Map();
+    pairs.forEach(([field, value]) => {
+      this.findBy(field, value).forEach(record => found.set(record.id, record));
+    });
+    return Array.from(found.values());
+  }
+
+  insert(fields) {
+    const record = { id: createId(), ...fields };
+    this.assertUnique(record);
+    this.records.set(record.id, record);
+    this.addToIndexes(record);
+    this.notify('insert', record.id, record);
+    return record;
+  }
+
+  update(id, changes) {
+    const record = this.get(id);
+    if (!record) return null;
+
+    this.assertUnique({ ...record, ...changes });
+    this.removeFromIndexes(record);
+    Object.assign(record, changes, { id: record.id });
+    this.addToIndexes(record);
+    this.notify('update', record.id, changes);
+    return record;
+  }
+
+  remove(id) {
+    const record = this.get(id);
+    if (!record) return null;
+
+    this.removeFromIndexes(record);
+    this.records.delete(record.id);
+    this.notify('remove', record.id);
+    return record;
+  }
+
+  clear() {
+    this.reset();
+    this.notify('clear');
+  }
+
+  // Bulk-load trusted records (e.g. a snapshot) in place of the current ones
+  load(records) {
+    this.reset();
+    records.forEach((record) => {
+      this.records.set(record.id, record);
+      this.addToIndexes(record);
+    });
+  }
+
+  // Apply a logged change without notifying. Replaying a change twice
+  // leaves the same state, so a log may overlap the snapshot before it.
+  replay(op, id, data) {
+    if (op === 'clear') {
+      this.reset();
+      return;
+    }
+
+    const existing = this.records.get(id);
+    if (existing) this.removeFromIndexes(existing);
+
+    if (op === 'remove') {
+      this.records.delete(id);
+      return;
+    }
+
+    const record = op === 'insert' ? { ...data, id } : Object.assign(existing || { id }, data, { id });
+    this.records.set(id, record);
+    this.addToIndexes(record);
+  }
+
+  reset() {
+    this.records.clear();
+    this.unique.forEach(index => index.clear());
+    this.indexes.forEach(index => index.clear());
+  }
+
+  notify(op, id, data) {
+    if (this.onChange) this.onChange(op, id, data);
+  }
+
+  assertUnique(record) {
+    this.unique.forEach((index, field) => {
+      const holder = index.get(record[field]);
+      if (isIndexable(record[field]) && holder !== undefined && holder !== record.id) {
+        const error = new Error(`Duplicate value for ${field}`);
+        error.status = 409;
+        throw error;
+      }
+    });
+  }
+
+  addToIndexes(record) {
+    this.unique.forEach((index, field) => {
+      if (isIndexable(record[field])) index.set(record[field], record.id);
+    });
+    this.indexes.forEach((index, field) => {
+      const value = record[field];
+      if (!isIndexable(value)) return;
+      if (!index.has(value)) index.set(value, new Set());
+      index.get(value).add(record.id);
+    });
+  }
+
+  removeFromIndexes(record) {
+    this.unique.forEach((index, field) => {
+      if (index.get(record[field]) === record.id) index.delete(record[field]);
+    });
+    this.indexes.forEach((index, field) => {
+      const ids = index.get(record[field]);
+      if (!ids) return;
+      ids.delete(record.id);
+      if (ids.size === 0) index.delete(record[field]);
+    });
+  }
+}
+
+// Shared by every mock router in the process
+const store = {
+  users: new Collection({ unique: ['email', 'username'] }),
+  projects: new Collection({ indexes: ['owner'] }),
+  tasks: new Collection({ indexes: ['project', 'assignee', 'reporter'] })
+};
+
+module.exports = {
+  Collection,
+  createId,
+  store
+};
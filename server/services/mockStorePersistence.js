@@ -0,0 +1,121 @@
+const fs = require('fs');
+const path = require('path');
+
+// Optional disk persistence for the mock store: a snapshot of every
+// collection plus an append-only log of the changes made since. Startup
+// bulk-loads the snapshot and replays the log, then compacts both into a
+// fresh snapshot. Log lines are buffered and written every flushMs, so a
+// crash can lose the last few milliseconds of changes; a torn last line is
+// cut off on load so later appends start on a fresh line.
+
+const SNAPSHOT_FILE = 'snapshot.json';
+const LOG_FILE = 'changes.log';
+
+const readSnapshot = (file) => {
+  if (!fs.existsSync(file)) return {};
+  return JSON.parse(fs.readFileSync(file, 'utf8')).collections || {};
+};
+
+// Parsed log entries, stopping at the first unreadable line, and the byte
+// length of the log up to that line
+const readLog = (file) => {
+  if (!fs.existsSync(file)) return { entries: [], readableBytes: 0 };
+
+  const entries = [];
+  let readableBytes = 0;
+  const lines = fs.readFileSync(file, 'utf8').split('\n');
+  for (const line of lines) {
+    if (line) {
+      try {
+        entries.push(JSON.parse(line));
+      } catch (error) {
+        console.warn(`Mock store: ignoring unreadable log entry after ${entries.length} changes`);
+        break;
+      }
+    }
+    readableBytes += Buffer.byteLength(line) + 1;
+  }
+  return { entries, readableBytes };
+};
+
+const attachPersistence = (store, { dir, flushMs = 100, compactEvery = 10000, compactBytes = 64 * 1024 * 1024 }) => {
+  fs.mkdirSync(dir, { recursive: true });
+  const snapshotFile = path.join(dir, SNAPSHOT_FILE);
+  const logFile = path.join(dir, LOG_FILE);
+
+  const started = Date.now();
+  const snapshot = readSnapshot(snapshotFile);
+  const { entries, readableBytes } = readLog(logFile);
+
+  Object.entries(store).forEach(([name, collection]) => {
+    collection.load(snapshot[name] || []);
+  });
+  entries.forEach(({ collection, op, id, data }) => {
+    if (store[collection]) store[collection].replay(op, id, data);
+  });
+
+  let pending = [];
+  let logged = 0;
+  let loggedBytes = 0;
+  const fd = fs.openSync(logFile, 'a');
+  // Otherwise the next append would join the torn line and be lost with it
+  if (fs.fstatSync(fd).size > readableBytes) fs.ftruncateSync(fd, readableBytes);
+
+  const flush = () => {
+    if (pending.length === 0) return;
+    const chunk = pending.join('');
+    fs.writeSync(fd, chunk);
+    logged += pending.length;
+    loggedBytes += Buffer.byteLength(chunk);
+    pending = [];
+    if (logged >= compactEvery || loggedBytes >= compactBytes) compact();
+  };
+
+  // The snapshot already holds every buffered change, so the buffer and log
+  // are dropped once it is in place. Writing to a temp file and renaming
+  // means a crash leaves either the old snapshot or the new one.
+  const compact = () => {
+    const collections = {};
+    Object.entries(store).forEach(([name, collection]) => {
+      collections[name] = collection.all();
+    });
+
+    const tmpFile = `${snapshotFile}.tmp`;
+    fs.writeFileSync(tmpFile, JSON.stringify({ savedAt: new Date().toISOString(), collections }));
+    fs.renameSync(tmpFile, snapshotFile);
+    fs.ftruncateSync(fd, 0);
+    pending = [];
+    logged = 0;
+    loggedBytes = 0;
+  };
+
+  Object.entries(store).forEach(([name, collection]) => {
+    // Serialized now, since records are later updated in place
+    collection.onChange = (op, id, data) => {
+      pending.push(`${JSON.stringify({ collection: name, op, id, data })}\n`);
+    };
+  });
+
+  if (entries.length > 0) compact();
+
+  const timer = setInterval(flush, flushMs);
+  timer.unref();
+
+  const close = () => {
+    clearInterval(timer);
+    flush();
+    fs.closeSync(fd);
+    Object.values(store).forEach((collection) => {
+      collection.onChange = null;
+    });
+  };
+
+  const counts = Object.entries(store).map(([name, collection]) => `${collection.size} ${name}`);
+  console.log(`Mock store loaded ${counts.join(', ')} from ${dir} in ${Date.now() - started}ms`);
+
+  return { flush, compact, close };
+};
+
+module.exports = {
+  attachPersistence
+};
@@ -0,0 +1,43 @@
+const mongoose = require('mongoose');
+
+// Opaque keyset cursors: the sort key values of the last row on a page,
+// serialized as base64url JSON.
+
+const encodeCursor = (values) => Buffer.from(JSON.stringify(values)).toString('base64url');
+
+const decodeCursor = (cursor) => {
+  try {
+    const values = JSON.parse(Buffer.from(String(cursor), 'base64url').toString());
+    return Array.isArray(values) ? values : null;
+  } catch (error) {
+    return null;
+  }
+};
+
+// Cursor over a (date field, _id) sort, both descending
+const encodeDateCursor = (doc, field) => encodeCursor([new Date(doc[field]).getTime(), doc._id.toString()]);
+
+const decodeDateCursor = (cursor) => {
+  const values = decodeCursor(cursor);
+  if (!values || values.length !== 2) return null;
+
+  const [time, id] = values;
+  if (!Number.isFinite(time) || !mongoose.isValidObjectId(id)) return null;
+  return { value: new Date(time), id: new mongoose.Types.ObjectId(id) };
+};
+
+// Rows strictly after the cursor in { field: -1, _id: -1 } order
+const afterDateCursor = (field, cursor) => ({
+  $or: [
+    { [field]: { $lt: cursor.value } },
+    { [field]: cursor.value, _id: { $lt: cursor.id } }
+  ]
+});
+
+module.exports = {
+  encodeCursor,
+  decodeCursor,
+  encodeDateCursor,
+  decodeDateCursor,
+  afterDateCursor
+};
@@ -0,0 +1,14 @@
+const { parentPort } = require('worker_threads');
+const bcrypt = require('bcryptjs');
+
+// Runs bcrypt off the main event loop; see services/passwords
+parentPort.on('message', ({ id, op, password, hash, cost }) => {
+  try {
+    const result = op === 'hash'
+      ? bcrypt.hashSync(password, cost)
+      : bcrypt.compareSync(password, hash);
+    parentPort.postMessage({ id, result });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message });
+  }
+});
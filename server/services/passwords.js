@@ -0,0 +1,133 @@
+const os = require('os');
+const path = require('path');
+const { Worker } = require('worker_threads');
+const bcrypt = require('bcryptjs');
+
+// bcrypt hashing and comparison on a bounded worker_threads pool. bcryptjs
+// is synchronous JS, so running it inline blocks every other request for
+// the duration of each hash. When all workers are busy and the queue is
+// full, calls fail fast with a 503 error instead of queueing unboundedly.
+
+const BCRYPT_COST = parseInt(process.env.BCRYPT_COST) || 12;
+const POOL_SIZE = parseInt(process.env.PASSWORD_POOL_SIZE) ||
+  Math.max(1, Math.min(4, os.cpus().length - 1));
+const MAX_QUEUE = parseInt(process.env.PASSWORD_QUEUE_LIMIT) || 64;
+const WORKER_SCRIPT = path.join(__dirname, 'passwordWorker.js');
+
+const busyError = () => Object.assign(new Error('Password service is busy'), { status: 503 });
+
+class WorkerPool {
+  constructor({ size, maxQueue, script }) {
+    this.size = size;
+    this.maxQueue = maxQueue;
+    this.script = script;
+    this.workers = [];
+    this.idle = [];
+    this.queue = [];
+    this.nextId = 0;
+  }
+
+  run(message) {
+    return new Promise((resolve, reject) => {
+      const job = { message: { ...message, id: this.nextId++ }, resolve, reject };
+
+      if (this.idle.length === 0 && this.workers.length < this.size) {
+        this.spawn();
+      }
+
+      if (this.idle.length > 0) {
+        this.dispatch(this.idle.pop(), job);
+      } else if (this.queue.length < this.maxQueue) {
+        this.queue.push(job);
+      } else {
+        reject(busyError());
+      }
+    });
+  }
+
+  spawn() {
+    const worker = new Worker(this.script);
+    worker.unref();
+
+    worker.on('message', ({ result, error }) => {
+      const { job } = worker;
+      worker.job = null;
+      if (error) {
+        job.reject(new Error(error));
+      } else {
+        job.resolve(result);
+      }
+      this.release(worker);
+    });
+
+    worker.on('error', (error) => {
+      if (worker.job) worker.job.reject(error);
+      worker.job = null;
+    });
+
+    worker.on('exit', () => {
+      this.workers = this.workers.filter(other => other !== worker);
+      this.idle = this.idle.filter(other => other !== worker);
+      if (worker.job) worker.job.reject(new Error('Password worker exited'));
+
+      // Nothing left to drain the queue; the next run() spawns afresh
+      if (this.workers.length === 0) {
+        this.queue.splice(0).forEach(job => job.reject(new Error('Password worker exited')));
+      }
+    });
+
+    this.workers.push(worker);
+    this.idle.push(worker);
+  }
+
+  dispatch(worker, job) {
+    worker.job = job;
+    // Only a busy worker keeps the process alive
+    worker.ref();
+    worker.postMessage(job.message);
+  }
+
+  release(worker) {
+    const next = this.queue.shift();
+    if (next) {
+      this.dispatch(worker, next);
+    } else {
+      worker.unref();
+      this.idle.push(worker);
+    }
+  }
+
+  stats() {
+    return {
+      size: this.size,
+      workers: this.workers.length,
+      busy: this.workers.length - this.idle.length,
+      queued: this.queue.length,
+      maxQueue: this.maxQueue
+    };
+  }
+}
+
+const pool = new WorkerPool({ size: POOL_SIZE, maxQueue: MAX_QUEUE, script: WORKER_SCRIPT });
+
+const hashPassword = password => pool.run({ op: 'hash', password, cost: BCRYPT_COST });
+
+const comparePassword = (password, hash) => pool.run({ op: 'compare', password, hash });
+
+// True when a stored hash was made with a different cost than configured
+const needsRehash = (hash) => {
+  try {
+    return bcrypt.getRounds(hash) !== BCRYPT_COST;
+  } catch (error) {
+    return false;
+  }
+};
+
+module.exports = {
+  BCRYPT_COST,
+  WorkerPool,
+  hashPassword,
+  comparePassword,
+  needsRehash,
+  passwordPoolStats: () => pool.stats()
+};
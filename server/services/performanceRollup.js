@@ -0,0 +1,185 @@
+const DailyTaskStats = require('../models/DailyTaskStats');
+const Task = require('../models/Task');
+const User = require('../models/User');
+const { touchVersion } = require('./versions');
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const GRANULARITIES = ['day', 'week', 'month'];
+
+const refId = (value) => (value && value._id ? value._id : value);
+
+const dayKey = (date) => new Date(date || Date.now()).toISOString().slice(0, 10);
+
+// Bucket a 'YYYY-MM-DD' day into its period: the day itself, the Monday
+// starting its ISO week, or 'YYYY-MM'
+const periodKey = (day, granularity) => {
+  if (granularity === 'month') return day.slice(0, 7);
+  if (granularity === 'week') {
+    const date = new Date(`${day}T00:00:00Z`);
+    return dayKey(date.getTime() - ((date.getUTCDay() + 6) % 7) * DAY_MS);
+  }
+  return day;
+};
+
+// Add (sign = 1) or remove (sign = -1) one task's contribution to its bucket
+const addContribution = (buckets, task, sign) => {
+  const project = refId(task.project);
+  if (!project) return;
+
+  const assignee = refId(task.assignee) || null;
+  const day = dayKey(task.createdAt);
+  const key = `${project}:${assignee}:${day}`;
+
+  if (!buckets.has(key)) {
+    buckets.set(key, {
+      project,
+      assignee,
+      day,
+      created: 0,
+      completed: 0,
+      completionDays: 0,
+      completionCount: 0
+    });
+  }
+  const bucket = buckets.get(key);
+
+  bucket.created += sign;
+  if (task.status === 'completed') {
+    bucket.completed += sign;
+    if (task.completedDate && task.createdAt) {
+      bucket.completionDays += sign * (new Date(task.completedDate) - new Date(task.createdAt)) / DAY_MS;
+      bucket.completionCount += sign;
+    }
+  }
+};
+
+// Apply a batch of [before, after] task pairs to the daily buckets in one bulkWrite.
+// Use null for `before` on create and for `after` on delete.
+const applyTaskChanges = async (changes) => {
+  const buckets = new Map();
+
+  changes.forEach(([before, after]) => {
+    if (before) addContribution(buckets, before, -1);
+    if (after) addContribution(buckets, after, 1);
+  });
+
+  const operations = [];
+  buckets.forEach(({ project, assignee, day, ...counts }) => {
+    const inc = {};
+    Object.entries(counts).forEach(([field, value]) => {
+      if (value !== 0) inc[field] = value;
+    });
+    if (Object.keys(inc).length === 0) return;
+
+    operations.push({
+      updateOne: {
+        filter: { project, assignee, day },
+        update: { $inc: inc },
+        upsert: true
+      }
+    });
+  });
+
+  if (operations.length > 0) {
+    await DailyTaskStats.bulkWrite(operations, { ordered: false });
+    touchVersion(DailyTaskStats.modelName);
+  }
+};
+
+// Recompute buckets from the tasks collection. Completed tasks from before
+// completedDate was tracked get their last update time as completion time.
+const rebuildBuckets = async (projectIds) => {
+  const filter = projectIds ? { project: { $in: projectIds } } : {};
+
+  const backfill = await Task.updateMany(
+    { ...filter, status: 'completed', completedDate: null },
+    [{ $set: { completedDate: '$updatedAt' } }]
+  );
+
+  const buckets = new Map();
+  const cursor = Task.find(filter)
+    .select('project assignee status createdAt completedDate')
+    .lean()
+    .cursor();
+
+  for await (const task of cursor) {
+    addContribution(buckets, task, 1);
+  }
+
+  await DailyTaskStats.deleteMany(filter);
+
+  const docs = Array.from(buckets.values());
+  if (docs.length > 0) {
+    await DailyTaskStats.insertMany(docs, { ordered: false });
+  }
+
+  return { buckets: docs.length, backfilled: backfill.modifiedCount };
+};
+
+// Completion trends and team productivity for tasks created between the
+// day keys `from` and `to` (inclusive), in the /performance response shape
+const loadPerformance = async (projectIds, { from, to, granularity = 'day' }) => {
+  const buckets = await DailyTaskStats.find({
+    project: { $in: projectIds },
+    day: { $gte: from, $lte: to }
+  }).lean();
+
+  const periods = new Map();
+  const team = new Map();
+
+  buckets.forEach((bucket) => {
+    const period = periodKey(bucket.day, granularity);
+    const trend = periods.get(period) || { _id: period, created: 0, completed: 0 };
+    trend.created += bucket.created;
+    trend.completed += bucket.completed;
+    periods.set(period, trend);
+
+    if (!bucket.assignee) return;
+    const key = bucket.assignee.toString();
+    const member = team.get(key) || { totalTasks: 0, completedTasks: 0, completionDays: 0, completionCount: 0 };
+    member.totalTasks += bucket.created;
+    member.completedTasks += bucket.completed;
+    member.completionDays += bucket.completionDays;
+    member.completionCount += bucket.completionCount;
+    team.set(key, member);
+  });
+
+  const completionTrends = Array.from(periods.values())
+    .filter(trend => trend.created > 0)
+    .sort((a, b) => a._id.localeCompare(b._id));
+
+  const userIds = Array.from(team.keys()).filter(userId => team.get(userId).totalTasks > 0);
+  const users = await User.find({ _id: { $in: userIds } })
+    .select('username firstName lastName')
+    .lean();
+
+  const teamProductivity = users
+    .map((user) => {
+      const member = team.get(user._id.toString());
+      return {
+        _id: user._id,
+        userId: user._id,
+        username: user.username,
+        firstName: user.firstName,
+        lastName: user.lastName,
+        totalTasks: member.totalTasks,
+        completedTasks: member.completedTasks,
+        completionRate: member.completedTasks / member.totalTasks * 100,
+        avgCompletionTime: member.completionCount > 0
+          ? Math.round(member.completionDays / member.completionCount * 100) / 100
+          : null
+      };
+    })
+    .sort((a, b) => b.completedTasks - a.completedTasks);
+
+  return { completionTrends, teamProductivity };
+};
+
+module.exports = {
+  GRANULARITIES,
+  dayKey,
+  periodKey,
+  applyTaskChanges,
+  rebuildBuckets,
+  loadPerformance
+};
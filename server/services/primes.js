@@ -0,0 +1,133 @@
+// Shared prime table backed by a segmented Sieve of Eratosthenes.
+// The table only grows, so every request after the first is answered by a
+// slice of already-computed primes.
+
+const SEGMENT_SIZE = 1 << 16;
+const MAX_VALUE = 10000000;
+
+// Composite flags for the segment being sieved, one bit per number
+const segment = new Uint8Array(SEGMENT_SIZE >> 3);
+
+let table = new Uint32Array(8192);
+let count = 0;
+let sievedTo = 1;
+
+const push = (prime) => {
+  if (count === table.length) {
+    const grown = new Uint32Array(table.length * 2);
+    grown.set(table);
+    table = grown;
+  }
+  table[count++] = prime;
+};
+
+const sieveSegment = (lo, hi) => {
+  segment.fill(0);
+
+  for (let i = 0; i < count; i++) {
+    const p = table[i];
+    if (p * p > hi) break;
+
+    const start = Math.max(p * p, Math.ceil(lo / p) * p);
+    for (let m = start; m <= hi; m += p) {
+      const offset = m - lo;
+      segment[offset >> 3] |= 1 << (offset & 7);
+    }
+  }
+
+  for (let n = lo; n <= hi; n++) {
+    const offset = n - lo;
+    if (segment[offset >> 3] & (1 << (offset & 7))) continue;
+
+    push(n);
+
+    // The first segment has no base primes yet, so it is sieved in place
+    if (lo === 2) {
+      for (let m = n * n; m <= hi; m += n) {
+        const mo = m - lo;
+        segment[mo >> 3] |= 1 << (mo & 7);
+      }
+    }
+  }
+
+  sievedTo = hi;
+};
+
+// Make sure every prime <= limit is in the table
+const extendTo = (limit) => {
+  if (limit > MAX_VALUE) {
+    throw new RangeError(`Prime table is capped at ${MAX_VALUE}`);
+  }
+
+  while (sievedTo < limit) {
+    const lo = sievedTo + 1;
+    const hi = Math.min(lo + SEGMENT_SIZE - 1, MAX_VALUE);
+    sieveSegment(lo, hi);
+  }
+};
+
+// Upper bound for the nth prime (Rosser's theorem), used to size the sieve
+const nthPrimeBound = (n) => {
+  if (n < 6) return 13;
+  const ln = Math.log(n);
+  return Math.ceil(n * (ln + Math.log(ln)));
+};
+
+const ensureCount = (n) => {
+  if (count >= n) return;
+  extendTo(Math.min(nthPrimeBound(n), MAX_VALUE));
+  if (count < n) {
+    throw new RangeError(`Only ${count} primes are available below ${MAX_VALUE}`);
+  }
+};
+
+// Index of the first prime >= value
+const lowerBound = (value) => {
+  let lo = 0;
+  let hi = count;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (table[mid] < value) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+};
+
+const firstPrimes = (n) => {
+  if (!(n >= 1)) return [];
+  ensureCount(n);
+  return Array.from(table.subarray(0, n));
+};
+
+const primesInRange = (from, to) => {
+  if (to < from || to < 2) return [];
+  extendTo(to);
+  return Array.from(table.subarray(lowerBound(from), lowerBound(to + 1)));
+};
+
+const nthPrime = (n) => {
+  ensureCount(n);
+  return table[n - 1];
+};
+
+const isPrime = (value) => {
+  if (value < 2) return false;
+  extendTo(value);
+  const index = lowerBound(value);
+  return index < count && table[index] === value;
+};
+
+const stats = () => ({
+  count,
+  sievedTo,
+  maxValue: MAX_VALUE
+});
+
+module.exports = {
+  MAX_VALUE,
+  firstPrimes,
+  primesInRange,
+  nthPrime,
+  isPrime,
+  stats
+};
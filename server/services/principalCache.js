@@ -0,0 +1,24 @@
+const LRUCache = require('./lruCache');
+
+// Authenticated users keyed by id, so the auth middleware can skip the
+// User.findById round-trip on every request.
+const principalCache = new LRUCache({
+  maxSize: parseInt(process.env.PRINCIPAL_CACHE_SIZE) || 5000,
+  ttl: parseInt(process.env.PRINCIPAL_CACHE_TTL_MS) || 60 * 1000
+});
+
+const invalidatePrincipal = (userId) => {
+  if (userId) {
+    principalCache.delete(userId.toString());
+  }
+};
+
+const clearPrincipals = () => {
+  principalCache.clear();
+};
+
+module.exports = {
+  principalCache,
+  invalidatePrincipal,
+  clearPrincipals
+};
@@ -0,0 +1,72 @@
+const cluster = require('cluster');
+const LRUCache = require('./lruCache');
+const { request, handleRequests } = require('./clusterBus');
+
+// Token-bucket stores. Every store implements
+//   take(key, cost, { capacity, refillPerSec })
+//     -> { allowed, remaining, retryAfterMs }
+// MemoryStore keeps buckets in this process. ClusterStore asks the cluster
+// primary, which runs one MemoryStore for all workers.
+
+class MemoryStore {
+  constructor({ maxKeys = 100000 } = {}) {
+    this.buckets = new LRUCache({ maxSize: maxKeys });
+  }
+
+  take(key, cost, { capacity, refillPerSec }) {
+    const now = Date.now();
+    const bucket = this.buckets.get(key) || { tokens: capacity, updatedAt: now };
+    const tokens = Math.min(capacity, bucket.tokens + (now - bucket.updatedAt) / 1000 * refillPerSec);
+    // A request dearer than the whole bucket still goes through when it is full
+    const needed = Math.min(cost, capacity);
+    const allowed = tokens >= needed;
+    const remaining = allowed ? tokens - needed : tokens;
+
+    // An untouched bucket is full again after this long, so it can expire then
+    const refillMs = Math.ceil((capacity - remaining) / refillPerSec * 1000);
+    this.buckets.set(key, { tokens: remaining, updatedAt: now }, Math.max(refillMs, 1000));
+
+    return {
+      allowed,
+      remaining: Math.floor(remaining),
+      retryAfterMs: allowed ? 0 : Math.ceil((needed - tokens) / refillPerSec * 1000)
+    };
+  }
+}
+
+class ClusterStore {
+  constructor({ timeoutMs = 50 } = {}) {
+    this.timeoutMs = timeoutMs;
+    // Used when the primary does not answer in time; limits then apply per worker
+    this.fallback = new MemoryStore();
+  }
+
+  async take(key, cost, options) {
+    try {
+      return await request('rateLimit.take', { key, cost, options }, { timeoutMs: this.timeoutMs });
+    } catch (error) {
+      return this.fallback.take(key, cost, options);
+    }
+  }
+}
+
+// Primary side of ClusterStore
+const serveClusterStore = () => {
+  const store = new MemoryStore();
+  handleRequests('rateLimit.take', ({ key, cost, options }) => store.take(key, cost, options));
+};
+
+// RATE_LIMIT_STORE=memory|cluster; cluster workers share buckets by default
+const createStore = (type = process.env.RATE_LIMIT_STORE) => {
+  if (type === 'cluster' || (!type && cluster.isWorker)) {
+    return new ClusterStore();
+  }
+  return new MemoryStore();
+};
+
+module.exports = {
+  MemoryStore,
+  ClusterStore,
+  serveClusterStore,
+  createStore
+};
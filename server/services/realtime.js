@@ -0,0 +1,81 @@
+const cluster = require('cluster');
+const mongoose = require('mongoose');
+const { Server } = require('socket.io');
+const Project = require('../models/Project');
+const { authenticate } = require('../middleware/auth');
+const { subscribe } = require('./events');
+
+// Socket.io change feed. Clients authenticate with the same JWT as the REST
+// API, then `subscribe` to projects they can see and receive the events
+// published by services/events in the room `project:<id>`. Each socket also
+// sits in `user:<id>`, so users removed from a project can be evicted.
+
+const roomFor = projectId => `project:${projectId}`;
+const userRoom = userId => `user:${userId}`;
+
+const canAccessProject = async (projectId, userId) => {
+  if (!mongoose.isValidObjectId(projectId)) return false;
+
+  const project = await Project.findById(projectId).select('owner team.user').lean();
+  if (!project) return false;
+
+  return project.owner.toString() === userId ||
+    project.team.some(member => member.user && member.user.toString() === userId);
+};
+
+const attachRealtime = (server, options = {}) => {
+  const io = new Server(server, {
+    cors: { origin: process.env.CLIENT_URL || '*' },
+    // Long-polling needs sticky sessions across cluster workers; a websocket
+    // stays on the worker that accepted it
+    transports: cluster.isWorker ? ['websocket'] : ['polling', 'websocket'],
+    ...options
+  });
+
+  io.use(async (socket, next) => {
+    try {
+      const user = await authenticate(socket.handshake.auth && socket.handshake.auth.token);
+      socket.data.userId = user._id.toString();
+      next();
+    } catch (error) {
+      if (error.status !== 401) console.error('Realtime auth error:', error);
+      next(new Error(error.status === 401 ? error.message : 'Authentication failed'));
+    }
+  });
+
+  io.on('connection', (socket) => {
+    socket.join(userRoom(socket.data.userId));
+
+    socket.on('subscribe', async (projectId, ack = () => {}) => {
+      try {
+        if (!(await canAccessProject(projectId, socket.data.userId))) {
+          return ack({ error: 'Access denied' });
+        }
+        socket.join(roomFor(projectId));
+        ack({ ok: true });
+      } catch (error) {
+        console.error('Realtime subscribe error:', error);
+        ack({ error: 'Failed to subscribe' });
+      }
+    });
+
+    socket.on('unsubscribe', (projectId, ack = () => {}) => {
+      socket.leave(roomFor(projectId));
+      ack({ ok: true });
+    });
+  });
+
+  subscribe(({ type, project, data }) => {
+    io.to(roomFor(project)).emit(type, { project, data });
+    // After the emit, so removed users still hear why they stop getting events
+    if (type === 'project.members.removed') {
+      io.in(data.users.map(userRoom)).socketsLeave(roomFor(project));
+    }
+  });
+
+  return io;
+};
+
+module.exports = {
+  attachRealtime
+};
@@ -0,0 +1,201 @@
+const mongoose = require('mongoose');
+const { encodeCursor, decodeCursor } = require('./pagination');
+
+// Token-based search over a `searchTerms` array kept current by the plugin
+// below. Anchored, case-sensitive regexes on lowercased tokens are prefix
+// range scans on the multikey index, unlike `new RegExp(q, 'i')`.
+
+const MAX_TERMS = 8;
+
+const tokenize = (text) => String(text || '')
+  .toLowerCase()
+  .split(/[^\p{L}\p{N}]+/u)
+  .filter(Boolean);
+
+const fieldText = (value) => (Array.isArray(value) ? value.join(' ') : value);
+
+const buildSearchTerms = (doc, fields) => {
+  const terms = new Set();
+  Object.keys(fields).forEach((path) => {
+    tokenize(fieldText(doc[path])).forEach(term => terms.add(term));
+  });
+  return Array.from(terms);
+};
+
+const unsupportedUpdate = (operator, path) => new Error(
+  `${operator} on searchable path ${path} would leave searchTerms stale; use $set or save()`
+);
+
+// Paths an update pipeline writes, for the stages that name them
+const pipelinePaths = pipeline => pipeline.flatMap(stage => [
+  ...Object.keys(stage.$set || stage.$addFields || {}),
+  ...[].concat(stage.$unset || [])
+]);
+
+// searchTerms for an update, or null when it leaves every searchable field
+// alone. Plain values, $set and $unset are applied over the stored values,
+// and searchable fields the update does not set are read with
+// loadMissing(paths), so a full update needs no extra query. Any other way
+// of changing a searchable field (e.g. $push on tags) throws, since only the
+// database knows the result.
+const searchTermsForUpdate = async (update, fields, loadMissing) => {
+  const paths = Object.keys(fields);
+  const isSearchable = path => paths.includes(path.split('.')[0]);
+
+  if (Array.isArray(update)) {
+    const path = pipelinePaths(update).find(isSearchable);
+    if (path) throw unsupportedUpdate('An update pipeline', path);
+    return null;
+  }
+
+  const changed = {};
+  Object.entries(update).forEach(([key, value]) => {
+    if (key === '$set') {
+      Object.assign(changed, value);
+    } else if (key === '$unset') {
+      Object.keys(value).forEach((path) => {
+        changed[path] = undefined;
+      });
+    } else if (key.startsWith('$')) {
+      const path = Object.keys(value || {}).find(isSearchable);
+      if (path) throw unsupportedUpdate(key, path);
+    } else {
+      changed[key] = value;
+    }
+  });
+
+  const nested = Object.keys(changed).find(path => path.includes('.') && isSearchable(path));
+  if (nested) throw unsupportedUpdate('Setting a nested path', nested);
+  if (!paths.some(path => path in changed)) return null;
+
+  const missing = paths.filter(path => !(path in changed));
+  const current = missing.length > 0 ? await loadMissing(missing) : {};
+  if (!current) return null;
+
+  return buildSearchTerms({ ...current, ...changed }, fields);
+};
+
+// Mongoose plugin: adds `searchTerms` and keeps it in sync on save and on
+// updates that touch a searchable field. The terms are written by the same
+// update. updateMany can only do that when it sets every searchable field,
+// since the others differ per document.
+// fields maps each searchable path to its ranking weight.
+const searchablePlugin = (schema, { fields, index = { searchTerms: 1 } }) => {
+  schema.add({ searchTerms: { type: [String], select: false } });
+  schema.index(index);
+  schema.statics.searchFields = fields;
+
+  schema.pre('save', function(next) {
+    if (this.isNew || Object.keys(fields).some(path => this.isModified(path))) {
+      this.searchTerms = buildSearchTerms(this, fields);
+    }
+    next();
+  });
+
+  schema.pre(['findOneAndUpdate', 'updateOne'], async function() {
+    const searchTerms = await searchTermsForUpdate(this.getUpdate() || {}, fields, missing => (
+      this.model.findOne(this.getFilter()).select(missing.join(' ')).lean()
+    ));
+    if (searchTerms) this.set('searchTerms', searchTerms);
+  });
+
+  schema.pre('updateMany', async function() {
+    const searchTerms = await searchTermsForUpdate(this.getUpdate() || {}, fields, (missing) => {
+      throw new Error(`updateMany must set every searchable path to keep searchTerms current (missing ${missing.join(', ')})`);
+    });
+    if (searchTerms) this.set('searchTerms', searchTerms);
+  });
+};
+
+const decodeSearchCursor = (cursor) => {
+  const values = decodeCursor(cursor);
+  if (!values || values.length !== 2) return null;
+
+  const [score, id] = values;
+  if (typeof score !== 'number' || !mongoose.isValidObjectId(id)) return null;
+  return { score, id: new mongoose.Types.ObjectId(id) };
+};
+
+// Relevance: each query term scores the field weight for a whole-word match
+// and half of it for a prefix match, summed over all searchable fields.
+const scoreExpression = (fields, terms) => {
+  const parts = [];
+  Object.entries(fields).forEach(([path, weight]) => {
+    const input = {
+      $reduce: {
+        input: { $cond: [{ $isArray: `$${path}` }, `$${path}`, [{ $ifNull: [`$${path}`, ''] }]] },
+        initialValue: '',
+        in: { $concat: ['$$value', ' ', '$$this'] }
+      }
+    };
+
+    terms.forEach((term) => {
+      parts.push({
+        $cond: [
+          { $regexMatch: { input, regex: `(^|[^\\p{L}\\p{N}])${term}([^\\p{L}\\p{N}]|$)`, options: 'i' } },
+          weight,
+          { $cond: [{ $regexMatch: { input, regex: `(^|[^\\p{L}\\p{N}])${term}`, options: 'i' } }, weight / 2, 0] }
+        ]
+      });
+    });
+  });
+  return { $add: parts };
+};
+
+// Ranked, cursor-paginated search in one aggregation.
+// Returns { results, nextCursor }; results are lean documents with a `score`.
+const search = async (Model, { q, filter = {}, project, limit = 20, cursor }) => {
+  const terms = Array.from(new Set(tokenize(q))).slice(0, MAX_TERMS);
+  if (terms.length === 0) {
+    return { results: [], nextCursor: null };
+  }
+
+  const fields = Model.searchFields;
+  const pipeline = [
+    {
+      $match: {
+        ...filter,
+        $and: terms.map(term => ({ searchTerms: { $regex: `^${term}` } }))
+      }
+    },
+    { $addFields: { score: scoreExpression(fields, terms) } }
+  ];
+
+  const after = cursor ? decodeSearchCursor(cursor) : null;
+  if (after) {
+    pipeline.push({
+      $match: {
+        $or: [
+          { score: { $lt: after.score } },
+          { score: after.score, _id: { $gt: after.id } }
+        ]
+      }
+    });
+  }
+
+  pipeline.push(
+    { $sort: { score: -1, _id: 1 } },
+    { $limit: limit + 1 }
+  );
+
+  pipeline.push({ $project: project ? { ...project, score: 1 } : { searchTerms: 0 } });
+
+  let results = await Model.aggregate(pipeline);
+  const hasMore = results.length > limit;
+  if (hasMore) results = results.slice(0, limit);
+
+  const last = results[results.length - 1];
+  return {
+    results,
+    nextCursor: hasMore && last ? encodeCursor([last.score, last._id.toString()]) : null
+  };
+};
+
+module.exports = {
+  tokenize,
+  buildSearchTerms,
+  searchTermsForUpdate,
+  searchablePlugin,
+  decodeSearchCursor,
+  search
+};
@@ -0,0 +1,110 @@
+const Module = require('module');
+const { performance } = require('perf_hooks');
+
+// Startup timing for server/index.js. Phases are recorded as they finish.
+// While tracking is on, each module the entry point requires directly is
+// timed including its own dependencies, so the slow imports stand out.
+// performance.now() counts from process start, so the first entry covers
+// Node's own bootstrap.
+
+const round = ms => Math.round(ms * 10) / 10;
+
+const report = {
+  bootstrapMs: round(performance.now()),
+  readyMs: null,
+  compileCache: 'off',
+  phases: [],
+  modules: []
+};
+
+const now = () => performance.now();
+
+const record = (name, start) => {
+  report.phases.push({ name, startMs: round(start), durationMs: round(now() - start) });
+};
+
+// Module.isBuiltin needs Node 18.6+
+const BUILTINS = new Set(Module.builtinModules);
+const isBuiltin = request => request.startsWith('node:') || BUILTINS.has(request);
+
+let originalLoad = null;
+let depth = 0;
+
+const trackRequires = () => {
+  if (originalLoad) return;
+  originalLoad = Module._load;
+
+  Module._load = function(request, ...args) {
+    if (depth > 0 || isBuiltin(request)) {
+      return originalLoad.call(this, request, ...args);
+    }
+
+    const start = now();
+    depth += 1;
+    try {
+      return originalLoad.call(this, request, ...args);
+    } finally {
+      depth -= 1;
+      const durationMs = round(now() - start);
+      // Cached modules come back in well under a tenth of a millisecond
+      if (durationMs >= 0.1) report.modules.push({ name: request, durationMs });
+    }
+  };
+};
+
+const stopTracking = () => {
+  if (!originalLoad) return;
+  Module._load = originalLoad;
+  originalLoad = null;
+};
+
+// Caches compiled code on disk between runs where Node supports it (22.1+)
+const enableCompileCache = (dir) => {
+  if (!dir) return report.compileCache;
+  if (typeof Module.enableCompileCache !== 'function') {
+    report.compileCache = 'unsupported';
+    return report.compileCache;
+  }
+
+  const { status, message } = Module.enableCompileCache(dir);
+  const { FAILED, DISABLED } = Module.constants.compileCacheStatus;
+  if (status === FAILED) {
+    report.compileCache = `failed: ${message}`;
+  } else {
+    report.compileCache = status === DISABLED ? 'disabled' : 'on';
+  }
+  return report.compileCache;
+};
+
+const markReady = () => {
+  if (report.readyMs === null) report.readyMs = round(now());
+  stopTracking();
+};
+
+const formatStartupReport = ({ limit = 10 } = {}) => {
+  const lines = [
+    `Startup: bootstrap ${report.bootstrapMs}ms, ready at ${report.readyMs === null ? '-' : `${report.readyMs}ms`}, compile cache ${report.compileCache}`
+  ];
+  report.phases.forEach((phase) => {
+    lines.push(`  ${phase.name}: ${phase.durationMs}ms (at ${phase.startMs}ms)`);
+  });
+
+  const slowest = [...report.modules].sort((a, b) => b.durationMs - a.durationMs).slice(0, limit);
+  if (slowest.length > 0) {
+    lines.push(`  slowest modules: ${slowest.map(entry => `${entry.name} ${entry.durationMs}ms`).join(', ')}`);
+  }
+  return lines.join('\n');
+};
+
+const startupReport = () => report;
+
+module.exports = {
+  now,
+  record,
+  trackRequires,
+  stopTracking,
+  enableCompileCache,
+  markReady,
+  formatStartupReport,
+  startupReport
+};
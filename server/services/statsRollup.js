@@ -0,0 +1,200 @@
+const ProjectStats = require('../models/ProjectStats');
+const Task = require('../models/Task');
+const User = require('../models/User');
+const { touchVersion } = require('./versions');
+
+// Accepts either a populated document or a bare ObjectId
+const refId = (value) => (value && value._id ? value._id : value);
+
+const monthKey = (date) => new Date(date || Date.now()).toISOString().slice(0, 7);
+
+const isNumber = (value) => typeof value === 'number' && !Number.isNaN(value);
+
+const bucketFor = (buckets, project, month) => {
+  const key = `${project}:${month}`;
+  if (!buckets.has(key)) {
+    buckets.set(key, { project, month, statuses: {}, workload: {} });
+  }
+  return buckets.get(key);
+};
+
+const addTo = (target, field, value) => {
+  target[field] = (target[field] || 0) + value;
+};
+
+// Add (sign = 1) or remove (sign = -1) one task's contribution to its bucket
+const addContribution = (buckets, task, sign) => {
+  const project = refId(task.project);
+  if (!project) return;
+
+  const bucket = bucketFor(buckets, project.toString(), monthKey(task.createdAt));
+  const status = task.status || 'todo';
+  const statusBucket = bucket.statuses[status] || (bucket.statuses[status] = {});
+
+  addTo(statusBucket, 'count', sign);
+  if (isNumber(task.estimatedHours)) {
+    addTo(statusBucket, 'estimatedHours', sign * task.estimatedHours);
+    addTo(statusBucket, 'estimatedCount', sign);
+  }
+  if (isNumber(task.actualHours)) {
+    addTo(statusBucket, 'actualHours', sign * task.actualHours);
+    addTo(statusBucket, 'actualCount', sign);
+  }
+
+  const assignee = refId(task.assignee);
+  if (assignee) {
+    const key = assignee.toString();
+    const workloadBucket = bucket.workload[key] || (bucket.workload[key] = {});
+
+    addTo(workloadBucket, 'taskCount', sign);
+    addTo(workloadBucket, 'completedTasks', status === 'completed' ? sign : 0);
+    addTo(workloadBucket, 'estimatedHours', sign * (task.estimatedHours || 0));
+    addTo(workloadBucket, 'actualHours', sign * (task.actualHours || 0));
+  }
+};
+
+// Flatten a bucket into a $inc document, dropping fields that cancelled out
+const toIncrement = (bucket) => {
+  const inc = {};
+  ['statuses', 'workload'].forEach((group) => {
+    Object.entries(bucket[group]).forEach(([key, fields]) => {
+      Object.entries(fields).forEach(([field, value]) => {
+        if (value !== 0) inc[`${group}.${key}.${field}`] = value;
+      });
+    });
+  });
+  return inc;
+};
+
+// Apply a batch of [before, after] task pairs to the rollups in one bulkWrite.
+// Use null for `before` on create and for `after` on delete.
+const applyTaskChanges = async (changes) => {
+  const buckets = new Map();
+
+  changes.forEach(([before, after]) => {
+    if (before) addContribution(buckets, before, -1);
+    if (after) addContribution(buckets, after, 1);
+  });
+
+  const operations = [];
+  buckets.forEach((bucket) => {
+    const inc = toIncrement(bucket);
+    if (Object.keys(inc).length === 0) return;
+
+    operations.push({
+      updateOne: {
+        filter: { project: bucket.project, month: bucket.month },
+        update: { $inc: inc },
+        upsert: true
+      }
+    });
+  });
+
+  if (operations.length > 0) {
+    await ProjectStats.bulkWrite(operations, { ordered: false });
+    touchVersion(ProjectStats.modelName);
+  }
+};
+
+const applyTaskChange = (before, after) => applyTaskChanges([[before, after]]);
+
+// Snapshot the fields the rollups depend on, before a document is mutated
+const snapshotTask = (task) => task && {
+  project: refId(task.project),
+  assignee: refId(task.assignee),
+  status: task.status,
+  estimatedHours: task.estimatedHours,
+  actualHours: task.actualHours,
+  createdAt: task.createdAt
+};
+
+// Recompute rollups from the tasks collection to repair drift
+const rebuildRollups = async (projectIds) => {
+  const filter = projectIds ? { project: { $in: projectIds } } : {};
+  const buckets = new Map();
+
+  const cursor = Task.find(filter)
+    .select('project assignee status estimatedHours actualHours createdAt')
+    .lean()
+    .cursor();
+
+  for await (const task of cursor) {
+    addContribution(buckets, task, 1);
+  }
+
+  await ProjectStats.deleteMany(filter);
+
+  const docs = Array.from(buckets.values());
+  if (docs.length > 0) {
+    await ProjectStats.insertMany(docs, { ordered: false });
+  }
+
+  return { buckets: docs.length };
+};
+
+// Merge rollups for a set of projects into the /stats response shape.
+// Task statistics are limited to months >= sinceMonth; workload is all-time.
+const loadStatistics = async (projectIds, { sinceMonth } = {}) => {
+  const rollups = await ProjectStats.find({ project: { $in: projectIds } }).lean();
+
+  const statuses = {};
+  const workload = {};
+
+  rollups.forEach((rollup) => {
+    if (!sinceMonth || rollup.month >= sinceMonth) {
+      Object.entries(rollup.statuses || {}).forEach(([status, fields]) => {
+        const merged = statuses[status] || (statuses[status] = {});
+        Object.entries(fields).forEach(([field, value]) => addTo(merged, field, value));
+      });
+    }
+
+    Object.entries(rollup.workload || {}).forEach(([userId, fields]) => {
+      const merged = workload[userId] || (workload[userId] = {});
+      Object.entries(fields).forEach(([field, value]) => addTo(merged, field, value));
+    });
+  });
+
+  const taskStatistics = Object.entries(statuses)
+    .filter(([, fields]) => fields.count > 0)
+    .map(([status, fields]) => ({
+      _id: status,
+      count: fields.count,
+      avgEstimatedHours: fields.estimatedCount > 0 ? fields.estimatedHours / fields.estimatedCount : null,
+      avgActualHours: fields.actualCount > 0 ? fields.actualHours / fields.actualCount : null
+    }));
+
+  const userIds = Object.keys(workload).filter(userId => workload[userId].taskCount > 0);
+  const users = await User.find({ _id: { $in: userIds } })
+    .select('username firstName lastName')
+    .lean();
+
+  const workloadStatistics = users
+    .map((user) => {
+      const fields = workload[user._id.toString()];
+      return {
+        _id: user._id,
+        userId: user._id,
+        username: user.username,
+        firstName: user.firstName,
+        lastName: user.lastName,
+        taskCount: fields.taskCount,
+        completedTasks: fields.completedTasks || 0,
+        completionRate: (fields.completedTasks || 0) / fields.taskCount * 100,
+        totalEstimatedHours: fields.estimatedHours || 0,
+        totalActualHours: fields.actualHours || 0,
+        efficiency: fields.actualHours ? fields.estimatedHours / fields.actualHours * 100 : null
+      };
+    })
+    .sort((a, b) => b.taskCount - a.taskCount);
+
+  return { taskStatistics, workloadStatistics };
+};
+
+module.exports = {
+  monthKey,
+  snapshotTask,
+  applyTaskChange,
+  applyTaskChanges,
+  rebuildRollups,
+  loadStatistics
+};
@@ -0,0 +1,69 @@
+const { broadcast, onBroadcast } = require('./clusterBus');
+
+// Per-model write versions for conditional GETs. Each write advances the
+// model's version to the write time (or past the current version when two
+// writes land in the same millisecond), and the bump is broadcast so every
+// cluster worker advances too. A fresh process starts every model at its
+// boot time, so tags issued before a restart never match afterwards.
+//
+// Versions only see writes made through this process group; changes made
+// by maintenance scripts show up after the next in-app write.
+
+const startedAt = Date.now();
+const versions = new Map();
+
+const currentVersion = modelName => versions.get(modelName) || startedAt;
+
+onBroadcast('versions.touch', ({ modelName, at }) => {
+  versions.set(modelName, Math.max(at, currentVersion(modelName) + 1));
+});
+
+const touchVersion = (modelName) => {
+  broadcast('versions.touch', { modelName, at: Date.now() });
+};
+
+// Whether an update document or pipeline may change any of `fields`
+const updateTouches = (update, fields) => {
+  if (!update || Array.isArray(update)) return true;
+  const touches = path => fields.includes(path.split('.')[0]);
+  return Object.entries(update).some(([key, value]) => (
+    key.startsWith('$') ? Object.keys(value || {}).some(touches) : touches(key)
+  ));
+};
+
+// Mongoose plugin: advance the model's version after every write.
+// Model.bulkWrite() has no middleware in Mongoose 7, so callers of bulkWrite
+// call touchVersion() themselves.
+// With `fields`, saves and updates only count when they change one of those
+// paths; inserts, replaces and deletes always do.
+const versionPlugin = (schema, { fields } = {}) => {
+  if (fields) {
+    schema.pre('save', function() {
+      this.$locals.versionTouched = this.isNew || fields.some(field => this.isModified(field));
+    });
+  }
+
+  schema.post('save', function() {
+    if (!fields || this.$locals.versionTouched) touchVersion(this.constructor.modelName);
+  });
+
+  schema.post('insertMany', function() {
+    touchVersion(this.modelName);
+  });
+
+  schema.post([
+    'replaceOne', 'deleteOne', 'deleteMany', 'findOneAndReplace', 'findOneAndDelete'
+  ], function() {
+    touchVersion(this.model.modelName);
+  });
+
+  schema.post(['updateOne', 'updateMany', 'findOneAndUpdate'], function() {
+    if (!fields || updateTouches(this.getUpdate(), fields)) touchVersion(this.model.modelName);
+  });
+};
+
+module.exports = {
+  currentVersion,
+  touchVersion,
+  versionPlugin
+};
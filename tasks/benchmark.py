@@ -0,0 +1,273 @@
+"""HTTP load benchmark for the API.
+
+Runs one or more scenarios against ``server/index-test.js`` (started on a free
+port through ``node_server``) or against ``--url``, each for a fixed duration
+with a pool of concurrent keep-alive sessions, and prints a JSON report of
+throughput, error rate and latency percentiles.
+
+With ``--baseline`` the run is compared against an earlier report and exits
+with status 1 if any scenario regressed by more than ``--tolerance``.
+
+The mock routers answer ``stats_dashboard`` and ``search`` with canned
+responses, so those two scenarios only measure real work with ``--url``.
+The real server rate-limits ``/api`` per IP and per user, and every request
+here comes from one IP; start it with limits well above the expected load or
+``login_storm`` (5 tokens per login) mostly measures 429s::
+
+    RATE_LIMIT_IP_CAPACITY=1000000 RATE_LIMIT_IP_REFILL=1000000 \
+    RATE_LIMIT_USER_CAPACITY=1000000 RATE_LIMIT_USER_REFILL=1000000 npm start
+
+    python tasks/benchmark.py --duration 10 --concurrency 16 --output bench.json
+    python tasks/benchmark.py --baseline bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from node_server import NodeServer
+
+PERCENTILES = (50, 95, 99)
+
+
+def new_session():
+    """A keep-alive session holding one connection to the server."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def register_user(session, base_url):
+    """Register a throwaway user and return (credentials, auth headers)."""
+    suffix = uuid.uuid4().hex[:12]
+    credentials = {"email": f"bench_{suffix}@example.com", "password": "benchpassword123"}
+    response = session.post(f"{base_url}/api/auth/register", json={
+        **credentials,
+        "username": f"bench_{suffix}",
+        "firstName": "Bench",
+        "lastName": "User",
+    })
+    response.raise_for_status()
+    return credentials, {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+# Each scenario's setup runs once against the server and returns a function
+# making one request with a worker's session.
+
+def login_storm(session, base_url, options):
+    credentials, _ = register_user(session, base_url)
+    return lambda worker: worker.post(f"{base_url}/api/auth/login", json=credentials)
+
+
+def task_list(session, base_url, options):
+    _, headers = register_user(session, base_url)
+    project = session.post(f"{base_url}/api/projects", headers=headers, json={
+        "name": "Benchmark project",
+        "description": "Tasks for the task list scenario",
+    })
+    project.raise_for_status()
+    # The real routes return Mongo documents, the mock routes plain ids
+    created = project.json()["project"]
+    project_id = created.get("_id") or created.get("id")
+
+    for index in range(options.tasks):
+        session.post(f"{base_url}/api/tasks", headers=headers, json={
+            "title": f"Benchmark task {index}",
+            "description": "Created by the task list scenario",
+            "project": project_id,
+        }).raise_for_status()
+
+    return lambda worker: worker.get(f"{base_url}/api/tasks", headers=headers)
+
+
+def stats_dashboard(session, base_url, options):
+    _, headers = register_user(session, base_url)
+    return lambda worker: worker.get(f"{base_url}/api/advanced/stats", headers=headers)
+
+
+def search(session, base_url, options):
+    _, headers = register_user(session, base_url)
+    return lambda worker: worker.get(
+        f"{base_url}/api/advanced/search", headers=headers, params={"q": "task"}
+    )
+
+
+def primes(session, base_url, options):
+    _, headers = register_user(session, base_url)
+    return lambda worker: worker.get(
+        f"{base_url}/api/advanced/primes", headers=headers, params={"limit": options.primes_limit}
+    )
+
+
+SCENARIOS = {
+    "login_storm": login_storm,
+    "task_list": task_list,
+    "stats_dashboard": stats_dashboard,
+    "search": search,
+    "primes": primes,
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    total = len(latencies)
+    to_ms = lambda seconds: round(seconds * 1000, 3) if seconds is not None else None
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            **{f"p{pct}": to_ms(percentile(latencies, pct)) for pct in PERCENTILES},
+            "mean": to_ms(sum(latencies) / total) if total else None,
+            "max": to_ms(latencies[-1]) if total else None,
+        },
+    }
+
+
+def run_scenario(name, base_url, options):
+    with new_session() as setup_session:
+        send = SCENARIOS[name](setup_session, base_url, options)
+
+    lock = threading.Lock()
+    latencies = []
+    errors = [0]
+
+    def worker(deadline, record):
+        local_latencies = []
+        local_errors = 0
+        with new_session() as session:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = send(session)
+                    failed = response.status_code >= 400
+                except requests.RequestException:
+                    failed = True
+                local_latencies.append(time.perf_counter() - started)
+                local_errors += failed
+        if record:
+            with lock:
+                latencies.extend(local_latencies)
+                errors[0] += local_errors
+
+    with ThreadPoolExecutor(max_workers=options.concurrency) as pool:
+        if options.warmup > 0:
+            deadline = time.perf_counter() + options.warmup
+            list(pool.map(lambda _: worker(deadline, False), range(options.concurrency)))
+
+        started = time.perf_counter()
+        deadline = started + options.duration
+        list(pool.map(lambda _: worker(deadline, True), range(options.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(latencies, errors[0], elapsed)
+
+
+def compare(report, baseline, tolerance):
+    """List the scenarios that got slower, lost throughput or failed more often."""
+    regressions = []
+    for name, current in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+
+        for pct in ("p95", "p99"):
+            before = previous["latency_ms"].get(pct)
+            after = current["latency_ms"].get(pct)
+            if before and after and after > before * (1 + tolerance):
+                regressions.append(f"{name}: {pct} {before}ms -> {after}ms")
+
+        if previous["rps"] and current["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {previous['rps']} -> {current['rps']}")
+
+        if current["error_rate"] > previous["error_rate"] + 0.01:
+            regressions.append(f"{name}: error rate {previous['error_rate']} -> {current['error_rate']}")
+
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run; repeat for several (default: all)")
+    parser.add_argument("--url", help="benchmark a running server instead of starting index-test.js")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds before each scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent sessions")
+    parser.add_argument("--tasks", type=int, default=100, help="tasks created for task_list")
+    parser.add_argument("--primes-limit", type=int, default=10000,
+                        help="limit for the primes scenario (the API accepts 1-10000)")
+    parser.add_argument("--output", help="write the JSON report here as well as to stdout")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative change in p95/p99 latency and rps (default 0.2)")
+    parser.add_argument("--server-log", help="log file for the started server")
+    return parser.parse_args(argv)
+
+
+def run(options, base_url):
+    return {
+        "meta": {
+            "url": base_url,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "duration": options.duration,
+            "warmup": options.warmup,
+            "concurrency": options.concurrency,
+            "python": platform.python_version(),
+        },
+        "scenarios": {
+            name: run_scenario(name, base_url, options)
+            for name in (options.scenario or SCENARIOS)
+        },
+    }
+
+
+def main(argv=None):
+    options = parse_args(argv)
+
+    if options.url:
+        report = run(options, options.url.rstrip("/"))
+    else:
+        log_path = options.server_log or os.path.join(tempfile.gettempdir(), "benchmark-server.log")
+        with NodeServer(log_path=log_path) as server:
+            report = run(options, server.url)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as output:
+            output.write(text + "\n")
+
+    if options.baseline:
+        with open(options.baseline, encoding="utf-8") as baseline_file:
+            regressions = compare(report, json.load(baseline_file), options.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
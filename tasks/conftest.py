@@ -0,0 +1,34 @@
+"""Shared test server for the task suites.
+
+One ``server/index-test.js`` runs per pytest session, or per worker under
+``pytest -n auto``, each on its own free port. Set ``TEST_SERVER_URL`` to
+use an already running server instead, and ``TEST_SERVER_LOG_DIR`` to keep
+the server logs somewhere other than pytest's temporary directory.
+"""
+import os
+
+import pytest
+
+from node_server import NodeServer
+
+
+@pytest.fixture(scope="session")
+def test_server_url(tmp_path_factory):
+    external = os.environ.get("TEST_SERVER_URL")
+    if external:
+        yield external.rstrip("/")
+        return
+
+    log_dir = os.environ.get("TEST_SERVER_LOG_DIR") or tmp_path_factory.mktemp("server-logs")
+    os.makedirs(log_dir, exist_ok=True)
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+    with NodeServer(log_path=os.path.join(log_dir, f"index-test-{worker}.log")) as server:
+        yield server.url
+
+
+@pytest.fixture(autouse=True)
+def _bind_base_url(request, test_server_url):
+    """Point the suite's module-level BASE_URL at this session's server."""
+    if hasattr(request.module, "BASE_URL"):
+        request.module.BASE_URL = test_server_url
@@ -0,0 +1,91 @@
+"""Run ``server/index-test.js`` as a child process for the task suites.
+
+The server is started with ``PORT=0`` so the OS picks a free port, and the
+port is read back from the ``Test server running on port N`` line it prints
+once listening. Output is drained continuously into a log file, so a chatty
+server can never block on a full pipe.
+"""
+import os
+import re
+import subprocess
+import threading
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+READY_PATTERN = re.compile(r"Test server running on port (\d+)")
+
+
+class NodeServer:
+    def __init__(self, log_path, script="server/index-test.js", env=None, startup_timeout=15.0):
+        self.log_path = str(log_path)
+        self.script = script
+        self.env = env or {}
+        self.startup_timeout = startup_timeout
+        self.port = None
+        self.process = None
+        self._log = None
+        self._reader = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self):
+        env = dict(os.environ, **self.env)
+        env["PORT"] = "0"
+
+        self._log = open(self.log_path, "w", encoding="utf-8")
+        self.process = subprocess.Popen(
+            ["node", self.script],
+            cwd=REPO_ROOT,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+        )
+        self._reader = threading.Thread(target=self._drain, daemon=True)
+        self._reader.start()
+
+        if not self._ready.wait(self.startup_timeout):
+            self.stop()
+            raise RuntimeError(
+                f"{self.script} did not start within {self.startup_timeout}s; see {self.log_path}"
+            )
+        if self.port is None:
+            code = self.process.wait()
+            self.stop()
+            raise RuntimeError(f"{self.script} exited with code {code}; see {self.log_path}")
+        return self
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self._reader:
+            self._reader.join(timeout=5)
+        if self._log and not self._log.closed:
+            self._log.close()
+
+    def _drain(self):
+        for line in self.process.stdout:
+            self._log.write(line)
+            self._log.flush()
+            if self.port is None:
+                match = READY_PATTERN.search(line)
+                if match:
+                    self.port = int(match.group(1))
+                    self._ready.set()
+        # Output closed: the process is gone, wake start() if it is still waiting
+        self._ready.set()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
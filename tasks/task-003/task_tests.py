@@ -1,50 +1,11 @@
 import pytest
 import requests
-import subprocess
-import time
-import signal
-import os
-import sys
 
-# Get the correct path to the repo root
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-REPO_ROOT = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+# Rebound to the session test server by tasks/conftest.py
 BASE_URL = "http://localhost:5001"
 
 class TestAuthEnhancements:
     
-    @classmethod
-    def setup_class(cls):
-        """Start the test server"""
-        # Start the server in background
-        cls.server_process = subprocess.Popen(
-            ["node", "server/index-test.js"],
-            cwd=REPO_ROOT,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        
-        # Wait for server to be ready
-        max_retries = 30
-        for i in range(max_retries):
-            try:
-                response = requests.get(f"{BASE_URL}/health", timeout=2)
-                if response.status_code == 200:
-                    break
-            except requests.exceptions.RequestException:
-                pass
-            time.sleep(0.2)
-        else:
-            cls.teardown_class()
-            pytest.fail("Server failed to start within timeout")
-
-    @classmethod
-    def teardown_class(cls):
-        """Stop the test server"""
-        if hasattr(cls, 'server_process'):
-            cls.server_process.terminate()
-            cls.server_process.wait()
-
     def get_auth_token(self):
         """Helper method to get auth token"""
         import random
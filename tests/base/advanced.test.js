@@ -24,6 +24,54 @@ describe('Advanced Endpoints', () => {
       expect(response.body.primes).toBeDefined();
       expect(response.body.primes[0]).toBe(2);
     });
+
+    it('should support range and nth-prime queries', async () => {
+      const userData = {
+        username: 'testuser4',
+        email: 'test4@example.com',
+        password: 'password123',
+        firstName: 'Test',
+        lastName: 'User'
+      };
+
+      const registerResponse = await request(app)
+        .post('/api/auth/register')
+        .send(userData);
+
+      const rangeResponse = await request(app)
+        .get('/api/advanced/primes?from=10&to=30')
+        .set('Authorization', `Bearer ${registerResponse.body.token}`);
+
+      expect(rangeResponse.status).toBe(200);
+      expect(rangeResponse.body.primes).toEqual([11, 13, 17, 19, 23, 29]);
+
+      const nthResponse = await request(app)
+        .get('/api/advanced/primes?nth=100')
+        .set('Authorization', `Bearer ${registerResponse.body.token}`);
+
+      expect(nthResponse.status).toBe(200);
+      expect(nthResponse.body.prime).toBe(541);
+    });
+
+    it('should reject a limit outside 1-10000', async () => {
+      const registerResponse = await request(app)
+        .post('/api/auth/register')
+        .send({
+          username: 'testuser5',
+          email: 'test5@example.com',
+          password: 'password123',
+          firstName: 'Test',
+          lastName: 'User'
+        });
+      const token = registerResponse.body.token;
+
+      for (const limit of ['-5', '0', '10001']) {
+        const response = await request(app)
+          .get(`/api/advanced/primes?limit=${limit}`)
+          .set('Authorization', `Bearer ${token}`);
+        expect(response.status).toBe(400);
+      }
+    });
   });
 
   describe('GET /api/advanced/stats', () => {
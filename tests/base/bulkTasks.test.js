@@ -0,0 +1,85 @@
+const mongoose = require('mongoose');
+const Task = require('../../server/models/Task');
+const Project = require('../../server/models/Project');
+const Comment = require('../../server/models/Comment');
+const Subtask = require('../../server/models/Subtask');
+const { runBulkTaskOperations } = require('../../server/services/bulkTasks');
+
+// Query stand-in for find()/findOneAnd*() chains ending in .select().lean()
+const resolves = value => ({ select: () => ({ lean: async () => value }) });
+
+describe('runBulkTaskOperations', () => {
+  const userId = new mongoose.Types.ObjectId().toString();
+  const projectId = new mongoose.Types.ObjectId();
+  const task = {
+    _id: new mongoose.Types.ObjectId(),
+    project: projectId,
+    reporter: new mongoose.Types.ObjectId(userId),
+    assignee: new mongoose.Types.ObjectId(userId),
+    status: 'todo'
+  };
+
+  beforeEach(() => {
+    jest.spyOn(Task, 'find').mockImplementation(() => resolves([task]));
+    jest.spyOn(Project, 'find').mockImplementation(() => resolves([
+      { _id: projectId, owner: new mongoose.Types.ObjectId(userId), team: [] }
+    ]));
+    jest.spyOn(Comment, 'deleteMany').mockResolvedValue({});
+    jest.spyOn(Subtask, 'deleteMany').mockResolvedValue({});
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it('should count a task deleted by two requests at once only once', async () => {
+    const deletes = [task, null];
+    jest.spyOn(Task, 'findOneAndDelete').mockImplementation(() => resolves(deletes.shift()));
+
+    const operations = [{ op: 'delete', id: task._id.toString() }];
+    const [first, second] = await Promise.all([
+      runBulkTaskOperations(userId, operations),
+      runBulkTaskOperations(userId, operations)
+    ]);
+
+    expect(first.results[0]).toMatchObject({ ok: true });
+    expect(first.changes).toEqual([[task, null]]);
+    expect(second.results[0]).toMatchObject({ ok: false, error: 'Task not found' });
+    expect(second.changes).toEqual([]);
+    expect(Comment.deleteMany).toHaveBeenCalledTimes(1);
+  });
+
+  it('should fail a status change that lost a race', async () => {
+    const findOneAndUpdate = jest.spyOn(Task, 'findOneAndUpdate').mockImplementation(() => resolves(null));
+
+    const { results, changes } = await runBulkTaskOperations(userId, [
+      { op: 'status', id: task._id.toString(), status: 'in-progress' }
+    ]);
+
+    expect(findOneAndUpdate.mock.calls[0][0]).toEqual({ _id: task._id, status: 'todo' });
+    expect(results[0]).toMatchObject({ ok: false, error: 'Task was modified concurrently' });
+    expect(changes).toEqual([]);
+  });
+
+  it('should pair a status change with the pre-image of its own write', async () => {
+    const current = { ...task, actualHours: 3 };
+    jest.spyOn(Task, 'findOneAndUpdate').mockImplementation(() => resolves(current));
+
+    const { changes } = await runBulkTaskOperations(userId, [
+      { op: 'status', id: task._id.toString(), status: 'in-progress' }
+    ]);
+
+    expect(changes).toEqual([[current, { ...current, status: 'in-progress', completedDate: null }]]);
+  });
+
+  it('should reject a task that appears twice in one batch', async () => {
+    jest.spyOn(Task, 'findOneAndDelete').mockImplementation(() => resolves(task));
+
+    const { results } = await runBulkTaskOperations(userId, [
+      { op: 'delete', id: task._id.toString() },
+      { op: 'delete', id: task._id.toString() }
+    ]);
+
+    expect(results[1]).toMatchObject({ ok: false, error: 'Task appears more than once in this batch' });
+  });
+});
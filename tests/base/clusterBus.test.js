@@ -0,0 +1,14 @@
+const { broadcast, onBroadcast } = require('../../server/services/clusterBus');
+
+describe('clusterBus', () => {
+  it('should deliver broadcasts to local handlers outside a cluster', () => {
+    const received = [];
+    const off = onBroadcast('test.channel', payload => received.push(payload));
+
+    broadcast('test.channel', { id: 1 });
+    off();
+    broadcast('test.channel', { id: 2 });
+
+    expect(received).toEqual([{ id: 1 }]);
+  });
+});
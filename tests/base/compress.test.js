@@ -0,0 +1,32 @@
+const express = require('express');
+const request = require('supertest');
+const compress = require('../../server/middleware/compress');
+
+const { negotiateEncoding } = compress;
+
+describe('compress', () => {
+  const app = express();
+  app.use(compress({ threshold: 100 }));
+  app.get('/small', (req, res) => res.json({ ok: true }));
+  app.get('/large', (req, res) => res.json({ text: 'x'.repeat(5000) }));
+
+  it('should pick the preferred supported encoding', () => {
+    expect(negotiateEncoding('gzip, deflate, br')).toBe('br');
+    expect(negotiateEncoding('gzip;q=1, br;q=0.5')).toBe('gzip');
+    expect(negotiateEncoding('br;q=0, deflate')).toBeNull();
+    expect(negotiateEncoding(undefined)).toBeNull();
+  });
+
+  it('should leave bodies below the threshold uncompressed', async () => {
+    const response = await request(app).get('/small').set('Accept-Encoding', 'gzip').expect(200);
+    expect(response.headers['content-encoding']).toBeUndefined();
+    expect(response.body).toEqual({ ok: true });
+  });
+
+  it('should gzip larger bodies', async () => {
+    const response = await request(app).get('/large').set('Accept-Encoding', 'gzip').expect(200);
+    expect(response.headers['content-encoding']).toBe('gzip');
+    expect(response.headers.vary).toMatch(/Accept-Encoding/);
+    expect(response.body.text).toHaveLength(5000);
+  });
+});
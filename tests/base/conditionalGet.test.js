@@ -0,0 +1,49 @@
+const express = require('express');
+const request = require('supertest');
+const conditionalGet = require('../../server/middleware/conditionalGet');
+const { touchVersion } = require('../../server/services/versions');
+
+const buildApp = () => {
+  const app = express();
+  const calls = { count: 0 };
+
+  app.get('/items', (req, res, next) => {
+    req.userId = req.get('X-User') || 'user-1';
+    next();
+  }, conditionalGet(['Task']), (req, res) => {
+    calls.count += 1;
+    res.json({ items: [] });
+  });
+
+  return { app, calls };
+};
+
+describe('conditionalGet', () => {
+  it('should answer 304 without running the handler while the version is unchanged', async () => {
+    const { app, calls } = buildApp();
+
+    const first = await request(app).get('/items').expect(200);
+    const etag = first.headers.etag;
+    expect(etag).toMatch(/^W\/"/);
+
+    await request(app).get('/items').set('If-None-Match', etag).expect(304);
+    expect(calls.count).toBe(1);
+  });
+
+  it('should change the tag after a write to a dependent model', async () => {
+    const { app } = buildApp();
+
+    const { headers } = await request(app).get('/items').expect(200);
+    touchVersion('Task');
+
+    const next = await request(app).get('/items').set('If-None-Match', headers.etag).expect(200);
+    expect(next.headers.etag).not.toBe(headers.etag);
+  });
+
+  it('should not share tags between users', async () => {
+    const { app } = buildApp();
+
+    const { headers } = await request(app).get('/items').expect(200);
+    await request(app).get('/items').set('X-User', 'user-2').set('If-None-Match', headers.etag).expect(200);
+  });
+});
@@ -0,0 +1,35 @@
+const { DataLoader } = require('../../server/services/dataloader');
+const LRUCache = require('../../server/services/lruCache');
+
+describe('DataLoader', () => {
+  it('should coalesce loads in the same tick into one batch', async () => {
+    const batches = [];
+    const loader = new DataLoader(async (ids) => {
+      batches.push(ids);
+      return ids.filter(id => id !== 'missing').map(id => ({ _id: id, name: `user-${id}` }));
+    });
+
+    const [a, b, again, missing] = await Promise.all([
+      loader.load('a'),
+      loader.load('b'),
+      loader.load('a'),
+      loader.load('missing')
+    ]);
+
+    expect(batches).toEqual([['a', 'b', 'missing']]);
+    expect(a.name).toBe('user-a');
+    expect(b.name).toBe('user-b');
+    expect(again).toBe(a);
+    expect(missing).toBeNull();
+  });
+
+  it('should serve repeat loads from the shared cache', async () => {
+    const sharedCache = new LRUCache({ maxSize: 10, ttl: 1000 });
+    const batchLoad = jest.fn(async ids => ids.map(id => ({ _id: id })));
+
+    await new DataLoader(batchLoad, { sharedCache }).load('a');
+    await new DataLoader(batchLoad, { sharedCache }).load('a');
+
+    expect(batchLoad).toHaveBeenCalledTimes(1);
+  });
+});
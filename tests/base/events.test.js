@@ -0,0 +1,46 @@
+const { publishTaskChanges, publishMembersRemoved, subscribe } = require('../../server/services/events');
+
+describe('events', () => {
+  it('should publish task changes as per-project deltas', () => {
+    const received = [];
+    const unsubscribe = subscribe(event => received.push(event));
+
+    publishTaskChanges([
+      [null, { _id: 't1', project: 'p1', title: 'New', searchTerms: ['new'] }],
+      [{ _id: 't2', project: 'p1', status: 'todo' }, { _id: 't2', project: 'p1', status: 'in-progress' }],
+      [{ _id: 't3', project: { _id: 'p2', name: 'Other' }, status: 'todo' }, null]
+    ]);
+    unsubscribe();
+
+    expect(received).toEqual([
+      { type: 'task.created', project: 'p1', data: { _id: 't1', project: 'p1', title: 'New' } },
+      { type: 'task.updated', project: 'p1', data: { _id: 't2', project: 'p1', status: 'in-progress' } },
+      { type: 'task.deleted', project: 'p2', data: { _id: 't3' } }
+    ]);
+  });
+
+  it('should stop delivering after unsubscribe', () => {
+    const received = [];
+    const unsubscribe = subscribe(event => received.push(event));
+    unsubscribe();
+
+    publishTaskChanges([[null, { _id: 't1', project: 'p1' }]]);
+    expect(received).toEqual([]);
+  });
+
+  it('should publish the users who lost access to a project', () => {
+    const received = [];
+    const unsubscribe = subscribe(event => received.push(event));
+
+    const before = { owner: 'u1', team: [{ user: 'u2' }, { user: { _id: 'u3' } }] };
+    publishMembersRemoved('p1', before, { owner: 'u1', team: [{ user: 'u3' }] });
+    publishMembersRemoved('p1', before, { owner: 'u4', team: before.team });
+    publishMembersRemoved('p1', before, { ...before, team: [...before.team, { user: 'u5' }] });
+    unsubscribe();
+
+    expect(received).toEqual([
+      { type: 'project.members.removed', project: 'p1', data: { users: ['u2'] } },
+      { type: 'project.members.removed', project: 'p1', data: { users: ['u1'] } }
+    ]);
+  });
+});
@@ -0,0 +1,59 @@
+const { Readable } = require('stream');
+const {
+  TASK_EXPORT_FIELDS,
+  parseExportFields,
+  toCsvRow,
+  createRowTransform
+} = require('../../server/services/exportStream');
+
+const collect = async (docs, format, fields) => {
+  let output = '';
+  const stream = Readable.from(docs).pipe(createRowTransform(format, fields));
+  for await (const chunk of stream) {
+    output += chunk;
+  }
+  return output;
+};
+
+describe('exportStream', () => {
+  it('should reject unknown export fields', () => {
+    expect(parseExportFields('title, status', TASK_EXPORT_FIELDS)).toEqual(['title', 'status']);
+    expect(parseExportFields('title,password', TASK_EXPORT_FIELDS)).toBeNull();
+    expect(parseExportFields('', TASK_EXPORT_FIELDS)).toBeNull();
+  });
+
+  it('should quote CSV cells that need it', () => {
+    expect(toCsvRow(['plain', 'a,b', 'say "hi"', null])).toBe('plain,"a,b","say ""hi""",\r\n');
+  });
+
+  it('should keep spreadsheets from running CSV cells as formulas', () => {
+    expect(toCsvRow(['=SUM(A1:A9)', '+1', '-2+3', '@cmd', '\tx', '=HYPERLINK("x"),y', -4, 'a=b']))
+      .toBe('\'=SUM(A1:A9),\'+1,\'-2+3,\'@cmd,\'\tx,"\'=HYPERLINK(""x""),y",-4,a=b\r\n');
+  });
+
+  it('should write a CSV header even with no rows', async () => {
+    expect(await collect([], 'csv', ['title', 'status'])).toBe('title,status\r\n');
+  });
+
+  it('should write one JSON object per line with only the selected fields', async () => {
+    const createdAt = new Date('2024-01-02T03:04:05Z');
+    const output = await collect([
+      { title: 'One', status: 'todo', createdAt, extra: true },
+      { title: 'Two', tags: ['a', 'b'] }
+    ], 'ndjson', ['title', 'status', 'createdAt']);
+
+    const lines = output.trim().split('\n').map(line => JSON.parse(line));
+    expect(lines).toEqual([
+      { title: 'One', status: 'todo', createdAt: createdAt.toISOString() },
+      { title: 'Two', status: null, createdAt: null }
+    ]);
+  });
+
+  it('should join arrays and format dates in CSV rows', async () => {
+    const output = await collect([
+      { title: 'One', tags: ['a', 'b'], dueDate: new Date('2024-05-06T00:00:00Z') }
+    ], 'csv', ['title', 'tags', 'dueDate']);
+
+    expect(output).toBe('title,tags,dueDate\r\nOne,a;b,2024-05-06T00:00:00.000Z\r\n');
+  });
+});
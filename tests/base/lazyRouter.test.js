@@ -0,0 +1,38 @@
+const express = require('express');
+const request = require('supertest');
+const lazyRouter = require('../../server/middleware/lazyRouter');
+const { startupReport } = require('../../server/services/startup');
+
+describe('lazyRouter', () => {
+  const buildApp = () => {
+    const calls = { loads: 0 };
+    const items = lazyRouter('/items', () => {
+      calls.loads += 1;
+      const router = express.Router();
+      router.get('/:id', (req, res) => res.json({ id: req.params.id, path: `${req.baseUrl}${req.route.path}` }));
+      return router;
+    });
+
+    const app = express();
+    app.use(items.path, items);
+    return { app, items, calls };
+  };
+
+  it('should load the router on its first request only', async () => {
+    const { app, calls } = buildApp();
+    expect(calls.loads).toBe(0);
+
+    const { body } = await request(app).get('/items/1').expect(200);
+    await request(app).get('/items/2').expect(200);
+
+    expect(body).toEqual({ id: '1', path: '/items/:id' });
+    expect(calls.loads).toBe(1);
+  });
+
+  it('should record the load in the startup report', () => {
+    const { items } = buildApp();
+    items.load();
+
+    expect(startupReport().phases.some(phase => phase.name === 'route /items')).toBe(true);
+  });
+});
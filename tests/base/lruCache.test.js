@@ -0,0 +1,42 @@
+const LRUCache = require('../../server/services/lruCache');
+
+describe('LRUCache', () => {
+  it('should count hits and misses', () => {
+    const cache = new LRUCache({ maxSize: 10, ttl: 1000 });
+
+    expect(cache.get('a')).toBeUndefined();
+    cache.set('a', 1);
+    expect(cache.get('a')).toBe(1);
+
+    const stats = cache.stats();
+    expect(stats.hits).toBe(1);
+    expect(stats.misses).toBe(1);
+    expect(stats.hitRate).toBe(0.5);
+  });
+
+  it('should evict the least recently used entry when full', () => {
+    const cache = new LRUCache({ maxSize: 2, ttl: 1000 });
+
+    cache.set('a', 1);
+    cache.set('b', 2);
+    cache.get('a');
+    cache.set('c', 3);
+
+    expect(cache.has('a')).toBe(true);
+    expect(cache.has('b')).toBe(false);
+    expect(cache.has('c')).toBe(true);
+    expect(cache.stats().evictions).toBe(1);
+  });
+
+  it('should expire entries after their ttl', () => {
+    const cache = new LRUCache({ maxSize: 10, ttl: 1000 });
+    const now = jest.spyOn(Date, 'now').mockReturnValue(0);
+
+    cache.set('a', 1);
+    now.mockReturnValue(1500);
+
+    expect(cache.get('a')).toBeUndefined();
+    expect(cache.size).toBe(0);
+    now.mockRestore();
+  });
+});
@@ -0,0 +1,58 @@
+const express = require('express');
+const request = require('supertest');
+const requestMetrics = require('../../server/middleware/metrics');
+const { Registry, renderMetrics, requestContext } = require('../../server/services/metrics');
+
+describe('Registry', () => {
+  it('should render cumulative histogram buckets', () => {
+    const registry = new Registry();
+    const histogram = registry.histogram('job_seconds', 'Job time', ['job'], [0.1, 1]);
+
+    histogram.observe({ job: 'a' }, 0.05);
+    histogram.observe({ job: 'a' }, 0.5);
+    histogram.observe({ job: 'a' }, 5);
+
+    const text = registry.render();
+    expect(text).toContain('# TYPE job_seconds histogram');
+    expect(text).toContain('job_seconds_bucket{job="a",le="0.1"} 1');
+    expect(text).toContain('job_seconds_bucket{job="a",le="1"} 2');
+    expect(text).toContain('job_seconds_bucket{job="a",le="+Inf"} 3');
+    expect(text).toContain('job_seconds_count{job="a"} 3');
+  });
+
+  it('should escape label values', () => {
+    const registry = new Registry();
+    registry.counter('hits_total', 'Hits', ['path']).inc({ path: 'say "hi"\n' });
+
+    expect(registry.render()).toContain('hits_total{path="say \\"hi\\"\\n"} 1');
+  });
+});
+
+describe('requestMetrics', () => {
+  const buildApp = () => {
+    const app = express();
+    app.use(requestMetrics());
+    app.get('/items/:id', (req, res) => {
+      requestContext.getStore().dbSeconds += 0.002;
+      res.json({ id: req.params.id });
+    });
+    return app;
+  };
+
+  it('should set timing headers', async () => {
+    const { headers } = await request(buildApp()).get('/items/1').expect(200);
+
+    expect(headers['x-response-time']).toMatch(/^\d+\.\dms$/);
+    expect(headers['server-timing']).toMatch(/^db;dur=2\.0;desc="MongoDB \(0\)", total;dur=\d+\.\d$/);
+  });
+
+  it('should label requests by route pattern', async () => {
+    await request(buildApp()).get('/items/42').expect(200);
+    await request(buildApp()).get('/missing').expect(404);
+
+    const text = renderMetrics();
+    expect(text).toMatch(/http_requests_total\{method="GET",route="\/items\/:id",status="200"\} \d+/);
+    expect(text).toMatch(/http_requests_total\{method="GET",route="unmatched",status="404"\} \d+/);
+    expect(text).not.toContain('/items/42');
+  });
+});
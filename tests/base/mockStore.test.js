@@ -0,0 +1,119 @@
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { Collection, createId } = require('../../server/services/mockStore');
+const { attachPersistence } = require('../../server/services/mockStorePersistence');
+
+describe('mockStore', () => {
+  it('should create distinct ids in a tight loop', () => {
+    const ids = new Set(Array.from({ length: 10000 }, createId));
+    expect(ids.size).toBe(10000);
+  });
+
+  it('should look up records by unique and secondary indexes', () => {
+    const users = new Collection({ unique: ['email'], indexes: ['team'] });
+    const ada = users.insert({ email: 'ada@example.com', team: 'a' });
+    users.insert({ email: 'bob@example.com', team: 'a' });
+
+    expect(users.findOne('email', 'ada@example.com')).toBe(ada);
+    expect(users.findOne('email', 'nobody@example.com')).toBeNull();
+    expect(users.findBy('team', 'a')).toHaveLength(2);
+    expect(users.get(ada.id)).toBe(ada);
+  });
+
+  it('should reject duplicate unique values', () => {
+    const users = new Collection({ unique: ['email'] });
+    users.insert({ email: 'ada@example.com' });
+
+    expect(() => users.insert({ email: 'ada@example.com' })).toThrow('Duplicate value for email');
+  });
+
+  it('should keep indexes current on update and remove', () => {
+    const tasks = new Collection({ indexes: ['assignee', 'reporter'] });
+    const task = tasks.insert({ assignee: 'u1', reporter: 'u1' });
+
+    tasks.update(task.id, { assignee: 'u2' });
+    expect(tasks.findBy('assignee', 'u1')).toEqual([]);
+    expect(tasks.findBy('assignee', 'u2')).toEqual([task]);
+    expect(tasks.findByAny([['assignee', 'u2'], ['reporter', 'u1']])).toEqual([task]);
+
+    tasks.remove(task.id);
+    expect(tasks.findBy('reporter', 'u1')).toEqual([]);
+    expect(tasks.size).toBe(0);
+  });
+
+  it('should restore collections from the snapshot and change log', () => {
+    const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'mock-store-'));
+    const buildStore = () => ({
+      users: new Collection({ unique: ['email'] }),
+      tasks: new Collection({ indexes: ['assignee'] })
+    });
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+
+    try {
+      const first = buildStore();
+      const persistence = attachPersistence(first, { dir, compactEvery: 100 });
+      first.users.insert({ email: 'ada@example.com' });
+      const task = first.tasks.insert({ assignee: 'u1' });
+      persistence.flush();
+      first.tasks.update(task.id, { assignee: 'u2' });
+      first.users.insert({ email: 'bob@example.com' });
+      persistence.close();
+
+      const second = buildStore();
+      attachPersistence(second, { dir }).close();
+      expect(second.users.size).toBe(2);
+      expect(second.users.findOne('email', 'bob@example.com')).not.toBeNull();
+      expect(second.tasks.findBy('assignee', 'u2')).toEqual([{ id: task.id, assignee: 'u2' }]);
+    } finally {
+      console.log.mockRestore();
+      fs.rmSync(dir, { recursive: true, force: true });
+    }
+  });
+
+  it('should cut off a torn log line before appending', () => {
+    const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'mock-store-'));
+    const buildStore = () => ({ users: new Collection({ unique: ['email'] }) });
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+    jest.spyOn(console, 'warn').mockImplementation(() => {});
+
+    try {
+      fs.writeFileSync(path.join(dir, 'changes.log'), '{"collection":"users","op":"ins');
+
+      const first = buildStore();
+      const persistence = attachPersistence(first, { dir });
+      first.users.insert({ email: 'ada@example.com' });
+      first.users.insert({ email: 'bob@example.com' });
+      persistence.close();
+
+      const second = buildStore();
+      attachPersistence(second, { dir }).close();
+      expect(second.users.size).toBe(2);
+    } finally {
+      console.log.mockRestore();
+      console.warn.mockRestore();
+      fs.rmSync(dir, { recursive: true, force: true });
+    }
+  });
+
+  it('should compact once the log passes its size limit', () => {
+    const dir = fs.mkdtempSync(path.join(os.tmpdir(), 'mock-store-'));
+    const users = new Collection();
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+
+    try {
+      const persistence = attachPersistence({ users }, { dir, compactBytes: 1024 });
+      users.insert({ name: 'a'.repeat(100) });
+      persistence.flush();
+      expect(fs.statSync(path.join(dir, 'changes.log')).size).toBeGreaterThan(0);
+
+      users.insert({ name: 'b'.repeat(2000) });
+      persistence.flush();
+      expect(fs.statSync(path.join(dir, 'changes.log')).size).toBe(0);
+      persistence.close();
+    } finally {
+      console.log.mockRestore();
+      fs.rmSync(dir, { recursive: true, force: true });
+    }
+  });
+});
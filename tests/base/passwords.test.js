@@ -0,0 +1,23 @@
+process.env.BCRYPT_COST = '4';
+
+const bcrypt = require('bcryptjs');
+const {
+  hashPassword,
+  comparePassword,
+  needsRehash
+} = require('../../server/services/passwords');
+
+describe('passwords', () => {
+  it('should hash and verify on the worker pool', async () => {
+    const hash = await hashPassword('secret123');
+
+    expect(bcrypt.getRounds(hash)).toBe(4);
+    expect(await comparePassword('secret123', hash)).toBe(true);
+    expect(await comparePassword('wrong', hash)).toBe(false);
+  });
+
+  it('should flag hashes made with a different cost', () => {
+    expect(needsRehash(bcrypt.hashSync('secret123', 5))).toBe(true);
+    expect(needsRehash(bcrypt.hashSync('secret123', 4))).toBe(false);
+  });
+});
@@ -0,0 +1,39 @@
+const express = require('express');
+const jwt = require('jsonwebtoken');
+const mongoose = require('mongoose');
+const request = require('supertest');
+const Project = require('../../server/models/Project');
+const { principalCache } = require('../../server/services/principalCache');
+const advancedRouter = require('../../server/routes/advanced');
+
+describe('GET /api/advanced/performance', () => {
+  const userId = new mongoose.Types.ObjectId();
+  const token = jwt.sign({ userId: userId.toString() }, process.env.JWT_SECRET || 'fallback_secret');
+
+  const app = express();
+  app.use('/api/advanced', advancedRouter);
+
+  beforeEach(() => {
+    principalCache.set(userId.toString(), { _id: userId, isActive: true });
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+    principalCache.clear();
+  });
+
+  it('should reject ISO week and ordinal dates that Date cannot parse', async () => {
+    const find = jest.spyOn(Project, 'find');
+
+    for (const from of ['2024-W05', '2024-060', '2024-02-30']) {
+      const response = await request(app)
+        .get('/api/advanced/performance')
+        .query({ from })
+        .set('Authorization', `Bearer ${token}`);
+
+      expect(response.status).toBe(400);
+      expect(response.body.error).toBe('Validation failed');
+    }
+    expect(find).not.toHaveBeenCalled();
+  });
+});
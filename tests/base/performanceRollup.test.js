@@ -0,0 +1,17 @@
+const { dayKey, periodKey } = require('../../server/services/performanceRollup');
+
+describe('performanceRollup', () => {
+  it('should key days in UTC', () => {
+    expect(dayKey('2024-03-10T23:30:00Z')).toBe('2024-03-10');
+    expect(dayKey(Date.UTC(2024, 0, 1))).toBe('2024-01-01');
+  });
+
+  it('should bucket days into ISO weeks and months', () => {
+    // 2024-03-10 is a Sunday, 2024-03-11 a Monday
+    expect(periodKey('2024-03-10', 'week')).toBe('2024-03-04');
+    expect(periodKey('2024-03-11', 'week')).toBe('2024-03-11');
+    expect(periodKey('2024-01-02', 'week')).toBe('2024-01-01');
+    expect(periodKey('2024-03-10', 'month')).toBe('2024-03');
+    expect(periodKey('2024-03-10', 'day')).toBe('2024-03-10');
+  });
+});
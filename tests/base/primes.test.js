@@ -0,0 +1,31 @@
+const primes = require('../../server/services/primes');
+
+describe('Prime table', () => {
+  it('should return the first n primes', () => {
+    expect(primes.firstPrimes(10)).toEqual([2, 3, 5, 7, 11, 13, 17, 19, 23, 29]);
+    expect(primes.firstPrimes(10000)[9999]).toBe(104729);
+  });
+
+  it('should return no primes for a non-positive count', () => {
+    expect(primes.firstPrimes(0)).toEqual([]);
+    expect(primes.firstPrimes(-5)).toEqual([]);
+  });
+
+  it('should answer range queries', () => {
+    expect(primes.primesInRange(100, 130)).toEqual([101, 103, 107, 109, 113, 127]);
+    expect(primes.primesInRange(0, 1)).toEqual([]);
+    expect(primes.primesInRange(20, 10)).toEqual([]);
+  });
+
+  it('should look up the nth prime across segment boundaries', () => {
+    expect(primes.nthPrime(1)).toBe(2);
+    expect(primes.nthPrime(6543)).toBe(65537);
+    expect(primes.isPrime(65537)).toBe(true);
+    expect(primes.isPrime(65539)).toBe(true);
+    expect(primes.isPrime(65541)).toBe(false);
+  });
+
+  it('should reject queries beyond the table cap', () => {
+    expect(() => primes.primesInRange(0, primes.MAX_VALUE + 1)).toThrow(RangeError);
+  });
+});
@@ -0,0 +1,49 @@
+const express = require('express');
+const request = require('supertest');
+const rateLimit = require('../../server/middleware/rateLimit');
+const { MemoryStore } = require('../../server/services/rateLimitStore');
+
+const { routeCost } = rateLimit;
+
+describe('rateLimit', () => {
+  it('should refill buckets over time', () => {
+    const store = new MemoryStore();
+    const options = { capacity: 10, refillPerSec: 5 };
+    let clock = 1000000;
+    jest.spyOn(Date, 'now').mockImplementation(() => clock);
+
+    try {
+      expect(store.take('k', 10, options)).toMatchObject({ allowed: true, remaining: 0 });
+      const denied = store.take('k', 1, options);
+      expect(denied.allowed).toBe(false);
+      expect(denied.retryAfterMs).toBe(1000 / options.refillPerSec);
+
+      // One token back after 1/refillPerSec seconds, and no more
+      clock += 1000 / options.refillPerSec;
+      expect(store.take('k', 1, options)).toMatchObject({ allowed: true, remaining: 0 });
+      expect(store.take('k', 1, options).allowed).toBe(false);
+    } finally {
+      Date.now.mockRestore();
+    }
+  });
+
+  it('should weight expensive routes', () => {
+    expect(routeCost('/advanced/search')).toBe(5);
+    expect(routeCost('/projects/abc/export')).toBe(10);
+    expect(routeCost('/tasks/abc')).toBe(1);
+  });
+
+  it('should answer 429 with Retry-After once the bucket is empty', async () => {
+    const app = express();
+    app.use('/api', rateLimit({
+      store: new MemoryStore(),
+      user: { capacity: 100, refillPerSec: 1 },
+      ip: { capacity: 6, refillPerSec: 0.01 }
+    }));
+    app.get('/api/advanced/search', (req, res) => res.json({ ok: true }));
+
+    await request(app).get('/api/advanced/search').expect(200);
+    const limited = await request(app).get('/api/advanced/search').expect(429);
+    expect(Number(limited.headers['retry-after'])).toBeGreaterThan(0);
+  });
+});
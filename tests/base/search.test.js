@@ -0,0 +1,64 @@
+const { tokenize, buildSearchTerms, searchTermsForUpdate } = require('../../server/services/search');
+
+describe('Search terms', () => {
+  it('should tokenize into lowercased words', () => {
+    expect(tokenize('Fix Login-Page bug #42')).toEqual(['fix', 'login', 'page', 'bug', '42']);
+    expect(tokenize('')).toEqual([]);
+  });
+
+  it('should build unique terms across weighted fields', () => {
+    const terms = buildSearchTerms(
+      { title: 'Release notes', description: 'Draft the release', tags: ['docs', 'Release'] },
+      { title: 10, tags: 5, description: 1 }
+    );
+
+    expect(terms.sort()).toEqual(['docs', 'draft', 'notes', 'release', 'the']);
+  });
+
+  describe('searchTermsForUpdate', () => {
+    const fields = { title: 10, description: 1 };
+
+    it('should skip updates that leave searchable fields alone', async () => {
+      const loadMissing = jest.fn();
+      await expect(searchTermsForUpdate({ $set: { status: 'completed' } }, fields, loadMissing)).resolves.toBeNull();
+      expect(loadMissing).not.toHaveBeenCalled();
+    });
+
+    it('should build terms without a read when every field is set', async () => {
+      const loadMissing = jest.fn();
+      const terms = await searchTermsForUpdate({ $set: { title: 'New title', description: 'Body' } }, fields, loadMissing);
+
+      expect(terms.sort()).toEqual(['body', 'new', 'title']);
+      expect(loadMissing).not.toHaveBeenCalled();
+    });
+
+    it('should read only the fields the update leaves out', async () => {
+      const loadMissing = jest.fn().mockResolvedValue({ description: 'Stored body' });
+      const terms = await searchTermsForUpdate({ title: 'Renamed' }, fields, loadMissing);
+
+      expect(loadMissing).toHaveBeenCalledWith(['description']);
+      expect(terms.sort()).toEqual(['body', 'renamed', 'stored']);
+    });
+
+    it('should apply $unset over the stored fields', async () => {
+      const loadMissing = jest.fn().mockResolvedValue({ title: 'Kept title' });
+      const terms = await searchTermsForUpdate({ $unset: { description: '' } }, fields, loadMissing);
+
+      expect(terms.sort()).toEqual(['kept', 'title']);
+    });
+
+    it('should reject other ways of changing a searchable field', async () => {
+      const loadMissing = jest.fn();
+      const withTags = { ...fields, tags: 5 };
+
+      await expect(searchTermsForUpdate({ $push: { tags: 'new' } }, withTags, loadMissing))
+        .rejects.toThrow('$push on searchable path tags');
+      await expect(searchTermsForUpdate({ $set: { 'tags.0': 'first' } }, withTags, loadMissing))
+        .rejects.toThrow('searchable path tags.0');
+      await expect(searchTermsForUpdate([{ $set: { title: { $concat: ['$title', '!'] } } }], fields, loadMissing))
+        .rejects.toThrow('searchable path title');
+      await expect(searchTermsForUpdate({ $inc: { commentCount: 1 } }, withTags, loadMissing)).resolves.toBeNull();
+      expect(loadMissing).not.toHaveBeenCalled();
+    });
+  });
+});
@@ -0,0 +1,44 @@
+const express = require('express');
+const jwt = require('jsonwebtoken');
+const mongoose = require('mongoose');
+const request = require('supertest');
+const Task = require('../../server/models/Task');
+const Subtask = require('../../server/models/Subtask');
+const { principalCache } = require('../../server/services/principalCache');
+const tasksRouter = require('../../server/routes/tasks');
+
+describe('PUT /api/tasks/:id/subtasks/:subtaskId', () => {
+  const userId = new mongoose.Types.ObjectId();
+  const taskId = new mongoose.Types.ObjectId();
+  const token = jwt.sign({ userId: userId.toString() }, process.env.JWT_SECRET || 'fallback_secret');
+
+  const app = express();
+  app.use(express.json());
+  app.use('/api/tasks', tasksRouter);
+
+  beforeEach(() => {
+    principalCache.set(userId.toString(), { _id: userId, isActive: true });
+    jest.spyOn(Task, 'findWithAccess').mockResolvedValue({
+      _id: taskId,
+      project: new mongoose.Types.ObjectId(),
+      access: { owner: true, member: true }
+    });
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+    principalCache.clear();
+  });
+
+  it('should answer 404 for a malformed subtask id without querying', async () => {
+    const findOneAndUpdate = jest.spyOn(Subtask, 'findOneAndUpdate');
+
+    const response = await request(app)
+      .put(`/api/tasks/${taskId}/subtasks/not-an-id`)
+      .set('Authorization', `Bearer ${token}`);
+
+    expect(response.status).toBe(404);
+    expect(response.body.error).toBe('Subtask not found');
+    expect(findOneAndUpdate).not.toHaveBeenCalled();
+  });
+});
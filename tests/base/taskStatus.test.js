@@ -0,0 +1,23 @@
+const Task = require('../../server/models/Task');
+
+describe('Task status transitions', () => {
+  it('should allow defined transitions and staying put', () => {
+    expect(Task.canTransition('todo', 'in-progress')).toBe(true);
+    expect(Task.canTransition('review', 'completed')).toBe(true);
+    expect(Task.canTransition('completed', 'completed')).toBe(true);
+  });
+
+  it('should reject undefined transitions', () => {
+    expect(Task.canTransition('completed', 'review')).toBe(false);
+    expect(Task.canTransition('blocked', 'completed')).toBe(false);
+  });
+
+  it('should only apply valid transitions to a document', () => {
+    const task = new Task({ status: 'completed' });
+
+    expect(task.updateStatus('todo')).toBe(false);
+    expect(task.status).toBe('completed');
+    expect(task.updateStatus('in-progress')).toBe(true);
+    expect(task.status).toBe('in-progress');
+  });
+});
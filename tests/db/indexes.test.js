@@ -0,0 +1,69 @@
+const mongoose = require('mongoose');
+const Task = require('../../server/models/Task');
+const Project = require('../../server/models/Project');
+const User = require('../../server/models/User');
+const { syncIndexes } = require('../../server/services/indexes');
+
+// Needs a real MongoDB: MONGODB_TEST_URI=mongodb://localhost:27017/taskmaster-test npx jest tests/db
+const describeWithDb = process.env.MONGODB_TEST_URI ? describe : describe.skip;
+
+// Collect every stage name in a query plan, whatever the engine nests them under
+const planStages = (plan) => {
+  if (!plan || typeof plan !== 'object') return [];
+  const stages = plan.stage ? [plan.stage] : [];
+  ['inputStage', 'queryPlan', 'winningPlan'].forEach((key) => {
+    stages.push(...planStages(plan[key]));
+  });
+  (plan.inputStages || []).forEach((child) => {
+    stages.push(...planStages(child));
+  });
+  return stages;
+};
+
+const winningStages = async (query) => {
+  const explained = await query.explain('queryPlanner');
+  const output = Array.isArray(explained) ? explained[0] : explained;
+  return planStages(output.queryPlanner.winningPlan);
+};
+
+describeWithDb('Query indexes', () => {
+  const userId = new mongoose.Types.ObjectId();
+  const projectId = new mongoose.Types.ObjectId();
+
+  beforeAll(async () => {
+    await mongoose.connect(process.env.MONGODB_TEST_URI, { autoIndex: false });
+    await syncIndexes({ drop: true });
+  });
+
+  afterAll(async () => {
+    await mongoose.connection.close();
+  });
+
+  const expectIndexed = async (query) => {
+    const stages = await winningStages(query);
+    expect(stages).toContain('IXSCAN');
+    expect(stages).not.toContain('COLLSCAN');
+  };
+
+  it('should index task lookups by assignee or reporter', async () => {
+    await expectIndexed(Task.find({ $or: [{ assignee: userId }, { reporter: userId }] }));
+  });
+
+  it('should index task lookups by project and creation date', async () => {
+    await expectIndexed(Task.find({ project: { $in: [projectId] }, createdAt: { $gte: new Date(0) } }));
+  });
+
+  it('should index workload lookups by project, assignee and status', async () => {
+    await expectIndexed(Task.find({ project: projectId, assignee: userId, status: 'completed' }));
+  });
+
+  it('should index project lookups by owner or team member', async () => {
+    await expectIndexed(Project.find({ $or: [{ owner: userId }, { 'team.user': userId }] }));
+  });
+
+  it('should index prefix search on tasks, projects and users', async () => {
+    await expectIndexed(Task.find({ project: { $in: [projectId] }, searchTerms: /^rel/ }));
+    await expectIndexed(Project.find({ _id: { $in: [projectId] }, searchTerms: /^rel/ }));
+    await expectIndexed(User.find({ isActive: true, searchTerms: /^ali/ }));
+  });
+});